@@ -2,6 +2,11 @@
 const path = require("path");
 require("dotenv").config();
 
+// Expose the deployed commit to the build (Render sets RENDER_GIT_COMMIT),
+// read back from <meta name="igv-build"> by ops/scripts/monitor_deploy.py
+process.env.REACT_APP_GIT_SHA =
+  process.env.REACT_APP_GIT_SHA || process.env.RENDER_GIT_COMMIT || "";
+
 // Environment variable overrides
 const config = {
   disableHotReload: process.env.DISABLE_HOT_RELOAD === "true",
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Analyseur en flux des logs d'accès Render / CDN
+Mission: Voir le trafic réel (pas seulement les sondes synthétiques) :
+débit, percentiles de latence et statuts par route de src/App.js, et taux
+de service depuis le cache pour /static/* (max-age=31536000) vs le HTML
+(max-age=86400), en mémoire constante quel que soit le volume de logs.
+
+Formats acceptés (détectés ligne par ligne) :
+  - JSON (export Render / Cloudflare : path|ClientRequestURI, status|EdgeResponseStatus,
+    responseTimeMS|duration_ms|OriginResponseTime, cache_status|CacheCacheStatus, ...)
+  - logfmt (clé=valeur) : method=GET path=/ status=200 responseTimeMS=12 cache=HIT
+  - Combined Log Format, avec rt=<secondes> / cache=<statut> optionnels en fin de ligne
+
+Les percentiles viennent d'un histogramme logarithmique (celui de
+probe_history, erreur relative ~2%) : mémoire bornée par route.
+
+Usage:
+    python access_log_analyzer.py render-logs.ndjson
+    tail -F access.log | python access_log_analyzer.py - --report-every 60
+    python access_log_analyzer.py access.log --follow --json-report /tmp/routes.json
+"""
+import json
+import re
+import shlex
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+
+import probe_history
+import route_crawler
+
+STATIC_PREFIX = "/static/"
+PERCENTILES = (50, 90, 99)
+HIT_STATUSES = {"hit", "stale", "revalidated", "updating"}
+MISS_STATUSES = {"miss", "expired", "bypass", "dynamic", "none"}
+
+PATH_KEYS = ("path", "ClientRequestPath", "ClientRequestURI", "request_uri", "uri", "url")
+METHOD_KEYS = ("method", "ClientRequestMethod", "request_method")
+STATUS_KEYS = ("status", "statusCode", "EdgeResponseStatus", "status_code")
+LATENCY_MS_KEYS = ("responseTimeMS", "response_time_ms", "duration_ms", "latency_ms", "elapsed_ms")
+LATENCY_S_KEYS = ("rt", "request_time", "duration")
+CACHE_KEYS = ("cache_status", "CacheCacheStatus", "cache", "x_cache", "cf_cache_status")
+TIME_KEYS = ("timestamp", "time", "ts", "EdgeStartTimestamp")
+
+CLF_RE = re.compile(
+    r'^\S+ \S+ \S+ \[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" (?P<status>\d{3}) \S+'
+    r'(?: "[^"]*" "[^"]*")?(?P<rest>.*)$'
+)
+
+
+def _first(record, keys):
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _parse_time(value):
+    """Unix seconds from an ISO-8601 / CLF / epoch (s, ms or ns) timestamp, None if unknown"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) or str(value).replace(".", "", 1).isdigit():
+        number = float(value)
+        while number > 1e11:  # ms / us / ns epochs
+            number /= 1000
+        return number
+    text = str(value)
+    for parser in (
+        lambda t: datetime.fromisoformat(t.replace("Z", "+00:00")),
+        lambda t: datetime.strptime(t, "%d/%b/%Y:%H:%M:%S %z"),
+    ):
+        try:
+            return parser(text).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def _normalise(record):
+    """Map a parsed key/value record to (ts, method, path, status, latency_ms, cache)"""
+    path = _first(record, PATH_KEYS)
+    status = _first(record, STATUS_KEYS)
+    if path is None or status is None:
+        return None
+    if "://" in str(path):
+        path = "/" + str(path).split("://", 1)[1].partition("/")[2]
+    latency = _first(record, LATENCY_MS_KEYS)
+    if latency is not None:
+        latency = float(latency)
+    else:
+        seconds = _first(record, LATENCY_S_KEYS)
+        if seconds is None and record.get("OriginResponseTime") is not None:
+            latency = float(record["OriginResponseTime"]) / 1e6  # Cloudflare: nanoseconds
+        elif seconds is not None:
+            latency = float(seconds) * 1000
+    cache = _first(record, CACHE_KEYS)
+    return (
+        _parse_time(_first(record, TIME_KEYS)),
+        str(_first(record, METHOD_KEYS) or "GET").upper(),
+        str(path),
+        int(status),
+        latency,
+        str(cache).lower() if cache is not None else None,
+    )
+
+
+def _logfmt(text):
+    fields = {}
+    try:
+        tokens = shlex.split(text)
+    except ValueError:
+        tokens = text.split()
+    for token in tokens:
+        key, sep, value = token.partition("=")
+        if sep:
+            fields[key] = value
+    return fields
+
+
+def parse_line(line):
+    """Parse one access-log line, None when it is not a request"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line.startswith("{"):
+            return _normalise(json.loads(line))
+        match = CLF_RE.match(line)
+        if match:
+            record = _logfmt(match.group("rest"))
+            record.update(time=match.group("time"), method=match.group("method"),
+                          path=match.group("path"), status=match.group("status"))
+            return _normalise(record)
+        if "=" in line:
+            return _normalise(_logfmt(line))
+    except (ValueError, TypeError):
+        return None
+    return None
+
+
+class RouteMatcher:
+    """Map request paths to the App.js route patterns (most specific pattern wins)"""
+
+    def __init__(self, routes):
+        compiled = []
+        for route in routes:
+            regex = "^" + route_crawler.PARAM_RE.sub("[^/]+", re.escape(route).replace(r"\:", ":")) + "/?$"
+            # Static segments first, then fewer parameters, then longer patterns
+            static = len([s for s in route.split("/") if s and not s.startswith(":")])
+            compiled.append(((-static, route.count(":"), -len(route)), re.compile(regex), route))
+        self._patterns = [(regex, route) for _, regex, route in sorted(compiled, key=lambda c: c[0])]
+        self.match = lru_cache(maxsize=8192)(self._match)
+
+    def _match(self, path):
+        if path.startswith(STATIC_PREFIX):
+            return "/static/*"
+        if path.startswith("/api/"):
+            return "/api/*"
+        for regex, route in self._patterns:
+            if regex.match(path):
+                return route
+        return "(unmatched)"
+
+
+class RouteStats:
+    """Bounded-memory aggregates for one route"""
+
+    __slots__ = ("count", "statuses", "histogram", "latency_sum", "latency_count", "cache_hits",
+                 "cache_misses", "first_ts", "last_ts")
+
+    def __init__(self):
+        self.count = 0
+        self.statuses = {}
+        self.histogram = {}
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.first_ts = None
+        self.last_ts = None
+
+    def add(self, ts, status, latency_ms, cache):
+        self.count += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if latency_ms is not None:
+            index = probe_history.histogram_bucket(latency_ms)
+            self.histogram[index] = self.histogram.get(index, 0) + 1
+            self.latency_sum += latency_ms
+            self.latency_count += 1
+        if cache in HIT_STATUSES:
+            self.cache_hits += 1
+        elif cache in MISS_STATUSES:
+            self.cache_misses += 1
+        if ts is not None:
+            self.first_ts = ts if self.first_ts is None else min(self.first_ts, ts)
+            self.last_ts = ts if self.last_ts is None else max(self.last_ts, ts)
+
+    def summary(self):
+        span = (self.last_ts - self.first_ts) if self.first_ts is not None else 0
+        classes = {}
+        for status, count in self.statuses.items():
+            classes[f"{status // 100}xx"] = classes.get(f"{status // 100}xx", 0) + count
+        cache_known = self.cache_hits + self.cache_misses
+        result = {
+            "requests": self.count,
+            "rate_per_s": round(self.count / span, 3) if span > 0 else None,
+            "status_classes": dict(sorted(classes.items())),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "mean_ms": round(self.latency_sum / self.latency_count, 1) if self.latency_count else None,
+            "cache_hit_rate": round(self.cache_hits / cache_known, 4) if cache_known else None,
+        }
+        for p in PERCENTILES:
+            result[f"p{p}_ms"] = probe_history.histogram_percentile(self.histogram, p)
+        return result
+
+
+class AccessLogAnalyzer:
+    """Streaming aggregation of access-log lines per route and per cache class"""
+
+    def __init__(self, routes=None):
+        self.matcher = RouteMatcher(routes if routes is not None else route_crawler.extract_routes())
+        self.routes = {}
+        self.cache_classes = {"static": RouteStats(), "html": RouteStats()}
+        self.lines = 0
+        self.skipped = 0
+
+    def feed(self, line):
+        self.lines += 1
+        parsed = parse_line(line)
+        if parsed is None:
+            self.skipped += 1
+            return
+        ts, method, path, status, latency, cache = parsed
+        path = path.split("?", 1)[0]
+        route = self.matcher.match(path)
+        self.routes.setdefault(route, RouteStats()).add(ts, status, latency, cache)
+        if method == "GET" and route != "/api/*":
+            cache_class = "static" if route == "/static/*" else "html"
+            self.cache_classes[cache_class].add(ts, status, latency, cache)
+
+    def report(self):
+        return {
+            "lines": self.lines,
+            "skipped": self.skipped,
+            "routes": {route: stats.summary()
+                       for route, stats in sorted(self.routes.items(), key=lambda kv: -kv[1].count)},
+            "cache": {name: stats.summary() for name, stats in self.cache_classes.items()},
+        }
+
+
+def print_report(report, top=30):
+    print(f"\n📜 Access log: {report['lines']} lines ({report['skipped']} skipped)")
+    print("-" * 78)
+    print(f"   {'route':<34} {'req':>7} {'req/s':>7} {'p50':>7} {'p90':>7} {'p99':>7}  status")
+    for route, row in list(report["routes"].items())[:top]:
+        rate = "n/a" if row["rate_per_s"] is None else row["rate_per_s"]
+        classes = " ".join(f"{k}:{v}" for k, v in row["status_classes"].items())
+        print(f"   {route[:34]:<34} {row['requests']:>7} {rate:>7} {str(row['p50_ms']):>7} "
+              f"{str(row['p90_ms']):>7} {str(row['p99_ms']):>7}  {classes}")
+    print("-" * 78)
+    for name, label in (("static", "/static/* (max-age=31536000)"), ("html", "HTML (max-age=86400)")):
+        row = report["cache"][name]
+        rate = "n/a" if row["cache_hit_rate"] is None else f"{row['cache_hit_rate']:.1%}"
+        print(f"   🗄️  {label}: {row['requests']} GETs, cache hit rate {rate}")
+
+
+def _follow(stream, poll=0.5):
+    """Yield lines as they are appended (tail -f); stops on Ctrl+C"""
+    while True:
+        line = stream.readline()
+        if line:
+            yield line
+        else:
+            time.sleep(poll)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Streaming per-route analyzer for Render/CDN access logs")
+    parser.add_argument("logs", nargs="*", default=["-"], help="Log files ('-' = stdin)")
+    parser.add_argument("--follow", action="store_true", help="Keep reading appended lines (single file)")
+    parser.add_argument("--report-every", type=float, default=0,
+                        help="Print an intermediate report every N seconds while streaming")
+    parser.add_argument("--top", type=int, default=30, help="Routes shown in the table")
+    parser.add_argument("--json-report", type=str, help="Write the final report to this JSON file")
+    args = parser.parse_args()
+
+    analyzer = AccessLogAnalyzer()
+    last_report = time.monotonic()
+    try:
+        for path in args.logs:
+            stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8", errors="replace")
+            try:
+                lines = _follow(stream) if args.follow and path != "-" else stream
+                for line in lines:
+                    analyzer.feed(line)
+                    if args.report_every and time.monotonic() - last_report >= args.report_every:
+                        print_report(analyzer.report(), args.top)
+                        last_report = time.monotonic()
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+    except KeyboardInterrupt:
+        pass
+
+    report = analyzer.report()
+    print_report(report, args.top)
+    if args.json_report:
+        with open(args.json_report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Add missing column translations"""
 
-import json
+from locale_store import LocaleStore
 
 columns_translations = {
     "en": {
@@ -39,29 +39,19 @@ columns_translations = {
     }
 }
 
-def update_locale_columns(lang):
-    filepath = rf'C:\Users\PC\Desktop\IGV\igv-frontend\src\i18n\locales\{lang}.json'
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Ensure structure
-    if 'admin' not in data:
-        data['admin'] = {}
-    if 'crm' not in data['admin']:
-        data['admin']['crm'] = {}
-    if 'leads' not in data['admin']['crm']:
-        data['admin']['crm']['leads'] = {}
-    
-    # Add columns
-    data['admin']['crm']['leads']['columns'] = columns_translations[lang]
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ Updated {lang}.json with columns")
+def mutations():
+    """Locale mutations of this script (see locale_store.py)"""
+    return [("set", lang, "admin.crm.leads.columns", columns_translations[lang]) for lang in ['en', 'fr', 'he']]
 
-for lang in ['en', 'fr', 'he']:
-    update_locale_columns(lang)
 
-print("\n✅ Column translations added!")
+def main():
+    store = LocaleStore()
+    store.apply(mutations())
+    for lang in store.save():
+        print(f"✅ Updated {lang}.json with columns")
+
+    print("\n✅ Column translations added!")
+
+
+if __name__ == '__main__':
+    main()
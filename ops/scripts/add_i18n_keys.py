@@ -7,8 +7,7 @@ Génère les traductions FR, EN, HE pour toutes les clés manquantes
 et les insère aux bons emplacements dans les fichiers JSON.
 """
 
-import json
-from pathlib import Path
+from locale_store import LocaleStore
 
 # Définir les nouvelles clés à ajouter avec traductions FR, EN, HE
 NEW_KEYS = {
@@ -207,50 +206,26 @@ NEW_KEYS = {
 }
 
 
-def add_key_to_nested_dict(d, key_path, value):
-    """Ajoute une clé à un dictionnaire nested de manière récursive."""
-    if len(key_path) == 1:
-        # Dernière clé : ajouter la valeur si elle n'existe pas
-        if key_path[0] not in d:
-            d[key_path[0]] = value
-            return True
-        return False
-    else:
-        # Créer la section intermédiaire si elle n'existe pas
-        if key_path[0] not in d:
-            d[key_path[0]] = {}
-        return add_key_to_nested_dict(d[key_path[0]], key_path[1:], value)
-
-
-def update_locale_file(locale_path, lang):
-    """Met à jour un fichier JSON locale avec les nouvelles clés."""
-    with open(locale_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    added_count = 0
-    for key_path, translations in NEW_KEYS.items():
-        if add_key_to_nested_dict(data, key_path, translations[lang]):
-            added_count += 1
-            print(f"  ✓ Ajout {'.'.join(key_path)} = {translations[lang]}")
-    
-    # Sauvegarder avec indentation correcte
-    with open(locale_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    return added_count
+def mutations():
+    """Ajouts de clés (seulement si absentes) pour chaque langue, cf. locale_store.py."""
+    return [("add", lang, key_path, translations[lang])
+            for lang in ("fr", "en", "he")
+            for key_path, translations in NEW_KEYS.items()]
 
 
 def main():
-    base_path = Path(r"C:\Users\PC\Desktop\IGV\igv-frontend\src\i18n\locales")
-    
     print("🌍 Ajout automatique des clés i18n manquantes\n")
-    
-    for lang_file, lang_code in [("fr.json", "fr"), ("en.json", "en"), ("he.json", "he")]:
-        locale_path = base_path / lang_file
-        print(f"📝 {lang_file} ({lang_code.upper()}):")
-        count = update_locale_file(locale_path, lang_code)
-        print(f"  ✅ {count} clés ajoutées\n")
-    
+
+    store = LocaleStore()
+    changes = store.apply(mutations())
+    for lang in store.languages:
+        print(f"📝 {lang}.json ({lang.upper()}):")
+        added = [path for _, changed_lang, path in changes if changed_lang == lang]
+        for path in added:
+            print(f"  ✓ Ajout {path} = {store.get(lang, path)}")
+        print(f"  ✅ {len(added)} clés ajoutées\n")
+    store.save()
+
     print(f"✨ Migration terminée ! {len(NEW_KEYS)} clés ajoutées au total.")
 
 
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Moteur de sondes asyncio pour monitor_deploy.py
+Mission: Lancer toutes les sondes HTTP en parallèle (deadline par sonde,
+plafond global de concurrence) au lieu de les enchaîner une par une.
+
+Client HTTP/1.1 minimal basé sur la stdlib (asyncio + ssl), pour ne pas
+ajouter de dépendance en plus de `requests`. Les connexions keep-alive sont
+réutilisées d'une itération à l'autre via ConnectionPool. Chaque réponse
+porte le détail des phases (DNS, connect, TLS, TTFB, body).
+
+Avec digest=True, le corps est lu par blocs à travers un hash incrémental
+(BodyDigest): mémoire constante quelle que soit la taille de la réponse.
+"""
+import asyncio
+import hashlib
+import socket
+import ssl
+import time
+from urllib.parse import urlsplit, urljoin
+
+DEFAULT_TIMEOUT = 10  # seconds, per probe
+DEFAULT_CONCURRENCY = 8
+MAX_REDIRECTS = 5
+USER_AGENT = "igv-monitor/1.0"
+PHASES = ("dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "body_ms")
+READ_CHUNK = 64 * 1024
+KEEP_BYTES = 64 * 1024  # head of a streamed body kept for parsing (index.html, /health JSON)
+
+
+class ProbeError(Exception):
+    """Raised when a response cannot be read or parsed"""
+
+
+class BodyDigest:
+    """
+    Incremental sink for a streamed body: hashes every byte, keeps the first
+    `keep_bytes` for parsing, and stops accepting data after `max_bytes`.
+    """
+
+    def __init__(self, keep_bytes=KEEP_BYTES, max_bytes=None):
+        self.keep_bytes = keep_bytes
+        self.max_bytes = max_bytes
+        self.reset()
+
+    def reset(self):
+        self.size = 0
+        self.truncated = False
+        self._hash = hashlib.sha256()
+        self._head = bytearray()
+
+    def feed(self, chunk):
+        """Consume one chunk; returns False once the byte cap is reached"""
+        if self.max_bytes is not None and self.size + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.size]
+            self.truncated = True
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        room = self.keep_bytes - len(self._head)
+        if room > 0:
+            self._head += chunk[:room]
+        return not self.truncated
+
+    @property
+    def head(self):
+        return bytes(self._head)
+
+    @property
+    def digest(self):
+        """Short SHA-256 of the bytes read so far (same form as build_fingerprint digests)"""
+        return self._hash.hexdigest()[:16]
+
+
+def _default_port(scheme):
+    return 443 if scheme == "https" else 80
+
+
+def _pool_key(parts):
+    return parts.scheme, parts.hostname, parts.port or _default_port(parts.scheme)
+
+
+def _ms(start, end):
+    return round((end - start) * 1000, 1)
+
+
+async def _open_connection(scheme, host, port):
+    """
+    Open a connection step by step so each phase can be timed.
+    Returns (reader, writer, {"dns_ms", "connect_ms", "tls_ms"}).
+    """
+    loop = asyncio.get_running_loop()
+    t0 = time.perf_counter()
+    infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    t1 = time.perf_counter()
+
+    sock = None
+    last_error = None
+    for family, type_, proto, _, address in infos:
+        sock = socket.socket(family, type_, proto)
+        sock.setblocking(False)
+        try:
+            await loop.sock_connect(sock, address)
+            break
+        except OSError as e:
+            sock.close()
+            sock = None
+            last_error = e
+        except BaseException:
+            # Timeout / cancellation (asyncio.wait_for) mid-connect: do not leak the socket
+            sock.close()
+            raise
+    if sock is None:
+        raise last_error or OSError(f"Cannot connect to {host}:{port}")
+    t2 = time.perf_counter()
+
+    ssl_ctx = ssl.create_default_context() if scheme == "https" else None
+    try:
+        reader, writer = await asyncio.open_connection(
+            sock=sock, ssl=ssl_ctx, server_hostname=host if ssl_ctx else None
+        )
+    except BaseException:
+        sock.close()
+        raise
+    t3 = time.perf_counter()
+    return reader, writer, {
+        "dns_ms": _ms(t0, t1),
+        "connect_ms": _ms(t1, t2),
+        "tls_ms": _ms(t2, t3) if ssl_ctx else 0.0,
+    }
+
+
+class ConnectionPool:
+    """
+    Keep-alive connections shared across probes and polling iterations,
+    keyed by (scheme, host, port). Must be used from a single event loop.
+    """
+
+    def __init__(self, max_idle_per_host=DEFAULT_CONCURRENCY):
+        self.max_idle_per_host = max_idle_per_host
+        self.opened = 0
+        self.reused = 0
+        self._idle = {}
+
+    async def acquire(self, key):
+        """Return (reader, writer, reused, setup timings) for the given pool key"""
+        idle = self._idle.get(key, [])
+        while idle:
+            reader, writer = idle.pop()
+            if reader.at_eof() or writer.is_closing():
+                writer.close()
+                continue
+            self.reused += 1
+            return reader, writer, True, {"dns_ms": 0.0, "connect_ms": 0.0, "tls_ms": 0.0}
+        reader, writer, timings = await _open_connection(*key)
+        self.opened += 1
+        return reader, writer, False, timings
+
+    def release(self, key, reader, writer):
+        """Give a healthy connection back to the pool"""
+        idle = self._idle.setdefault(key, [])
+        if len(idle) >= self.max_idle_per_host or writer.is_closing():
+            writer.close()
+            return
+        idle.append((reader, writer))
+
+    def close(self):
+        """Close every idle connection"""
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
+
+
+async def _read_headers(reader):
+    """
+    Read status line + headers.
+    Returns (status_code, headers dict, http version, first byte timestamp).
+    """
+    raw = await reader.readexactly(1)
+    ttfb = time.perf_counter()
+    raw += await reader.readuntil(b"\r\n\r\n")
+    lines = raw.decode("iso-8859-1").split("\r\n")
+    parts = lines[0].split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise ProbeError(f"Invalid status line: {lines[0]!r}")
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return int(parts[1]), headers, parts[0], ttfb
+
+
+async def _body_chunks(reader, headers):
+    """Yield the response body in chunks of at most READ_CHUNK bytes, according to its framing"""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                # Skip trailers until the empty line
+                while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                    pass
+                return
+            while size:
+                piece = await reader.readexactly(min(size, READ_CHUNK))
+                size -= len(piece)
+                yield piece
+            await reader.readexactly(2)
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            piece = await reader.readexactly(min(remaining, READ_CHUNK))
+            remaining -= len(piece)
+            yield piece
+    else:
+        while True:
+            piece = await reader.read(READ_CHUNK)
+            if not piece:
+                return
+            yield piece
+
+
+async def _read_body(reader, headers, status_code, method, sink=None):
+    """
+    Read the response body according to its framing. With a BodyDigest
+    sink, chunks are streamed into it and only its kept head is returned.
+    """
+    if method == "HEAD" or status_code in (204, 304) or 100 <= status_code < 200:
+        return b""
+    if sink is None:
+        if "content-length" in headers and headers.get("transfer-encoding", "").lower() != "chunked":
+            return await reader.readexactly(int(headers["content-length"]))
+        return b"".join([chunk async for chunk in _body_chunks(reader, headers)])
+    async for chunk in _body_chunks(reader, headers):
+        if not sink.feed(chunk):
+            break
+    return sink.head
+
+
+def _can_keep_alive(version, headers, method, status_code):
+    if headers.get("connection", "").lower() == "close" or version == "HTTP/1.0":
+        return False
+    if method == "HEAD" or status_code in (204, 304):
+        return True
+    return "content-length" in headers or headers.get("transfer-encoding", "").lower() == "chunked"
+
+
+async def _exchange(reader, writer, head, method, sink=None):
+    sent = time.perf_counter()
+    writer.write(head)
+    await writer.drain()
+    status_code, response_headers, version, first_byte = await _read_headers(reader)
+    body = await _read_body(reader, response_headers, status_code, method, sink)
+    done = time.perf_counter()
+    timings = {"ttfb_ms": _ms(sent, first_byte), "body_ms": _ms(first_byte, done)}
+    return status_code, response_headers, version, body, timings
+
+
+async def _request_once(url, method, headers, pool=None, data=None, sink=None):
+    """Send one request, return (status_code, headers, body, reused, phases)"""
+    parts = urlsplit(url)
+    key = _pool_key(parts)
+    _, host, port = key
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+
+    host_header = host if port == _default_port(parts.scheme) else f"{host}:{port}"
+    request_headers = {
+        "Host": host_header,
+        "User-Agent": USER_AGENT,
+        "Accept": "*/*",
+        "Connection": "keep-alive" if pool else "close",
+    }
+    if data is not None:
+        request_headers["Content-Length"] = str(len(data))
+    request_headers.update(headers or {})
+    head = f"{method} {path} HTTP/1.1\r\n"
+    head += "".join(f"{k}: {v}\r\n" for k, v in request_headers.items())
+    head = (head + "\r\n").encode("iso-8859-1") + (data or b"")
+
+    if pool is None:
+        reader, writer, phases = await _open_connection(*key)
+        reused = False
+    else:
+        reader, writer, reused, phases = await pool.acquire(key)
+
+    try:
+        try:
+            status_code, response_headers, version, body, timings = await _exchange(reader, writer, head, method,
+                                                                                    sink)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            if not reused:
+                raise
+            # The server dropped the idle connection: retry once on a fresh one
+            writer.close()
+            reader, writer, phases = await _open_connection(*key)
+            pool.opened += 1
+            reused = False
+            if sink is not None:
+                sink.reset()
+            status_code, response_headers, version, body, timings = await _exchange(reader, writer, head, method,
+                                                                                    sink)
+    except BaseException:
+        writer.close()
+        raise
+
+    truncated = sink is not None and sink.truncated  # unread bytes left on the wire
+    if pool is not None and not truncated and _can_keep_alive(version, response_headers, method, status_code):
+        pool.release(key, reader, writer)
+    else:
+        writer.close()
+    phases.update(timings)
+    return status_code, response_headers, body, reused, phases
+
+
+async def fetch(url, method="GET", timeout=DEFAULT_TIMEOUT, headers=None, follow_redirects=True,
+                pool=None, data=None, digest=False, max_body=None):
+    """
+    Send one HTTP request and return a response dict:
+    {"url", "status_code", "headers", "body", "elapsed_ms", "reused", "phases"}
+
+    "phases" holds dns_ms / connect_ms / tls_ms / ttfb_ms / body_ms for the
+    final request, plus redirect_ms for the time spent on earlier hops.
+
+    With a ConnectionPool, keep-alive connections are reused and "reused"
+    tells whether the final request ran on a warm connection.
+
+    `data` (bytes) is sent as the request body; a 303 redirect turns the
+    request into a body-less GET.
+
+    With digest=True (or a `max_body` byte cap) the body is streamed through
+    a BodyDigest: "body" only holds its first KEEP_BYTES, and the response
+    gains "body_sha" (over everything read), "body_bytes" and "truncated"
+    (True when `max_body` stopped the download).
+
+    The whole exchange (redirects included) must finish within `timeout`
+    seconds, otherwise asyncio.TimeoutError is raised.
+    """
+    async def _run():
+        current = url
+        current_method, current_data = method, data
+        start = time.perf_counter()
+        streamed = digest or max_body is not None
+        for _ in range(MAX_REDIRECTS + 1):
+            hop_start = time.perf_counter()
+            sink = BodyDigest(max_bytes=max_body) if streamed else None
+            status_code, response_headers, body, reused, phases = await _request_once(
+                current, current_method, headers, pool, current_data, sink
+            )
+            location = response_headers.get("location")
+            if follow_redirects and location and status_code in (301, 302, 303, 307, 308):
+                current = urljoin(current, location)
+                if status_code == 303:
+                    current_method, current_data = "GET", None
+                continue
+            response = {
+                "url": current,
+                "status_code": status_code,
+                "headers": response_headers,
+                "body": body,
+                "elapsed_ms": int((time.perf_counter() - start) * 1000),
+                "reused": reused,
+                "phases": dict(phases, redirect_ms=_ms(start, hop_start)),
+            }
+            if sink is not None:
+                response.update(body_sha=sink.digest, body_bytes=sink.size, truncated=sink.truncated)
+            return response
+        raise ProbeError(f"Too many redirects for {url}")
+
+    return await asyncio.wait_for(_run(), timeout)
+
+
+async def gather_limited(factories, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Run coroutine factories concurrently, at most `concurrency` at a time.
+    Results are returned in the same order as `factories`.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _guarded(factory):
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(_guarded(f) for f in factories))
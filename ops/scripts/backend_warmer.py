@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Démon de préchauffage du backend Render (cold starts)
+Mission: Garder igv-cms-backend éveillé avec le minimum de pings, en
+apprenant le délai d'inactivité avant mise en veille à partir des sauts de
+latence observés, et journaliser chaque cold start avec son coût de réveil.
+
+Principe: chaque ping après un temps d'inactivité `gap` nous apprend soit
+que la fenêtre de mise en veille est > gap (réponse chaude), soit qu'elle
+est <= gap (cold start). On élargit l'intervalle tant que tout reste chaud,
+puis on se cale sous la borne apprise avec une marge de sécurité.
+"""
+import json
+import time
+from datetime import datetime
+
+import probe_stats
+
+INITIAL_INTERVAL = 300  # seconds between pings before anything is learned
+MIN_INTERVAL = 60
+GROWTH_FACTOR = 1.25  # widen the interval while pings stay warm
+SAFETY_MARGIN = 0.8  # ping at 80% of the learned spin-down window
+COLD_START_MIN_MS = 3000  # never call a response under 3s a cold start
+COLD_START_FACTOR = 5  # ... nor one under 5x the warm median
+PROBE_TIMEOUT = 90  # per-ping deadline: Render free-tier cold starts take 30s and more
+WAKE_UP_DEADLINE = 180  # keep retrying a failed ping this long before logging a timeout
+RETRY_INTERVAL = 5  # seconds between retries while the backend wakes up
+
+
+class SpindownEstimator:
+    """Bound the idle-to-spindown window from (idle gap, was cold) observations"""
+
+    def __init__(self, initial_interval=INITIAL_INTERVAL):
+        self.initial_interval = initial_interval
+        self.warm_gap = 0.0  # longest idle gap that stayed warm (lower bound)
+        self.cold_gap = None  # shortest idle gap that went cold (upper bound)
+
+    def observe(self, gap, cold):
+        if cold:
+            self.cold_gap = gap if self.cold_gap is None else min(self.cold_gap, gap)
+            # Spin-down may have been triggered by an external pause: keep bounds consistent
+            if self.warm_gap >= self.cold_gap:
+                self.warm_gap = self.cold_gap * SAFETY_MARGIN
+        else:
+            self.warm_gap = max(self.warm_gap, gap)
+
+    def estimate(self):
+        """Best guess of the spin-down window in seconds (None until a cold start was seen)"""
+        if self.cold_gap is None:
+            return None
+        return (self.warm_gap + self.cold_gap) / 2
+
+    def next_interval(self):
+        """Longest idle gap believed to be safe"""
+        if self.cold_gap is None:
+            base = max(self.initial_interval, self.warm_gap)
+            return base * GROWTH_FACTOR if self.warm_gap else base
+        return max(MIN_INTERVAL, min(self.cold_gap * SAFETY_MARGIN, max(self.warm_gap, self.estimate())))
+
+
+class ColdStartDetector:
+    """Flag latency jumps against the rolling warm baseline"""
+
+    def __init__(self, window=probe_stats.DEFAULT_WINDOW):
+        self.warm = probe_stats.RollingStats(window)
+
+    def threshold_ms(self):
+        median = self.warm.percentile(50)
+        return max(COLD_START_MIN_MS, COLD_START_FACTOR * median) if median else COLD_START_MIN_MS
+
+    def classify(self, result):
+        """Return (cold, latency_ms) for a check_backend() result"""
+        latency = result.get("response_time_ms")
+        if result.get("status") != "OK" or latency is None:
+            # Timed out or errored while waking up
+            return True, latency
+        cold = latency >= self.threshold_ms()
+        if not cold:
+            self.warm.add(latency)
+        return cold, latency
+
+
+def log_cold_start(path, event):
+    """Append one cold start as a JSON line"""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+def run_warmer(probe, log_path=None, initial_interval=INITIAL_INTERVAL, max_pings=None,
+               sleep=time.sleep, clock=time.time):
+    """
+    Ping the backend with `probe` (check_backend) forever, or `max_pings` times.
+    A failed ping is retried until the backend answers, so the wake-up cost
+    is measured from the first ping; pings still failing after
+    WAKE_UP_DEADLINE are counted as timeouts, not as 0 ms wake-ups.
+    Returns a summary dict of pings, cold starts, timeouts and total wake-up cost.
+    """
+    estimator = SpindownEstimator(initial_interval)
+    detector = ColdStartDetector()
+    summary = {"pings": 0, "cold_starts": 0, "timeouts": 0, "wake_up_ms_total": 0}
+    last_ping = None
+
+    try:
+        while max_pings is None or summary["pings"] < max_pings:
+            now = clock()
+            result = probe()
+            summary["pings"] += 1
+            cold, latency = detector.classify(result)
+            retries = 0
+            while result.get("status") != "OK" and clock() - now < WAKE_UP_DEADLINE:
+                sleep(RETRY_INTERVAL)
+                result = probe()
+                retries += 1
+            summary["pings"] += retries
+            if result.get("status") != "OK":
+                latency = None  # still not up: a timeout, not a 0 ms wake-up
+            elif retries:
+                latency = int((clock() - now) * 1000)  # answered after retries: time since the first ping
+            gap = now - last_ping if last_ping is not None else None
+            last_ping = clock()
+
+            if gap is not None:
+                estimator.observe(gap, cold)
+            if cold:
+                summary["cold_starts"] += 1
+                if latency is None:
+                    summary["timeouts"] += 1
+                else:
+                    summary["wake_up_ms_total"] += latency
+                event = {
+                    "timestamp": datetime.now().isoformat(timespec="seconds"),
+                    "event": "cold_start",
+                    "idle_gap_s": None if gap is None else round(gap, 1),
+                    "wake_up_ms": latency,
+                    "timed_out": latency is None,
+                    "error": result.get("error"),
+                }
+                idle = "unknown idle time" if gap is None else f"{int(gap)}s idle"
+                wake_up = f"awake in {latency}ms" if latency is not None else f"no answer after {int(clock() - now)}s"
+                print(f"🥶 Cold start after {idle}: {wake_up}")
+                if log_path:
+                    log_cold_start(log_path, event)
+            else:
+                print(f"🔥 Warm: {latency}ms")
+
+            interval = estimator.next_interval()
+            window = estimator.estimate()
+            learned = f"spin-down ≈ {int(window)}s" if window else "spin-down not observed yet"
+            print(f"   Next ping in {int(interval)}s ({learned})")
+            if max_pings is not None and summary["pings"] >= max_pings:
+                break
+            sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+    summary["spindown_estimate_s"] = estimator.estimate()
+    return summary
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Empreinte du build en ligne pour monitor_deploy.py
+Mission: Vérifier que le build déployé correspond au SHA local, avec des
+requêtes conditionnelles (If-None-Match / If-Modified-Since) pour ne jamais
+retélécharger un index.html inchangé.
+
+Le frontend expose son commit via <meta name="igv-build"> (injecté au build
+par craco.config.js depuis RENDER_GIT_COMMIT), le backend via /health.
+"""
+import hashlib
+import re
+
+import async_probe
+
+BUILD_META_RE = re.compile(rb'<meta[^>]+name="?igv-build"?[^>]+content="?([0-9a-fA-F]*)', re.I)
+MAIN_BUNDLE_RE = re.compile(rb'/static/js/(main\.[0-9a-f]+\.js)')
+BACKEND_BUILD_KEYS = ("commit", "git_sha", "sha")
+SHA_RE = re.compile(r"[0-9a-f]{7,40}")
+
+
+def parse_fingerprint(html, digest=None):
+    """
+    Extract {"build_sha", "main_bundle", "digest"} from an index.html body.
+    `digest` overrides the hash when `html` is only the head of a streamed body.
+    """
+    meta = BUILD_META_RE.search(html or b"")
+    bundle = MAIN_BUNDLE_RE.search(html or b"")
+    return {
+        "build_sha": meta.group(1).decode() if meta and meta.group(1) else None,
+        "main_bundle": bundle.group(1).decode() if bundle else None,
+        "digest": digest or hashlib.sha256(html or b"").hexdigest()[:16],
+    }
+
+
+def backend_build(data):
+    """Return the commit advertised by the backend /health payload (None when it exposes none)"""
+    for key in BACKEND_BUILD_KEYS:
+        if data.get(key):
+            return str(data[key])
+    return None
+
+
+def is_sha(value):
+    """True for a hex commit SHA of at least 7 characters (not "1" or "1.0.0")"""
+    return bool(value) and SHA_RE.fullmatch(value.strip().lower()) is not None
+
+
+def sha_matches(expected, live):
+    """Compare a short local SHA with a (possibly full) live one"""
+    if not is_sha(expected) or not is_sha(live):
+        return False
+    expected, live = expected.strip().lower(), live.strip().lower()
+    return live.startswith(expected) or expected.startswith(live)
+
+
+class ValidatorCache:
+    """
+    Remember ETag / Last-Modified and the parsed fingerprint per URL, so the
+    next poll can send a conditional request and reuse the fingerprint on 304.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def conditional_headers(self, url):
+        """Headers to send so an unchanged resource comes back as 304"""
+        entry = self._entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url, status_code, headers, body, digest=None, size=None):
+        """
+        Record a response and return (fingerprint, changed).
+        `headers` must use lowercase names; `digest` / `size` describe the
+        whole streamed body when `body` is only its head. On 304 the
+        fingerprint saved with the last 200 is returned, digest and size included.
+        """
+        entry = self._entries.get(url)
+        if status_code == 304 and entry:
+            return entry["fingerprint"], False
+        if status_code != 200:
+            return None, False
+
+        fingerprint = dict(parse_fingerprint(body, digest), body_bytes=len(body or b"") if size is None else size)
+        changed = entry is None or entry["fingerprint"]["digest"] != fingerprint["digest"]
+        self._entries[url] = {
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fingerprint": fingerprint,
+        }
+        return fingerprint, changed
+
+
+async def check_revalidation(url, timeout=async_probe.DEFAULT_TIMEOUT):
+    """
+    Fetch `url`, then revalidate it with the cached validators. Returns a dict
+    telling whether the server answered 304 and whether the digest and size
+    reported for the 304 match the ones of the 200.
+    """
+    cache = ValidatorCache()
+    pool = async_probe.ConnectionPool()
+    try:
+        seen = []
+        for _ in range(2):
+            response = await async_probe.fetch(url, timeout=timeout, pool=pool,
+                                               headers=cache.conditional_headers(url), digest=True)
+            fingerprint, _ = cache.update(url, response["status_code"], response["headers"], response["body"],
+                                          digest=response["body_sha"], size=response["body_bytes"])
+            seen.append((response["status_code"], fingerprint or {}))
+    finally:
+        pool.close()
+    (first_status, first), (second_status, second) = seen
+    return {
+        "statuses": [first_status, second_status],
+        "not_modified": second_status == 304,
+        "digest": [first.get("digest"), second.get("digest")],
+        "body_bytes": [first.get("body_bytes"), second.get("body_bytes")],
+        "stable": first_status == 200 and first.get("digest") == second.get("digest")
+                  and first.get("body_bytes") == second.get("body_bytes"),
+    }
+
+
+def main():
+    import argparse
+    import asyncio
+    parser = argparse.ArgumentParser(description="Check that a 200 -> 304 revalidation keeps the build fingerprint")
+    parser.add_argument("url", help="index.html URL, e.g. https://israelgrowthventure.com/")
+    parser.add_argument("--timeout", type=float, default=async_probe.DEFAULT_TIMEOUT)
+    args = parser.parse_args()
+
+    result = asyncio.run(check_revalidation(args.url, args.timeout))
+    print(f"🔎 {args.url}: {result['statuses'][0]} -> {result['statuses'][1]}")
+    print(f"   digest {result['digest'][0]} -> {result['digest'][1]}, "
+          f"{result['body_bytes'][0]} -> {result['body_bytes'][1]} bytes")
+    if not result["not_modified"]:
+        print("⚠️  No 304 on revalidation: the server ignores If-None-Match / If-Modified-Since")
+    print("✅ Fingerprint stable across revalidation" if result["stable"] else "❌ Fingerprint changed on revalidation")
+    raise SystemExit(0 if result["stable"] else 1)
+
+
+if __name__ == "__main__":
+    main()
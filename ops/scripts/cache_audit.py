@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Audit de conformité des en-têtes de cache par rapport à render.yaml
+Mission: Vérifier que chaque fichier de build/ est réellement servi avec le
+Cache-Control déclaré (/* 86400 s, /static/* 31536000 s), avec un ETag et
+compressé, et lister les assets en cache trop court (fichiers hashés) ou
+dangereusement long (fichiers non hashés, y compris ceux de public/).
+
+Sans --base-url, build/ est servi localement par standin_server.py avec
+les règles de render.yaml ; avec --base-url, c'est le site en ligne (ou un
+autre serveur) qui est audité.
+
+Usage:
+    python cache_audit.py                      # build/ local via le stand-in
+    python cache_audit.py --base-url https://israelgrowthventure.com --rate 5
+"""
+import asyncio
+import json
+import os
+import re
+from urllib.parse import quote
+
+import async_probe
+import render_config
+import standin_server
+from rate_limit import TokenBucket
+
+BUILD_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'build')
+PUBLIC_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'public')
+DEFAULT_RATE = 20  # requests per second (lower it for the live site)
+DEFAULT_CONCURRENCY = 8
+
+# CRA content hashes: main.1a2b3c4d.js, 787.8f2e1c3a.chunk.js, logo.5d5d9eef.svg, main.1a2b3c4d.css.map
+HASHED_RE = re.compile(r"\.[0-9a-f]{8,}\.(?:chunk\.)?[A-Za-z0-9]+(?:\.map)?$")
+HASHED_MIN_AGE = 30 * 86400  # content-hashed assets should be cached at least this long
+UNHASHED_MAX_AGE = 86400  # anything without a content hash must not outlive a day
+HTML_MAX_AGE = 3600  # entry documents pin the deployed build in browsers
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml",
+                      "application/xml", "application/manifest+json")
+COMPRESS_MIN_BYTES = 1024
+
+
+def build_paths(build_dir=BUILD_DIR):
+    """URL paths of every file in build/, sorted"""
+    paths = []
+    for root, _, files in os.walk(build_dir):
+        for name in files:
+            rel = os.path.relpath(os.path.join(root, name), build_dir).replace(os.sep, "/")
+            paths.append("/" + rel)
+    return sorted(paths)
+
+
+def is_hashed(path):
+    return bool(HASHED_RE.search(path))
+
+
+def audit_response(path, response, rules):
+    """Return the findings for one served file: [{"path", "severity", "issue", "detail"}]"""
+    findings = []
+
+    def finding(severity, issue, detail):
+        findings.append({"path": path, "severity": severity, "issue": issue, "detail": detail})
+
+    if response.get("error") or response["status_code"] != 200:
+        finding("error", "unreachable", response.get("error") or f"HTTP {response['status_code']}")
+        return findings
+
+    headers = response["headers"]
+    declared = render_config.header_for(path, rules)
+    served = headers.get("cache-control")
+    declared_age, served_age = render_config.max_age(declared), render_config.max_age(served)
+    if declared is not None and declared_age != served_age:
+        finding("error", "rule_mismatch", f"served '{served}', render.yaml declares '{declared}'")
+
+    hashed = is_hashed(path)
+    content_type = headers.get("content-type", "")
+    if hashed and (served_age or 0) < HASHED_MIN_AGE:
+        finding("warning", "too_short", f"content-hashed but max-age={served_age}")
+    if not hashed and (served_age or 0) > UNHASHED_MAX_AGE:
+        finding("error", "dangerously_long", f"no content hash but max-age={served_age}")
+    elif content_type.startswith("text/html") and (served_age or 0) > HTML_MAX_AGE:
+        finding("warning", "dangerously_long",
+                f"HTML entry document cached max-age={served_age}: browsers may keep an old build")
+
+    if not hashed and not headers.get("etag") and not headers.get("last-modified"):
+        finding("warning", "no_validator", "no ETag / Last-Modified: expired copies are re-downloaded")
+    if (content_type.startswith(COMPRESSIBLE_TYPES) and response["body_bytes"] >= COMPRESS_MIN_BYTES
+            and not headers.get("content-encoding")):
+        finding("warning", "uncompressed", f"{content_type}, {response['body_bytes']} bytes sent uncompressed")
+    return findings
+
+
+def audit_public(rules, public_dir=PUBLIC_DIR):
+    """Static check: un-hashed files of public/ whose declared caching is long-lived"""
+    findings = []
+    for root, _, files in os.walk(public_dir):
+        for name in files:
+            rel = os.path.relpath(os.path.join(root, name), public_dir).replace(os.sep, "/")
+            path = "/" + rel
+            age = render_config.max_age(render_config.header_for(path, rules))
+            if not is_hashed(path) and (age or 0) > UNHASHED_MAX_AGE:
+                findings.append({"path": f"public{path}", "severity": "error", "issue": "dangerously_long",
+                                 "detail": f"copied as-is to build/ but declared max-age={age}"})
+    return findings
+
+
+async def _fetch(base_url, path, bucket, pool, timeout):
+    await bucket.acquire()
+    try:
+        response = await async_probe.fetch(f"{base_url}{quote(path)}", timeout=timeout, pool=pool,
+                                           headers={"Accept-Encoding": "gzip, br"}, follow_redirects=False,
+                                           digest=True)
+        return path, response
+    except Exception as e:
+        return path, {"error": str(e) or e.__class__.__name__}
+
+
+async def sweep(paths, base_url=None, build_dir=BUILD_DIR, rules=None, rate=DEFAULT_RATE,
+                concurrency=DEFAULT_CONCURRENCY, timeout=async_probe.DEFAULT_TIMEOUT,
+                render_yaml=render_config.RENDER_YAML):
+    """
+    Fetch every path concurrently (rate-limited) and audit the responses.
+    Without base_url, build_dir is served by an in-process stand-in that
+    applies the header rules of `render_yaml`.
+    Returns the list of findings.
+    """
+    server = None
+    if base_url is None:
+        server, _ = await standin_server.start_server(standin_server.StandinConfig(build_dir=build_dir, render_yaml=render_yaml), port=0)
+        base_url = "http://127.0.0.1:%d" % server.sockets[0].getsockname()[1]
+    bucket = TokenBucket(rate)
+    pool = async_probe.ConnectionPool(max_idle_per_host=concurrency)
+    try:
+        factories = [(lambda p=path: _fetch(base_url.rstrip("/"), p, bucket, pool, timeout)) for path in paths]
+        responses = await async_probe.gather_limited(factories, concurrency)
+    finally:
+        pool.close()
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+    findings = []
+    for path, response in responses:
+        findings.extend(audit_response(path, response, rules))
+    return findings
+
+
+def print_report(findings, audited):
+    errors = [f for f in findings if f["severity"] == "error"]
+    print(f"\n🗄️  Cache audit: {audited} files, {len(errors)} errors, {len(findings) - len(errors)} warnings")
+    print("-" * 70)
+    for issue in ("unreachable", "rule_mismatch", "dangerously_long", "too_short", "no_validator", "uncompressed"):
+        group = [f for f in findings if f["issue"] == issue]
+        if not group:
+            continue
+        print(f"\n{issue} ({len(group)})")
+        for f in group:
+            icon = "❌" if f["severity"] == "error" else "⚠️"
+            print(f"   {icon} {f['path']}: {f['detail']}")
+    if not findings:
+        print("✅ Every file matches the render.yaml cache rules")
+    return not errors
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Audit cache headers of build/ against render.yaml")
+    parser.add_argument("--build-dir", type=str, default=BUILD_DIR)
+    parser.add_argument("--public-dir", type=str, default=PUBLIC_DIR)
+    parser.add_argument("--render-yaml", type=str, default=render_config.RENDER_YAML)
+    parser.add_argument("--base-url", type=str, help="Audit this server instead of a local stand-in")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Max requests per second")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--timeout", type=float, default=async_probe.DEFAULT_TIMEOUT)
+    parser.add_argument("--json-report", type=str, help="Write findings to this JSON file")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.build_dir):
+        print(f"❌ {args.build_dir} not found: run `npm run build` first")
+        raise SystemExit(1)
+
+    rules = render_config.load_rules(args.render_yaml)["headers"]
+    paths = build_paths(args.build_dir)
+    print(f"🔎 Auditing {len(paths)} files from {args.build_dir} "
+          f"against {args.base_url or 'a local stand-in'} ({args.rate} req/s max)")
+    findings = audit_public(rules, args.public_dir)
+    findings += asyncio.run(sweep(paths, args.base_url, args.build_dir, rules, args.rate,
+                                  args.concurrency, args.timeout, args.render_yaml))
+    ok = print_report(findings, len(paths))
+    if args.json_report:
+        with open(args.json_report, 'w', encoding='utf-8') as f:
+            json.dump(findings, f, indent=2, ensure_ascii=False)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Générateur de charge par scénarios pour le CRM admin
+Mission: Mesurer combien de commerciaux simultanés le CRM supporte avant de
+se dégrader, en rejouant leur parcours type avec des utilisateurs virtuels.
+
+Parcours (routes de src/utils/crmApi.js):
+    adminLogin -> getDashboardStats -> getLeads (paginé) -> getLead
+    -> addLeadNote -> convertLeadToContact -> exportLeads
+
+La charge monte par paliers (1, 2, 4, ... utilisateurs). Pour chaque palier:
+débit, percentiles de latence par étape, taux d'erreur. Le point de
+saturation est le premier palier où le p90 double par rapport au premier
+palier, où les erreurs dépassent 1%, ou où le débit cesse de croître.
+
+Usage (contre standin_server.py par défaut, jamais la production implicitement):
+    python crm_load.py --backend-url http://127.0.0.1:8000 --max-users 64 --stage-seconds 30
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from urllib.parse import urlencode
+
+import async_probe
+import probe_stats
+
+DEFAULT_BACKEND = os.environ.get("IGV_LOAD_BACKEND_URL", "http://127.0.0.1:8000")
+DEFAULT_THINK_MS = 1000  # mean pause between two steps of a journey
+DEFAULT_STAGE_SECONDS = 30
+DEFAULT_MAX_USERS = 32
+LEADS_PAGE_SIZE = 20
+STAGE_WINDOW = 1_000_000  # keep every sample of a stage
+SATURATION_LATENCY_RATIO = 2.0
+SATURATION_ERROR_RATE = 0.01
+# Share of the linear throughput gain a stage must reach: doubling the users
+# must add 10% throughput, a 16 -> 17 users step only 10% of 1/16
+SATURATION_THROUGHPUT_GAIN = 0.1
+
+STEPS = (
+    "admin_login",
+    "dashboard_stats",
+    "get_leads",
+    "get_lead",
+    "add_lead_note",
+    "convert_lead",
+    "export_leads",
+)
+
+
+class StageMetrics:
+    """Latency and outcome samples of one load stage"""
+
+    def __init__(self, users):
+        self.users = users
+        self.steps = {step: probe_stats.RollingStats(STAGE_WINDOW) for step in STEPS}
+        self.overall = probe_stats.RollingStats(STAGE_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.journeys = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, step, latency_ms, ok):
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self.steps[step].add(latency_ms, ok)
+        self.overall.add(latency_ms, ok)
+
+    def summary(self):
+        duration = (self.finished or time.perf_counter()) - self.started
+        return {
+            "users": self.users,
+            "duration_s": round(duration, 1),
+            "requests": self.requests,
+            "journeys": self.journeys,
+            "throughput_rps": round(self.requests / duration, 2) if duration else None,
+            "journeys_per_min": round(self.journeys * 60 / duration, 1) if duration else None,
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else None,
+            "overall": self.overall.summary(),
+            "steps": {step: stats.summary() for step, stats in self.steps.items()},
+        }
+
+
+class VirtualUser:
+    """One sales user replaying the CRM journey on its own keep-alive connections"""
+
+    def __init__(self, base_url, credentials, metrics, think_ms, timeout, rng):
+        self.base_url = base_url.rstrip("/")
+        self.credentials = credentials
+        self.metrics = metrics
+        self.think_ms = think_ms
+        self.timeout = timeout
+        self.rng = rng
+        self.pool = async_probe.ConnectionPool(max_idle_per_host=2)
+        self.token = None
+
+    async def _call(self, step, method, path, payload=None):
+        headers = {"Accept": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        data = None
+        if payload is not None:
+            data = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        start = time.perf_counter()
+        try:
+            response = await async_probe.fetch(f"{self.base_url}{path}", method=method, headers=headers,
+                                               data=data, timeout=self.timeout, pool=self.pool, digest=True)
+        except Exception:
+            self.metrics.record(step, None, False)
+            return None
+        latency = (time.perf_counter() - start) * 1000
+        ok = response["status_code"] < 400
+        self.metrics.record(step, round(latency, 1), ok)
+        if not ok or "json" not in response["headers"].get("content-type", ""):
+            return {} if ok else None
+        try:
+            return json.loads(response["body"])
+        except ValueError:
+            return {}
+
+    async def _think(self):
+        if self.think_ms:
+            await asyncio.sleep(self.think_ms * self.rng.uniform(0.5, 1.5) / 1000)
+
+    async def journey(self):
+        """Run the journey once; a failed step ends it early"""
+        login = await self._call("admin_login", "POST", "/api/admin/login", self.credentials)
+        if not login or not login.get("access_token"):
+            return False
+        self.token = login["access_token"]
+        await self._think()
+
+        if await self._call("dashboard_stats", "GET", "/api/crm/dashboard/stats") is None:
+            return False
+        await self._think()
+
+        page = await self._call("get_leads", "GET", "/api/crm/leads?" + urlencode(
+            {"page": self.rng.randint(1, 3), "limit": LEADS_PAGE_SIZE}))
+        leads = (page or {}).get("leads") or []
+        if not leads:
+            return False
+        lead = self.rng.choice(leads)
+        lead_id = lead.get("_id") or lead.get("id") or lead.get("lead_id")
+        await self._think()
+
+        if await self._call("get_lead", "GET", f"/api/crm/leads/{lead_id}") is None:
+            return False
+        await self._think()
+
+        note = {"note_text": f"Load test note {int(time.time())}"}
+        if await self._call("add_lead_note", "POST", f"/api/crm/leads/{lead_id}/notes", note) is None:
+            return False
+        await self._think()
+
+        if await self._call("convert_lead", "POST", f"/api/crm/leads/{lead_id}/convert-to-contact") is None:
+            return False
+        await self._think()
+
+        return await self._call("export_leads", "GET", "/api/crm/export/leads") is not None
+
+    async def run_until(self, deadline):
+        try:
+            while time.perf_counter() < deadline:
+                if await self.journey():
+                    self.metrics.journeys += 1
+                await self._think()
+        finally:
+            self.pool.close()
+
+
+async def run_stage(base_url, credentials, users, duration, think_ms=DEFAULT_THINK_MS,
+                    timeout=async_probe.DEFAULT_TIMEOUT, seed=None):
+    """Drive `users` virtual users for `duration` seconds; returns the stage summary"""
+    metrics = StageMetrics(users)
+    deadline = time.perf_counter() + duration
+    rng = random.Random(seed)
+    vus = [
+        VirtualUser(base_url, credentials, metrics, think_ms, timeout, random.Random(rng.random()))
+        for _ in range(users)
+    ]
+    # Ramp users in over the first think time so they don't all log in at once
+    async def _start(vu, index):
+        await asyncio.sleep(think_ms / 1000 * index / max(1, users))
+        await vu.run_until(deadline)
+
+    await asyncio.gather(*(_start(vu, i) for i, vu in enumerate(vus)))
+    metrics.finished = time.perf_counter()
+    return metrics.summary()
+
+
+def required_throughput(previous, stage):
+    """Throughput `stage` must reach to count as still scaling from `previous`"""
+    ratio = stage["users"] / previous["users"]
+    return previous["throughput_rps"] * (1 + SATURATION_THROUGHPUT_GAIN * (ratio - 1))
+
+
+def find_saturation(stages):
+    """
+    Return (last healthy stage, first saturated stage, reason); the saturated
+    stage is None when no stage degraded.
+    """
+    if not stages:
+        return None, None, None
+    reference = stages[0]["overall"].get("p90_ms")
+    healthy = None
+    previous = None
+    for stage in stages:
+        p90 = stage["overall"].get("p90_ms")
+        reason = None
+        if stage["error_rate"] is None or stage["error_rate"] > SATURATION_ERROR_RATE:
+            reason = f"error rate {stage['error_rate']}"
+        elif reference and p90 and p90 > reference * SATURATION_LATENCY_RATIO:
+            reason = f"p90 {p90}ms > {SATURATION_LATENCY_RATIO}x {reference}ms"
+        elif previous and stage["throughput_rps"] < required_throughput(previous, stage):
+            reason = (f"throughput flat ({previous['throughput_rps']} -> {stage['throughput_rps']} req/s, "
+                      f"needed {round(required_throughput(previous, stage), 1)})")
+        if reason:
+            return healthy, stage, reason
+        healthy = previous = stage
+    return healthy, None, None
+
+
+def stage_sizes(start_users, max_users):
+    """Doubling ladder of concurrent users, always ending at max_users"""
+    sizes = []
+    users = max(1, start_users)
+    while users < max_users:
+        sizes.append(users)
+        users *= 2
+    sizes.append(max_users)
+    return sizes
+
+
+async def run_load(base_url, credentials, start_users=1, max_users=DEFAULT_MAX_USERS,
+                   stage_seconds=DEFAULT_STAGE_SECONDS, think_ms=DEFAULT_THINK_MS,
+                   timeout=async_probe.DEFAULT_TIMEOUT, stop_on_saturation=True, seed=None):
+    """Run the stage ladder; returns {"stages": [...], "saturation": {...}}"""
+    stages = []
+    for users in stage_sizes(start_users, max_users):
+        print(f"🚦 Stage: {users} virtual users for {stage_seconds}s...")
+        stage = await run_stage(base_url, credentials, users, stage_seconds, think_ms, timeout, seed)
+        stages.append(stage)
+        print_stage(stage)
+        _, saturated, _ = find_saturation(stages)
+        if saturated and stop_on_saturation:
+            break
+
+    healthy, saturated, reason = find_saturation(stages)
+    return {
+        "base_url": base_url,
+        "think_ms": think_ms,
+        "stages": stages,
+        "saturation": {
+            "max_healthy_users": healthy["users"] if healthy else None,
+            "saturated_at_users": saturated["users"] if saturated else None,
+            "reason": reason,
+        },
+    }
+
+
+def _ms(value):
+    return "n/a" if value is None else f"{value}ms"
+
+
+def print_stage(stage):
+    if stage["error_rate"] is None:
+        print(f"   ❌ {stage['users']} users: no request completed")
+        return
+    overall = stage["overall"]
+    icon = "✅" if not stage["error_rate"] else "⚠️"
+    print(f"   {icon} {stage['users']} users: {stage['throughput_rps']} req/s, "
+          f"{stage['journeys_per_min']} journeys/min, errors {stage['error_rate']:.1%}, "
+          f"p50 {_ms(overall['p50_ms'])} / p90 {_ms(overall['p90_ms'])} / p99 {_ms(overall['p99_ms'])}")
+
+
+def print_report(report):
+    """Per-step latency table of every stage, then the saturation verdict"""
+    print("\n📊 CRM load test")
+    print("=" * 72)
+    for stage in report["stages"]:
+        print(f"\n👥 {stage['users']} users - {stage['throughput_rps']} req/s, "
+              f"{stage['journeys']} journeys")
+        for step, stats in stage["steps"].items():
+            if not stats["samples"]:
+                continue
+            print(f"   {step:<16} n={stats['samples']:<6} p50 {_ms(stats['p50_ms'])}  "
+                  f"p90 {_ms(stats['p90_ms'])}  p99 {_ms(stats['p99_ms'])}  errors {stats['error_rate']:.1%}")
+    saturation = report["saturation"]
+    print("\n" + "=" * 72)
+    if saturation["saturated_at_users"]:
+        print(f"🧱 Saturation at {saturation['saturated_at_users']} users ({saturation['reason']})")
+        print(f"   Max healthy concurrency: {saturation['max_healthy_users']} users")
+    else:
+        print(f"✅ No saturation up to {report['stages'][-1]['users']} users")
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Scenario load generator for the CRM admin journeys")
+    parser.add_argument("--backend-url", type=str, default=DEFAULT_BACKEND,
+                        help="Backend base URL (default: local stand-in)")
+    parser.add_argument("--email", type=str, default=os.environ.get("IGV_ADMIN_EMAIL", "loadtest@example.com"))
+    parser.add_argument("--password", type=str, default=os.environ.get("IGV_ADMIN_PASSWORD", "loadtest"))
+    parser.add_argument("--start-users", type=int, default=1)
+    parser.add_argument("--max-users", type=int, default=DEFAULT_MAX_USERS)
+    parser.add_argument("--stage-seconds", type=float, default=DEFAULT_STAGE_SECONDS)
+    parser.add_argument("--think-ms", type=float, default=DEFAULT_THINK_MS,
+                        help="Mean think time between steps (uniform 0.5x-1.5x)")
+    parser.add_argument("--timeout", type=float, default=async_probe.DEFAULT_TIMEOUT, help="Per-request deadline")
+    parser.add_argument("--no-stop", action="store_true", help="Run every stage even after saturation")
+    parser.add_argument("--seed", type=int, help="Random seed for think times and lead picks")
+    parser.add_argument("--json-report", type=str, help="Write the full report to this JSON file")
+    args = parser.parse_args()
+
+    credentials = {"email": args.email, "password": args.password}
+    try:
+        report = asyncio.run(run_load(
+            args.backend_url, credentials, start_users=args.start_users, max_users=args.max_users,
+            stage_seconds=args.stage_seconds, think_ms=args.think_ms, timeout=args.timeout,
+            stop_on_saturation=not args.no_stop, seed=args.seed,
+        ))
+    except KeyboardInterrupt:
+        return
+    print_report(report)
+    if args.json_report:
+        with open(args.json_report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"📝 Report written to {args.json_report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Flux d'événements structurés (NDJSON) pour monitor_deploy.py
+Mission: Remplacer la sortie print() par une ligne JSON par sonde, par
+itération et par verdict, facile à suivre (tail -f) et à agréger par les
+outils en aval, avec un rendu humain (emoji) optionnel par-dessus.
+
+Les lignes sont bufferisées et écrites par paquets (taille ou délai), pour
+rester rapide quand la sortie est redirigée à haut débit de sondes.
+Des destinations secondaires filtrées par type (add_sink, ex. les alertes
+SLO de --slo-alerts) reçoivent le même enregistrement, jamais en double
+quand elles pointent vers la destination principale.
+"""
+import json
+import os
+import sys
+import time
+
+BUFFER_LINES = 256  # flush after this many buffered events...
+FLUSH_INTERVAL = 1.0  # ...or when the oldest buffered event is this old (seconds)
+
+
+class EventStream:
+    """
+    Structured event pipeline: every emit() becomes one NDJSON line (when a
+    destination is set) and is passed to the human renderer registered for
+    its type (when human rendering is on).
+    """
+
+    def __init__(self, ndjson=None, human=True, buffer_lines=BUFFER_LINES, flush_interval=FLUSH_INTERVAL):
+        self.human = human
+        self.buffer_lines = buffer_lines
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._renderers = {}
+        self._sinks = []  # (event types, EventStream) extra filtered destinations
+        self._buffer = []
+        self._first_buffered = None
+        self.destination = _destination(ndjson)
+        if ndjson is None:
+            self._out = None
+        elif ndjson == "-":
+            self._out = sys.stdout
+        else:
+            self._out = open(ndjson, "a", encoding="utf-8", buffering=1 << 20)
+
+    def on(self, event, renderer):
+        """Register the human renderer (callable taking the event dict) for an event type"""
+        self._renderers[event] = renderer
+
+    def add_sink(self, ndjson, events):
+        """
+        Also write the events of the given types to another NDJSON destination
+        ("-" = stdout). No-op when it is this stream's own destination, which
+        already carries every event.
+        """
+        if _destination(ndjson) == self.destination:
+            return
+        sink = EventStream(ndjson=ndjson, human=False, buffer_lines=self.buffer_lines,
+                           flush_interval=self.flush_interval)
+        self._sinks.append((frozenset(events), sink))
+
+    def emit(self, event, **fields):
+        """Publish one event; returns the event dict"""
+        record = {"ts": round(time.time(), 3), "event": event}
+        record.update(fields)
+        self.write(record)
+        return record
+
+    def write(self, record):
+        """Publish an already built event dict (it must carry an "event" key)"""
+        self.count += 1
+        if self._out is not None:
+            self._buffer.append(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str))
+            if self._first_buffered is None:
+                self._first_buffered = time.monotonic()
+            if (len(self._buffer) >= self.buffer_lines
+                    or time.monotonic() - self._first_buffered >= self.flush_interval):
+                self.flush()
+        for events, sink in self._sinks:
+            if record["event"] in events:
+                sink.write(record)
+        renderer = self._renderers.get(record["event"])
+        if self.human and renderer is not None:
+            renderer(record)
+
+    def flush(self):
+        for _, sink in self._sinks:
+            sink.flush()
+        if self._out is None or not self._buffer:
+            return
+        self._out.write("\n".join(self._buffer) + "\n")
+        self._out.flush()
+        self._buffer.clear()
+        self._first_buffered = None
+
+    def close(self):
+        self.flush()
+        for _, sink in self._sinks:
+            sink.close()
+        if self._out is not None and self._out is not sys.stdout:
+            self._out.close()
+        self._out = None
+
+
+def _destination(ndjson):
+    """Comparable form of an NDJSON destination (None, "-" or an absolute path)"""
+    if ndjson is None or ndjson == "-":
+        return ndjson
+    return os.path.abspath(ndjson)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Diff croisé des locales fr / en / he par opérations d'ensembles
+Mission: Équivalent Python de ops/tools/i18n-audit.js, en une passe :
+clés manquantes (par rapport aux autres langues et aux clés t('...') de
+src/), clés présentes dans une seule langue, types incompatibles (texte /
+liste / section) et placeholders d'interpolation {name} différents.
+
+Chaque locale est aplatie une seule fois (index de locale_store.py), puis
+tout se calcule par différences / intersections d'ensembles de clés.
+Les rapports missing_keys_{fr,en,he}.json gardent le format de
+i18n-audit.js : {clé: {"placeholder": "[AUTO_GEN] ...", "usedIn": [...]}}.
+
+Usage:
+    python locale_diff.py                         # écrit ops/tools/missing_keys_*.json
+    python locale_diff.py --no-scan --check       # locales seules, code de sortie 1 si écart
+    python locale_diff.py --json-report /tmp/i18n-diff.json
+"""
+import json
+import os
+import re
+import time
+
+from locale_store import LOCALES_DIR, LocaleStore
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'tools')
+EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+SKIP_DIRS = {'node_modules', 'build', 'dist', '.git'}
+
+# Same key patterns and ignore rules as ops/tools/i18n-audit.js
+PATTERNS = (
+    re.compile(r"""\bt\(\s*['"`]([^'"`]+)['"`]\s*[,)]"""),
+    re.compile(r"""\bt\(\s*['"`]([^'"`]+)['"`]\s*,\s*\{"""),
+    re.compile(r"""i18nKey\s*=\s*['"`]([^'"`]+)['"`]"""),
+    re.compile(r"""useTranslation\(\s*['"`]([^'"`]+)['"`]\s*\)"""),
+)
+IGNORE_PATTERNS = (re.compile(r"^\$"), re.compile(r"\$\{"), re.compile(r"^[a-z]+$"))
+PLACEHOLDER_RE = re.compile(r"\{\{?\s*([A-Za-z_][\w.]*)\s*\}?\}")
+
+
+def scan_sources(src_dir=SRC_DIR):
+    """{i18n key: [files using it]} for every t('...') style key of src/"""
+    usages = {}
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(files):
+            if not name.endswith(EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
+            keys = {match for pattern in PATTERNS for match in pattern.findall(content)}
+            rel = os.path.relpath(path, src_dir).replace(os.sep, "/")
+            for key in keys:
+                if "." in key and not any(p.search(key) for p in IGNORE_PATTERNS):
+                    usages.setdefault(key, []).append(rel)
+    return usages
+
+
+def generate_placeholder(key):
+    """Same "[AUTO_GEN] Title Case" placeholder as i18n-audit.js"""
+    readable = key.split(".")[-1].replace("_", " ")
+    readable = re.sub(r"([a-z])([A-Z])", r"\1 \2", readable)
+    return "[AUTO_GEN] " + re.sub(r"\b\w", lambda m: m.group(0).upper(), readable)
+
+
+def _kind(value):
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "list"
+    if value is None:
+        return "null"
+    return type(value).__name__
+
+
+def _placeholders(value):
+    if isinstance(value, list):
+        return frozenset(name for item in value if isinstance(item, str) for name in PLACEHOLDER_RE.findall(item))
+    return frozenset(PLACEHOLDER_RE.findall(value)) if isinstance(value, str) else frozenset()
+
+
+def _resolves_in_list(flat, key):
+    """True when `key` points inside a list leaf ("items.0"), as i18n-audit.js getNestedValue allows"""
+    parts = key.split(".")
+    for n in range(len(parts) - 1, 0, -1):
+        value = flat.get(".".join(parts[:n]))
+        if not isinstance(value, list):
+            continue
+        for part in parts[n:]:
+            if isinstance(value, list) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            elif isinstance(value, dict) and part in value:
+                value = value[part]
+            else:
+                return False
+        return value is not None
+    return False
+
+
+def diff_locales(store, usages=None):
+    """
+    Compare the flattened locales of `store` (and the keys used in src/).
+    Returns {"missing": {lang: {key: {placeholder, usedIn}}}, "extra": {lang: [keys]},
+    "type_mismatches": [...], "placeholder_mismatches": [...], "keys": {...}}.
+    """
+    usages = usages or {}
+    languages = store.languages
+    flat = {lang: store.index[lang].flat for lang in languages}
+    keys = {lang: set(flat[lang]) for lang in languages}
+    sections = {lang: {key.rsplit(".", i)[0] for key in keys[lang] for i in range(1, key.count(".") + 1)}
+                for lang in languages}
+    defined = {lang: keys[lang] | sections[lang] for lang in languages}
+    union = set().union(*keys.values())
+    used = set(usages)
+
+    missing = {}
+    extra = {}
+    for lang in languages:
+        others = set().union(*(keys[other] for other in languages if other != lang))
+        others_defined = set().union(*(defined[other] for other in languages if other != lang))
+        # Leaves of the other locales, plus src keys that are neither a leaf nor a section here
+        absent = (others - keys[lang] - sections[lang]) | {
+            key for key in used - defined[lang] if not _resolves_in_list(flat[lang], key)}
+        missing[lang] = {key: {"placeholder": generate_placeholder(key), "usedIn": usages.get(key, [])}
+                         for key in sorted(absent)}
+        extra[lang] = sorted(keys[lang] - others_defined)
+
+    type_mismatches = []
+    placeholder_mismatches = []
+    for key in sorted(union):
+        present = [lang for lang in languages if key in keys[lang]]
+        kinds = {lang: _kind(flat[lang][key]) for lang in present}
+        kinds.update({lang: "section" for lang in languages if key in sections[lang]})
+        if len(set(kinds.values())) > 1:
+            type_mismatches.append({"key": key, "types": kinds})
+            continue
+        if len(present) > 1:
+            names = {lang: _placeholders(flat[lang][key]) for lang in present}
+            if len(set(names.values())) > 1:
+                placeholder_mismatches.append({"key": key,
+                                               "placeholders": {lang: sorted(n) for lang, n in names.items()}})
+
+    return {
+        "missing": missing,
+        "extra": extra,
+        "type_mismatches": type_mismatches,
+        "placeholder_mismatches": placeholder_mismatches,
+        "keys": {"union": len(union), "used_in_src": len(used), **{lang: len(keys[lang]) for lang in languages}},
+    }
+
+
+def write_missing_reports(missing, output_dir=OUTPUT_DIR):
+    """missing_keys_{lang}.json in the i18n-audit.js format; returns the paths written"""
+    paths = []
+    for lang, entries in missing.items():
+        path = os.path.join(output_dir, f"missing_keys_{lang}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        paths.append(path)
+    return paths
+
+
+def print_report(report, elapsed_ms, sample=20):
+    keys = report["keys"]
+    print(f"\n🌍 i18n diff: {keys['union']} locale keys, {keys['used_in_src']} keys used in src/ "
+          f"({elapsed_ms} ms)")
+    print("-" * 70)
+    for lang, entries in report["missing"].items():
+        icon = "✅" if not entries else "❌"
+        print(f"{icon} {lang.upper()}: {keys[lang]} keys, {len(entries)} missing, "
+              f"{len(report['extra'][lang])} only in {lang}")
+    for title, rows, field in (("Type mismatches", report["type_mismatches"], "types"),
+                               ("Placeholder mismatches", report["placeholder_mismatches"], "placeholders")):
+        if rows:
+            print(f"\n⚠️  {title} ({len(rows)})")
+            for row in rows[:sample]:
+                print(f"   {row['key']}: {json.dumps(row[field], ensure_ascii=False)}")
+            if len(rows) > sample:
+                print(f"   ... and {len(rows) - sample} more")
+    all_missing = sorted(set().union(*report["missing"].values()))
+    if all_missing:
+        print(f"\n📋 Missing keys (first {sample})")
+        for key in all_missing[:sample]:
+            flags = " ".join(f"{lang.upper()}:{'❌' if key in entries else '✅'}"
+                             for lang, entries in report["missing"].items())
+            print(f"   {key}  {flags}")
+        if len(all_missing) > sample:
+            print(f"   ... and {len(all_missing) - sample} more")
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Set-based cross-locale diff (Python i18n-audit)")
+    parser.add_argument("--locales-dir", type=str, default=LOCALES_DIR)
+    parser.add_argument("--src-dir", type=str, default=SRC_DIR)
+    parser.add_argument("--output-dir", type=str, default=OUTPUT_DIR, help="Where missing_keys_*.json go")
+    parser.add_argument("--no-scan", action="store_true", help="Compare the locales only, skip src/")
+    parser.add_argument("--no-write", action="store_true", help="Do not write missing_keys_*.json")
+    parser.add_argument("--json-report", type=str, help="Write the full diff to this JSON file")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit 1 on missing keys, type or placeholder mismatches")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    usages = {} if args.no_scan else scan_sources(args.src_dir)
+    scanned = time.perf_counter()
+    report = diff_locales(LocaleStore(args.locales_dir), usages)
+    elapsed_ms = round((time.perf_counter() - scanned) * 1000, 1)
+    if not args.no_scan:
+        print(f"📁 src/ scanned in {round((scanned - start) * 1000, 1)} ms")
+    print_report(report, elapsed_ms)
+
+    if not args.no_write:
+        for path in write_missing_reports(report["missing"], args.output_dir):
+            print(f"   → {os.path.relpath(path)}")
+    if args.json_report:
+        with open(args.json_report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.check and (any(report["missing"].values()) or report["type_mismatches"]
+                       or report["placeholder_mismatches"]):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
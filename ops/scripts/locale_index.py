@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Index à plat des clés de locale (chemin pointé -> valeur) + trie de préfixes
+Mission: Ne plus naviguer data['admin']['crm']['leads'] à la main avec des
+gardes à chaque niveau : lookup direct d'une clé pointée et requêtes "toutes
+les clés sous admin.crm.leads", dans les trois langues.
+
+L'index est construit une fois au chargement par locale_store.LocaleStore
+et resynchronisé (sous-arbre modifié seulement) à chaque mutation.
+
+Usage:
+    python locale_index.py get admin.crm.leads.columns.name
+    python locale_index.py keys admin.crm.leads --values
+    python locale_index.py complete admin.crm.le
+"""
+import json
+
+
+def flatten(tree, prefix=()):
+    """{dotted path: leaf value} of a nested dict in document order, iteratively (lists are leaves)"""
+    flat = {}
+    stack = [(iter(tree.items()), tuple(prefix))]
+    while stack:
+        items, path = stack[-1]
+        for key, value in items:
+            if isinstance(value, dict):
+                stack.append((iter(value.items()), path + (key,)))
+                break
+            flat[".".join(path + (key,))] = value
+        else:
+            stack.pop()
+    return flat
+
+
+class _Node:
+    __slots__ = ("children", "leaf")
+
+    def __init__(self):
+        self.children = {}
+        self.leaf = False
+
+
+class PrefixTrie:
+    """Trie over dotted-path segments: insert, remove and list leaf keys under a prefix"""
+
+    def __init__(self, keys=()):
+        self.root = _Node()
+        self.size = 0
+        for key in keys:
+            self.insert(key)
+
+    def _find(self, segments):
+        node = self.root
+        for segment in segments:
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def insert(self, key):
+        node = self.root
+        for segment in key.split("."):
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = _Node()
+            node = child
+        if not node.leaf:
+            node.leaf = True
+            self.size += 1
+
+    def remove(self, key):
+        """Drop a leaf key, pruning the nodes left empty; returns True when it existed"""
+        segments = key.split(".")
+        trail = [self.root]
+        for segment in segments:
+            node = trail[-1].children.get(segment)
+            if node is None:
+                return False
+            trail.append(node)
+        if not trail[-1].leaf:
+            return False
+        trail[-1].leaf = False
+        self.size -= 1
+        for depth in range(len(segments), 0, -1):
+            if trail[depth].leaf or trail[depth].children:
+                break
+            del trail[depth - 1].children[segments[depth - 1]]
+        return True
+
+    def keys_under(self, prefix=""):
+        """Every leaf key equal to or below `prefix` (segment boundaries), in insertion order"""
+        segments = tuple(prefix.split(".")) if prefix else ()
+        start = self._find(segments)
+        if start is None:
+            return []
+        keys = []
+        stack = [(start, segments)]
+        while stack:
+            node, path = stack.pop()
+            if node.leaf:
+                keys.append(".".join(path))
+            stack.extend((child, path + (segment,)) for segment, child in reversed(node.children.items()))
+        return keys
+
+    def complete(self, partial):
+        """Next-segment completions of a partially typed path ("admin.crm.le" -> ["admin.crm.leads", ...])"""
+        head, _, last = partial.rpartition(".")
+        node = self._find(tuple(head.split(".")) if head else ())
+        if node is None:
+            return []
+        return [f"{head}.{segment}" if head else segment
+                for segment in node.children if segment.startswith(last)]
+
+
+class LocaleIndex:
+    """Flat dotted-path map and prefix trie of one locale, kept in sync by reindex()"""
+
+    def __init__(self, tree):
+        self.flat = flatten(tree)
+        self.trie = PrefixTrie(self.flat)
+
+    def get(self, key, default=None):
+        return self.flat.get(key, default)
+
+    def exists(self, key):
+        """True for a leaf key or a section (like i18n-audit.js keyExists)"""
+        return key in self.flat or self.trie._find(tuple(key.split("."))) is not None
+
+    def keys_under(self, prefix=""):
+        return self.trie.keys_under(prefix)
+
+    def items_under(self, prefix=""):
+        return {key: self.flat[key] for key in self.trie.keys_under(prefix)}
+
+    def reindex(self, path, subtree):
+        """Replace everything indexed at or below `path` (dotted) with `subtree` (None = deleted)"""
+        for key in self.trie.keys_under(path):
+            self.trie.remove(key)
+            del self.flat[key]
+        if subtree is None:
+            return
+        added = flatten(subtree, path.split(".")) if isinstance(subtree, dict) else {path: subtree}
+        for key, value in added.items():
+            self.flat[key] = value
+            self.trie.insert(key)
+
+
+def main():
+    import argparse
+    from locale_store import LOCALES_DIR, LocaleStore
+    parser = argparse.ArgumentParser(description="Dotted-key lookups across the fr/en/he locales")
+    parser.add_argument("--locales-dir", type=str, default=LOCALES_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    get = sub.add_parser("get", help="Value of one key in every language")
+    get.add_argument("key")
+    keys = sub.add_parser("keys", help="Every key under a prefix, with the languages that define it")
+    keys.add_argument("prefix", nargs="?", default="")
+    keys.add_argument("--values", action="store_true", help="Print the values, not only the keys")
+    complete = sub.add_parser("complete", help="Complete a partially typed key")
+    complete.add_argument("partial")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    args = parser.parse_args()
+
+    store = LocaleStore(args.locales_dir)
+    indexes = store.index
+
+    if args.command == "get":
+        result = {lang: index.get(args.key) for lang, index in indexes.items()}
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+            return
+        for lang, value in result.items():
+            print(f"   {lang}: {'❌ missing' if value is None else json.dumps(value, ensure_ascii=False)}")
+        return
+
+    if args.command == "complete":
+        found = []
+        for index in indexes.values():
+            found += [c for c in index.trie.complete(args.partial) if c not in found]
+        print(json.dumps(found, ensure_ascii=False) if args.json else "\n".join(found))
+        return
+
+    merged = {}
+    for lang, index in indexes.items():
+        for key, value in index.items_under(args.prefix).items():
+            merged.setdefault(key, {})[lang] = value
+    if args.json:
+        print(json.dumps(merged, ensure_ascii=False, indent=2))
+        return
+    for key, values in merged.items():
+        missing = [lang for lang in indexes if lang not in values]
+        flag = f"  ❌ missing {','.join(missing)}" if missing else ""
+        print(f"{key}{flag}")
+        if args.values:
+            for lang, value in values.items():
+                print(f"   {lang}: {json.dumps(value, ensure_ascii=False)}")
+    print(f"\n🔑 {len(merged)} keys under '{args.prefix or '(root)'}'")
+
+
+if __name__ == "__main__":
+    main()
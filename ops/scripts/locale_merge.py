@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Moteur de fusion structurelle des locales, itératif et en place
+Mission: Remplacer deep_merge() (copie de chaque niveau + récursion) par une
+fusion sans copie de la base, sans limite de profondeur, avec une politique
+de conflit explicite et un rapport des conflits.
+
+Politiques (un conflit = même chemin, valeurs différentes, hors dict/dict) :
+    overwrite          la valeur entrante remplace l'existante (comportement historique)
+    keep-existing      la valeur existante est conservée
+    error-on-conflict  MergeConflict levée avant toute modification, avec tous les conflits
+
+Usage:
+    python locale_merge.py bench --keys 100000
+"""
+import time
+import tracemalloc
+
+POLICIES = ("overwrite", "keep-existing", "error-on-conflict")
+DEFAULT_POLICY = "overwrite"
+_MISSING = object()
+
+
+class MergeConflict(ValueError):
+    """Raised by the error-on-conflict policy; `conflicts` lists every conflicting path"""
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        paths = ", ".join(c["path"] for c in conflicts[:5])
+        more = f" (+{len(conflicts) - 5} more)" if len(conflicts) > 5 else ""
+        super().__init__(f"{len(conflicts)} merge conflicts: {paths}{more}")
+
+
+def copy_tree(value):
+    """Iterative copy of nested dicts / lists (copy.deepcopy recurses)"""
+    if not isinstance(value, (dict, list)):
+        return value
+    root = {} if isinstance(value, dict) else []
+    stack = [(value, root)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, item in items:
+            if isinstance(item, (dict, list)):
+                child = {} if isinstance(item, dict) else []
+                stack.append((item, child))
+            else:
+                child = item
+            if isinstance(target, dict):
+                target[key] = child
+            else:
+                target.append(child)
+    return root
+
+
+def _walk(base, override, prefix):
+    """Yield (target dict, key, existing value, incoming value, path) for every non dict/dict pair"""
+    stack = [(base, override, prefix)]
+    while stack:
+        target, source, path = stack.pop()
+        for key, value in source.items():
+            existing = target.get(key, _MISSING)
+            if isinstance(existing, dict) and isinstance(value, dict):
+                stack.append((existing, value, path + (key,)))
+            else:
+                yield target, key, existing, value, path + (key,)
+
+
+def find_conflicts(base, override, prefix=()):
+    """Paths where base and override hold different non-mergeable values"""
+    return [
+        {"path": ".".join(path), "existing": existing, "incoming": value}
+        for _, _, existing, value, path in _walk(base, override, tuple(prefix))
+        if existing is not _MISSING and existing != value
+    ]
+
+
+def merge(base, override, policy=DEFAULT_POLICY, prefix=(), copy_values=True, max_conflicts=None):
+    """
+    Merge `override` into `base` in place, iteratively. Only new or
+    replaced values are touched; `base` itself is never copied. With
+    copy_values, inserted subtrees are copied so later merges cannot alias
+    the caller's data.
+
+    Returns {"added", "overwritten", "kept", "unchanged", "conflicts": [...]};
+    "conflicts" holds at most `max_conflicts` entries (the counts stay exact).
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown merge policy '{policy}' (expected one of {', '.join(POLICIES)})")
+    prefix = tuple(prefix)
+    if policy == "error-on-conflict":
+        conflicts = find_conflicts(base, override, prefix)
+        if conflicts:
+            for conflict in conflicts:
+                conflict["resolution"] = "error"
+            raise MergeConflict(conflicts)
+    added = overwritten = kept = unchanged = 0
+    conflicts = []
+    stack = [(base, override, prefix)]
+    while stack:
+        target, source, path = stack.pop()
+        for key, value in source.items():
+            existing = target.get(key, _MISSING)
+            if existing is _MISSING:
+                target[key] = copy_tree(value) if copy_values and isinstance(value, (dict, list)) else value
+                added += 1
+            elif isinstance(existing, dict) and isinstance(value, dict):
+                stack.append((existing, value, path + (key,)))
+            elif existing == value:
+                unchanged += 1
+            elif policy == "keep-existing":
+                kept += 1
+                if max_conflicts is None or len(conflicts) < max_conflicts:
+                    conflicts.append({"path": ".".join(path + (key,)), "existing": existing, "incoming": value,
+                                      "resolution": "kept"})
+            else:
+                target[key] = copy_tree(value) if copy_values and isinstance(value, (dict, list)) else value
+                overwritten += 1
+                if max_conflicts is None or len(conflicts) < max_conflicts:
+                    conflicts.append({"path": ".".join(path + (key,)), "existing": existing, "incoming": value,
+                                      "resolution": "overwritten"})
+    return {"added": added, "overwritten": overwritten, "kept": kept, "unchanged": unchanged,
+            "conflicts": conflicts}
+
+
+# --- benchmark ---------------------------------------------------------------
+
+def legacy_deep_merge(base, override):
+    """Former deep_merge() of update_translations.py, kept as the benchmark baseline"""
+    result = base.copy()
+    for key, value in override.items():
+        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
+            result[key] = legacy_deep_merge(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def synthetic_locale(keys, fanout=10, prefix="k", seed_value="v"):
+    """Nested locale with `keys` leaves, `fanout` children per section"""
+    root = {}
+    for i in range(keys):
+        node = root
+        digits = []
+        n = i
+        while True:
+            digits.append(n % fanout)
+            n //= fanout
+            if n == 0:
+                break
+        for d in reversed(digits[1:]):
+            node = node.setdefault(f"{prefix}{d}", {})
+        node[f"leaf{digits[0]}"] = f"{seed_value}{i}"
+    return root
+
+
+def _timed(fn, setup, repeat=5):
+    """
+    Best wall time (ms) of fn(setup()) over `repeat` runs, setup excluded,
+    then the peak memory (KiB) allocated by one more traced run.
+    """
+    best = None
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        result = fn(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    arg = setup()
+    tracemalloc.start()
+    fn(arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return round(best * 1000, 1), round(peak / 1024), result
+
+
+def bench(keys=100_000, fanout=10, deep_chain=5000):
+    """Compare legacy_deep_merge and merge() on synthetic locales"""
+    base = synthetic_locale(keys, fanout)
+    same = synthetic_locale(keys // 2, fanout)  # identical values on half of the keys
+    changed = synthetic_locale(keys // 2, fanout, seed_value="w")  # conflicting values
+    wide = {f"ns{i}": {f"key{j}": f"v{j}" for j in range(keys // 10)} for i in range(10)}
+    small = {f"ns{i}": {f"new{j}": "x" for j in range(10)} for i in range(10)}  # 100 new keys
+    results = []
+
+    def fresh():
+        return synthetic_locale(keys, fanout)  # merge() mutates its base
+
+    cases = (
+        ("legacy deep_merge (copying)", lambda b: legacy_deep_merge(b, changed), lambda: base),
+        ("merge overwrite", lambda b: merge(b, changed, "overwrite", copy_values=False), fresh),
+        ("merge overwrite, counts only", lambda b: merge(b, changed, "overwrite", copy_values=False,
+                                                         max_conflicts=0), fresh),
+        ("merge overwrite + copy", lambda b: merge(b, changed, "overwrite"), fresh),
+        ("merge overwrite + copy, 100 conflicts kept", lambda b: merge(b, changed, "overwrite",
+                                                                       max_conflicts=100), fresh),
+        ("merge keep-existing", lambda b: merge(b, changed, "keep-existing", copy_values=False), fresh),
+        ("merge error-on-conflict (no conflict)",
+         lambda b: merge(b, same, "error-on-conflict", copy_values=False), fresh),
+        ("legacy, 100 new keys into wide namespaces", lambda b: legacy_deep_merge(b, small), lambda: wide),
+        ("merge, 100 new keys into wide namespaces", lambda b: merge(b, small),
+         lambda: {ns: dict(section) for ns, section in wide.items()}),
+    )
+    for name, fn, setup in cases:
+        ms, peak_kib, report = _timed(fn, setup)
+        row = {"case": name, "ms": ms, "peak_kib": peak_kib}
+        if "conflicts" in report:
+            row.update({k: report[k] for k in ("added", "overwritten", "kept", "unchanged")})
+        results.append(row)
+
+    # Recursion depth: a namespace chain deeper than the interpreter stack
+    deep_base, deep_override = {}, {}
+    node_b, node_o = deep_base, deep_override
+    for i in range(deep_chain):
+        node_b = node_b.setdefault(f"n{i}", {})
+        node_o = node_o.setdefault(f"n{i}", {})
+    node_o["leaf"] = "x"
+    try:
+        legacy_deep_merge(deep_base, deep_override)
+        legacy_deep = "ok"
+    except RecursionError:
+        legacy_deep = "RecursionError"
+    merge(deep_base, deep_override)
+    return {"keys": keys, "fanout": fanout, "cases": results,
+            "depth": {"levels": deep_chain, "legacy": legacy_deep, "merge": "ok"}}
+
+
+def print_bench(report):
+    print(f"\n🔀 Merge benchmark: {report['keys']} keys (fan-out {report['fanout']}), best of 5")
+    print("-" * 70)
+    for row in report["cases"]:
+        counts = ""
+        if "added" in row:
+            counts = f"  (+{row['added']} ~{row['overwritten']} ={row['kept']} unchanged {row['unchanged']})"
+        print(f"   {row['case']:<42} {row['ms']:>7} ms {row['peak_kib']:>7} KiB{counts}")
+    depth = report["depth"]
+    print(f"\n   {depth['levels']}-level namespace: legacy {depth['legacy']}, merge {depth['merge']}")
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Iterative locale merge engine")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench_parser = sub.add_parser("bench", help="Benchmark against the legacy recursive deep_merge")
+    bench_parser.add_argument("--keys", type=int, default=100_000)
+    bench_parser.add_argument("--fanout", type=int, default=10)
+    bench_parser.add_argument("--depth", type=int, default=5000, help="Levels of the recursion-depth case")
+    args = parser.parse_args()
+
+    print_bench(bench(args.keys, args.fanout, args.depth))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Magasin partagé des locales i18n (src/i18n/locales/{fr,en,he}.json)
+Mission: Charger les trois locales une seule fois, exposer get / set / merge
+sur des chemins pointés ("admin.crm.leads.columns") et appliquer en une
+passe les mutations de plusieurs scripts (add_columns, add_i18n_keys,
+update_translations, update_all_translations) au lieu d'un cycle
+json.load / json.dump complet par script.
+
+Un index à plat (chemin pointé -> valeur) et un trie de préfixes
+(locale_index.py) sont tenus à jour à chaque mutation.
+
+Les écritures ne touchent que les fichiers dont le contenu change (pas de
+rebuild webpack ni de diff git inutiles) et passent par des fichiers
+temporaires + os.replace() : les trois langues sont remplacées ensemble ou
+pas du tout.
+
+Une mutation est un tuple (op, lang, path, value[, politique]) :
+    "set"     remplace la valeur (crée les sections intermédiaires)
+    "add"     pose la valeur seulement si la clé n'existe pas
+    "merge"   fusion récursive d'un dict dans la section existante (locale_merge.py,
+              politique overwrite / keep-existing / error-on-conflict)
+    "update"  dict.update() d'un niveau sur la section existante
+    "delete"  supprime la clé (value ignorée)
+
+Usage:
+    python locale_store.py get admin.crm.leads.columns.name
+    python locale_store.py apply add_columns add_i18n_keys update_translations update_all_translations
+    python locale_store.py apply add_columns --dry-run
+"""
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import tempfile
+
+import locale_index
+import locale_merge
+
+LOCALES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'i18n', 'locales')
+LANGUAGES = ("fr", "en", "he")
+OPERATIONS = ("set", "add", "merge", "update", "delete")
+MAX_REPORTED_CONFLICTS = 100  # conflict details kept; conflict_count stays exact
+_MISSING = object()
+
+
+def split_path(path):
+    """("admin", "crm") or "admin.crm" -> ("admin", "crm")"""
+    if isinstance(path, str):
+        return tuple(path.split("."))
+    return tuple(path)
+
+
+class LocaleStore:
+    """The three locale files, parsed once and written back by save()"""
+
+    def __init__(self, locales_dir=LOCALES_DIR, languages=LANGUAGES):
+        self.locales_dir = locales_dir
+        self.languages = tuple(languages)
+        self.data = {lang: self._load(lang) for lang in self.languages}
+        self.index = {lang: locale_index.LocaleIndex(self.data[lang]) for lang in self.languages}
+        self.dirty = set()
+        self.conflicts = []  # first MAX_REPORTED_CONFLICTS merge conflict reports, each with its "lang"
+        self.conflict_count = 0
+
+    def path_for(self, lang):
+        return os.path.join(self.locales_dir, f"{lang}.json")
+
+    def _load(self, lang):
+        with open(self.path_for(lang), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _parent(self, lang, keys, create):
+        """Dict holding the last key of `keys`, None when missing and not `create`"""
+        node = self.data[lang]
+        for i, key in enumerate(keys[:-1]):
+            if key not in node:
+                if not create:
+                    return None
+                node[key] = {}
+            node = node[key]
+            if not isinstance(node, dict):
+                raise ValueError(f"{lang}: '{'.'.join(keys[:i + 1])}' is not a section")
+        return node
+
+    def _touched(self, lang, keys, value):
+        """Mark `lang` dirty and resync its index below `keys` (value None = deleted)"""
+        self.dirty.add(lang)
+        self.index[lang].reindex(".".join(keys), value)
+
+    def get(self, lang, path, default=None):
+        """Leaf values come from the flat index; sections from the tree"""
+        keys = split_path(path)
+        value = self.index[lang].flat.get(".".join(keys), _MISSING)
+        if value is not _MISSING:
+            return value
+        parent = self._parent(lang, keys, create=False)
+        if parent is None:
+            return default
+        return parent.get(keys[-1], default)
+
+    def has(self, lang, path):
+        keys = split_path(path)
+        if ".".join(keys) in self.index[lang].flat:
+            return True
+        parent = self._parent(lang, keys, create=False)
+        return parent is not None and keys[-1] in parent
+
+    def keys_under(self, lang, prefix=""):
+        """Dotted leaf keys at or below `prefix` (prefix trie of the index)"""
+        return self.index[lang].keys_under(".".join(split_path(prefix)) if prefix else "")
+
+    def set(self, lang, path, value):
+        """Replace the value at `path`; returns True when it changed"""
+        keys = split_path(path)
+        parent = self._parent(lang, keys, create=True)
+        if keys[-1] in parent and parent[keys[-1]] == value:
+            return False
+        parent[keys[-1]] = locale_merge.copy_tree(value)
+        self._touched(lang, keys, parent[keys[-1]])
+        return True
+
+    def add(self, lang, path, value):
+        """Set the value only when the key is missing; returns True when added"""
+        if self.has(lang, path):
+            return False
+        return self.set(lang, path, value)
+
+    def merge(self, lang, path, mapping, deep=True, policy=locale_merge.DEFAULT_POLICY):
+        """
+        Merge `mapping` into the section at `path`: recursively with the
+        locale_merge policy, or one level deep (dict.update) with deep=False.
+        Conflicts are counted in self.conflict_count and the first
+        MAX_REPORTED_CONFLICTS detailed in self.conflicts; returns True when it changed.
+        """
+        keys = split_path(path)
+        parent = self._parent(lang, keys, create=True)
+        section = parent.setdefault(keys[-1], {})
+        if not isinstance(section, dict):
+            raise ValueError(f"{lang}: '{'.'.join(keys)}' is not a section")
+        if deep:
+            report = locale_merge.merge(section, mapping, policy, prefix=keys,
+                                        max_conflicts=max(0, MAX_REPORTED_CONFLICTS - len(self.conflicts)))
+            self.conflicts += [dict(conflict, lang=lang) for conflict in report["conflicts"]]
+            self.conflict_count += report["overwritten"] + report["kept"]
+            changed = bool(report["added"] or report["overwritten"])
+        else:
+            changed = any(section.get(key, _MISSING) != value for key, value in mapping.items())
+            section.update({key: locale_merge.copy_tree(value) for key, value in mapping.items()})
+        if changed:
+            self._touched(lang, keys, section)
+        return changed
+
+    def delete(self, lang, path):
+        keys = split_path(path)
+        parent = self._parent(lang, keys, create=False)
+        if parent is None or keys[-1] not in parent:
+            return False
+        del parent[keys[-1]]
+        self._touched(lang, keys, None)
+        return True
+
+    def apply(self, mutations):
+        """
+        Apply (op, lang, path, value[, merge policy]) mutations in order, in
+        memory. Returns the changes actually made: [(op, lang, dotted path)].
+        """
+        changes = []
+        for mutation in mutations:
+            op, lang, path, value = mutation[:4]
+            if op not in OPERATIONS:
+                raise ValueError(f"Unknown locale operation '{op}'")
+            if lang not in self.data:
+                raise ValueError(f"Unknown language '{lang}'")
+            if op == "delete":
+                changed = self.delete(lang, path)
+            elif op in ("merge", "update"):
+                policy = mutation[4] if len(mutation) > 4 else locale_merge.DEFAULT_POLICY
+                changed = self.merge(lang, path, value, deep=op == "merge", policy=policy)
+            else:
+                changed = getattr(self, op)(lang, path, value)
+            if changed:
+                changes.append((op, lang, ".".join(split_path(path))))
+        return changes
+
+    def serialise(self, lang):
+        """Bytes save() writes for `lang` (same format as the historical json.dump calls)"""
+        return json.dumps(self.data[lang], ensure_ascii=False, indent=2).encode("utf-8")
+
+    def save(self, dry_run=False):
+        """
+        Write back the modified locales whose serialised bytes differ from the
+        file on disk; returns the languages written (or that would be, with
+        dry_run). Files are written to temp files first and swapped in with
+        os.replace(): either every changed locale is replaced or none is.
+        """
+        changed = {}
+        for lang in sorted(self.dirty):
+            content = self.serialise(lang)
+            path = self.path_for(lang)
+            with open(path, 'rb') as f:
+                on_disk = f.read()
+            if hashlib.sha256(on_disk).digest() != hashlib.sha256(content).digest():
+                changed[lang] = (path, content, on_disk)
+        if dry_run:
+            return sorted(changed)
+
+        staged = {}
+        try:
+            for lang, (path, content, _) in changed.items():
+                fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{lang}.", suffix=".tmp")
+                staged[lang] = tmp
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                shutil.copymode(path, tmp)
+        except BaseException:
+            for tmp in staged.values():
+                os.unlink(tmp)
+            raise
+
+        replaced = []
+        try:
+            for lang, tmp in staged.items():
+                os.replace(tmp, changed[lang][0])
+                replaced.append(lang)
+        except BaseException:
+            # Put back the locales already swapped in, drop the remaining temp files
+            for lang in replaced:
+                path, _, on_disk = changed[lang]
+                with open(path, 'wb') as f:
+                    f.write(on_disk)
+            for lang, tmp in staged.items():
+                if lang not in replaced and os.path.exists(tmp):
+                    os.unlink(tmp)
+            raise
+        self.dirty.clear()
+        return sorted(changed)
+
+
+def run_scripts(names, store=None, dry_run=False):
+    """
+    Apply the mutations() of several locale scripts in one load / save pass.
+    Returns ({script: changes}, languages written).
+    """
+    store = store or LocaleStore()
+    results = {}
+    for name in names:
+        module = importlib.import_module(name[:-3] if name.endswith(".py") else name)
+        results[name] = store.apply(module.mutations())
+    return results, store.save(dry_run)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Shared locale store for the i18n scripts")
+    parser.add_argument("--locales-dir", type=str, default=LOCALES_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    get = sub.add_parser("get", help="Print a dotted key in every language")
+    get.add_argument("path")
+
+    apply = sub.add_parser("apply", help="Apply the mutations of locale scripts in a single pass")
+    apply.add_argument("scripts", nargs="+", help="Script modules, e.g. add_columns update_translations")
+    apply.add_argument("--dry-run", action="store_true", help="Report the locales that would change, write nothing")
+    args = parser.parse_args()
+
+    store = LocaleStore(args.locales_dir)
+    if args.command == "get":
+        for lang in store.languages:
+            print(f"{lang}: {json.dumps(store.get(lang, args.path), ensure_ascii=False)}")
+        return
+
+    results, written = run_scripts(args.scripts, store, args.dry_run)
+    for name, changes in results.items():
+        print(f"📝 {name}: {len(changes)} changes")
+        for op, lang, path in changes:
+            print(f"   ✓ {op} {lang} {path}")
+    if store.conflict_count:
+        print(f"\n⚠️  {store.conflict_count} merge conflicts")
+        for conflict in store.conflicts[:20]:
+            print(f"   {conflict['resolution']:<11} {conflict['lang']} {conflict['path']}: "
+                  f"{conflict['existing']!r} -> {conflict['incoming']!r}")
+        if store.conflict_count > 20:
+            print(f"   ... and {store.conflict_count - 20} more")
+    files = ', '.join(f'{lang}.json' for lang in written)
+    if args.dry_run:
+        print(f"\n🔍 Would write: {files or 'nothing (locales unchanged)'}")
+    else:
+        print(f"\n✅ {files + ' written' if files else 'Locales unchanged, nothing written'}")
+
+
+if __name__ == "__main__":
+    main()
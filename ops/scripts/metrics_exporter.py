@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Exporteur OpenMetrics / Prometheus pour monitor_deploy.py
+Mission: Exposer les résultats des sondes (disponibilité, latence par phase,
+histogramme des durées) pour les dashboards, à la place de print_status.
+
+Les sondes tournent en arrière-plan; chaque scrape renvoie un instantané
+pré-calculé et ne déclenche jamais de sonde.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASES = ("dns", "connect", "tls", "ttfb", "body")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+class MetricsRegistry:
+    """Probe metrics, re-rendered into a text snapshot after each probe round"""
+
+    def __init__(self):
+        self._up = {}  # (target, endpoint) -> 0/1
+        self._latency = {}  # (target, endpoint, phase) -> seconds
+        self._histograms = {}  # (target, endpoint) -> [bucket counts, sum, count]
+        self._last_run = None
+        self._snapshot = self._render()
+
+    def observe(self, target, endpoint, result):
+        """Fold one probe result dict (as returned by check_*) into the metrics"""
+        key = (target, endpoint)
+        ok = result.get("ok", result.get("status") == "OK")
+        self._up[key] = 1 if ok else 0
+
+        latency_ms = result.get("response_time_ms")
+        if latency_ms is None:
+            return
+        seconds = latency_ms / 1000
+        self._latency[(target, endpoint, "total")] = seconds
+        for phase in PHASES:
+            value = (result.get("phases") or {}).get(f"{phase}_ms")
+            if value is not None:
+                self._latency[(target, endpoint, phase)] = value / 1000
+
+        buckets, total, count = self._histograms.get(key, ([0] * len(DURATION_BUCKETS), 0.0, 0))
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                buckets[i] += 1
+        self._histograms[key] = (buckets, total + seconds, count + 1)
+
+    def publish(self):
+        """Render the current metrics into the snapshot served to scrapers"""
+        self._last_run = time.time()
+        # Single reference swap: scrapes always see a complete snapshot
+        self._snapshot = self._render()
+
+    def snapshot(self):
+        return self._snapshot
+
+    def _render(self):
+        lines = [
+            "# TYPE igv_probe_up gauge",
+            "# HELP igv_probe_up 1 if the last probe succeeded, 0 otherwise.",
+        ]
+        for (target, endpoint), value in sorted(self._up.items()):
+            lines.append(f"igv_probe_up{_labels(target=target, endpoint=endpoint)} {value}")
+
+        lines += [
+            "# TYPE igv_probe_latency_seconds gauge",
+            "# UNIT igv_probe_latency_seconds seconds",
+            "# HELP igv_probe_latency_seconds Last probe latency per phase (total = whole request).",
+        ]
+        for (target, endpoint, phase), value in sorted(self._latency.items()):
+            labels = _labels(target=target, endpoint=endpoint, phase=phase)
+            lines.append(f"igv_probe_latency_seconds{labels} {_number(value)}")
+
+        lines += [
+            "# TYPE igv_probe_duration_seconds histogram",
+            "# UNIT igv_probe_duration_seconds seconds",
+            "# HELP igv_probe_duration_seconds Distribution of probe durations.",
+        ]
+        for (target, endpoint), (buckets, total, count) in sorted(self._histograms.items()):
+            for bound, value in zip(DURATION_BUCKETS, buckets):
+                labels = _labels(target=target, endpoint=endpoint, le=_number(bound))
+                lines.append(f"igv_probe_duration_seconds_bucket{labels} {value}")
+            labels = _labels(target=target, endpoint=endpoint, le="+Inf")
+            lines.append(f"igv_probe_duration_seconds_bucket{labels} {count}")
+            labels = _labels(target=target, endpoint=endpoint)
+            lines.append(f"igv_probe_duration_seconds_sum{labels} {_number(total)}")
+            lines.append(f"igv_probe_duration_seconds_count{labels} {count}")
+
+        lines += [
+            "# TYPE igv_probe_last_run_timestamp_seconds gauge",
+            "# HELP igv_probe_last_run_timestamp_seconds Unix time of the last probe round.",
+        ]
+        if self._last_run is not None:
+            lines.append(f"igv_probe_last_run_timestamp_seconds {_number(self._last_run)}")
+        lines.append("# EOF")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def serve(registry, host="0.0.0.0", port=9464):
+    """Serve registry snapshots on /metrics from a daemon thread; returns the server"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.snapshot()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -3,19 +3,74 @@
 Script de monitoring de déploiement Render pour IGV
 Mission: Suivre et confirmer le déploiement des services frontend et backend
 """
+import asyncio
+import contextlib
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import os
 import sys
 import json
 from datetime import datetime
 
-# Configuration
-FRONTEND_URL = "https://israelgrowthventure.com"
-BACKEND_URL = "https://igv-cms-backend.onrender.com"
+import async_probe
+import backend_warmer
+import build_fingerprint
+import events
+import metrics_exporter
+import poll_schedule
+import probe_history
+import probe_stats
+import route_crawler
+import session_capture
+import slo
+import target_sets
+
+# Configuration (override with --frontend-url / --backend-url, e.g. for standin_server.py)
+FRONTEND_URL = os.environ.get("IGV_FRONTEND_URL", "https://israelgrowthventure.com")
+BACKEND_URL = os.environ.get("IGV_BACKEND_URL", "https://igv-cms-backend.onrender.com")
 BACKEND_HEALTH = f"{BACKEND_URL}/health"
 MAX_WAIT_SECONDS = 600  # 10 minutes max
-CHECK_INTERVAL = 15  # Check every 15 seconds
+CHECK_INTERVAL = 15  # Check every 15 seconds (--poll fixed)
+PROBE_TIMEOUT = 10  # Per-probe deadline (seconds)
+PROBE_CONCURRENCY = 8  # Max probes in flight (async engine)
+MAX_BODY_BYTES = 8 * 1024 * 1024  # Stop hashing a response body after this many bytes
+# /health itself is probed every iteration as BACKEND_HEALTH, not listed again here
+CRM_ENDPOINTS = [
+    ("/api/health", "GET"),
+]
+
+# Shared keep-alive connections, reused across --wait iterations
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=PROBE_CONCURRENCY))
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=PROBE_CONCURRENCY))
+ASYNC_POOL = async_probe.ConnectionPool(max_idle_per_host=PROBE_CONCURRENCY)
+_LOOP = None
+_SEEN_CONNECTIONS = {}
+
+# ETag / Last-Modified of index.html, so unchanged builds come back as 304
+FRONTEND_VALIDATORS = build_fingerprint.ValidatorCache()
+
+# Latency per target, split by connection state: {target: {"cold": [count, total_ms], "warm": [...]}}
+CONNECTION_LATENCY = {}
+
+# Rolling latency window per target, kept across --wait iterations
+STATS_WINDOW = probe_stats.DEFAULT_WINDOW
+LATENCY_STATS = {}
+SLOWDOWN_RATIO = 2.0  # flag targets whose p50 is this much slower than the baseline
+
+# Persistent probe history (probe_history.ProbeHistory), enabled with --history
+HISTORY = None
+
+# Sliding-window SLO evaluation with burn-rate alerts (slo.SLOEngine), enabled with --slo-alerts / --watch
+SLO = None
+
+# Structured event stream (events.EventStream): NDJSON and/or human rendering, see --output
+EVENTS = None  # created by create_event_stream() at the bottom of this module
+
+# Capture of every probe exchange (session_capture.CaptureWriter), enabled with --record
+CAPTURE = None
 
 def get_local_sha(repo_path):
     """Get the current HEAD SHA from local repo"""
@@ -28,33 +83,181 @@ def get_local_sha(repo_path):
         )
         return result.stdout.strip() if result.returncode == 0 else None
     except Exception as e:
-        print(f"Error getting SHA for {repo_path}: {e}")
+        print(f"Error getting SHA for {repo_path}: {e}", file=sys.stderr)
         return None
 
+def run_async(coro):
+    """Run a coroutine on the monitor's persistent event loop (pooled connections are bound to it)"""
+    global _LOOP
+    if _LOOP is None:
+        _LOOP = asyncio.new_event_loop()
+    return _LOOP.run_until_complete(coro)
+
+def close_connections():
+    """Close pooled connections of both engines"""
+    global _LOOP
+    SESSION.close()
+    ASYNC_POOL.close()
+    if _LOOP is not None:
+        _LOOP.run_until_complete(asyncio.sleep(0))
+        _LOOP.close()
+        _LOOP = None
+
+def _session_connection(response):
+    """Tell whether a requests response used a new ("cold") or reused ("warm") connection"""
+    pool = getattr(response.raw, "_pool", None)
+    if pool is None:
+        return "cold"
+    opened = pool.num_connections
+    previous = _SEEN_CONNECTIONS.get(id(pool), 0)
+    _SEEN_CONNECTIONS[id(pool)] = opened
+    return "cold" if opened > previous else "warm"
+
+def record_connection_latency(target, result):
+    """Accumulate a probe's latency under its cold/warm bucket"""
+    if "response_time_ms" not in result or "connection" not in result:
+        return
+    bucket = CONNECTION_LATENCY.setdefault(target, {"cold": [0, 0], "warm": [0, 0]})
+    bucket[result["connection"]][0] += 1
+    bucket[result["connection"]][1] += result["response_time_ms"]
+
+def record_iteration(frontend_result, backend_result, api_results):
+    """Feed one iteration's probe results into the cold/warm and rolling statistics"""
+    samples = [(FRONTEND_URL, frontend_result), (BACKEND_HEALTH, backend_result)]
+    for (endpoint, _), result in zip(CRM_ENDPOINTS, api_results or []):
+        samples.append((f"{BACKEND_URL}{endpoint}", result))
+    now = time.time()
+    history_rows = []
+    for target, result in samples:
+        record_connection_latency(target, result)
+        ok = result.get("ok", result.get("status") == "OK")
+        stats = LATENCY_STATS.setdefault(target, probe_stats.RollingStats(STATS_WINDOW))
+        stats.add(result.get("response_time_ms"), ok)
+        history_rows.append((now, target, result.get("response_time_ms"), ok))
+        EVENTS.emit("probe", url=target, **result)
+        if SLO is not None:
+            for event in SLO.observe(target, result.get("response_time_ms"), ok, now):
+                EVENTS.write(event)
+    if HISTORY is not None:
+        HISTORY.append(history_rows)
+
+def latency_stats_summary():
+    """Return {target: rolling statistics dict}"""
+    return {target: stats.summary() for target, stats in LATENCY_STATS.items()}
+
+def connection_latency_summary():
+    """Return {target: {"cold_avg_ms", "warm_avg_ms", "setup_cost_ms"}} from recorded probes"""
+    summary = {}
+    for target, bucket in CONNECTION_LATENCY.items():
+        cold = bucket["cold"][1] / bucket["cold"][0] if bucket["cold"][0] else None
+        warm = bucket["warm"][1] / bucket["warm"][0] if bucket["warm"][0] else None
+        summary[target] = {
+            "cold_avg_ms": None if cold is None else int(cold),
+            "warm_avg_ms": None if warm is None else int(warm),
+            "setup_cost_ms": int(cold - warm) if cold is not None and warm is not None else None
+        }
+    return summary
+
+def frontend_result(status_code, timing, fingerprint=None):
+    """Build the frontend probe result dict (304 = unchanged build, still OK)"""
+    fingerprint = fingerprint or {}
+    if status_code == 304:
+        # Empty 304 body: report the digest and size saved with the last 200
+        timing = dict(timing, body_sha=fingerprint.get("digest"), body_bytes=fingerprint.get("body_bytes"))
+    return {
+        "status": "OK" if status_code in (200, 304) else "ERROR",
+        "status_code": status_code,
+        **timing,
+        "not_modified": status_code == 304,
+        "build_sha": fingerprint.get("build_sha"),
+        "main_bundle": fingerprint.get("main_bundle")
+    }
+
+def backend_result(status_code, timing, data):
+    """Build the backend probe result dict"""
+    return {
+        "status": "OK" if status_code == 200 else "ERROR",
+        "status_code": status_code,
+        **timing,
+        "version": data.get("version", "unknown"),
+        "service": data.get("service", "unknown"),
+        "build": build_fingerprint.backend_build(data)
+    }
+
+def api_endpoint_result(endpoint, status_code, timing):
+    """Build the API endpoint probe result dict"""
+    return {
+        "endpoint": endpoint,
+        "status": status_code,
+        "ok": status_code < 400,
+        **timing
+    }
+
+def _body_fields(sink):
+    """Digest, size and truncation flag of a streamed body, merged into probe results"""
+    return {"body_sha": sink.digest, "body_bytes": sink.size, "truncated": sink.truncated}
+
+def _session_request(method, url, headers=None, target="backend"):
+    """
+    Blocking request through the shared session, body streamed separately
+    through a BodyDigest so it can be timed without being buffered.
+    Returns (response, timing dict, sink); sink.head holds the first bytes.
+
+    requests does not expose DNS / connect / TLS timings: those phases are
+    None here, and ttfb_ms covers everything up to the response headers.
+    """
+    sink = async_probe.BodyDigest(max_bytes=MAX_BODY_BYTES)
+    try:
+        response = SESSION.request(method, url, headers=headers, timeout=PROBE_TIMEOUT, stream=True)
+        headers_at = time.perf_counter()
+        for chunk in response.iter_content(async_probe.READ_CHUNK):
+            if not sink.feed(chunk):
+                break
+        response.close()  # back to the pool, or dropped when truncated
+    except Exception as e:
+        if CAPTURE is not None:
+            CAPTURE.record(target, method, url, headers, error=str(e))
+        raise
+    body_ms = round((time.perf_counter() - headers_at) * 1000, 1)
+    ttfb_ms = round(response.elapsed.total_seconds() * 1000, 1)
+    timing = {
+        "response_time_ms": int(response.elapsed.total_seconds() * 1000),
+        "connection": _session_connection(response),
+        "phases": {
+            "dns_ms": None,
+            "connect_ms": None,
+            "tls_ms": None,
+            "ttfb_ms": ttfb_ms,
+            "body_ms": body_ms
+        },
+        **_body_fields(sink)
+    }
+    if CAPTURE is not None:
+        CAPTURE.record(target, method, url, headers, response.status_code,
+                       {k.lower(): v for k, v in response.headers.items()},
+                       elapsed_ms=timing["response_time_ms"], phases=timing["phases"],
+                       body_sha=sink.digest, body_bytes=sink.size)
+    return response, timing, sink
+
 def check_frontend():
     """Check if frontend is accessible"""
     try:
-        response = requests.get(FRONTEND_URL, timeout=10)
-        return {
-            "status": "OK" if response.status_code == 200 else "ERROR",
-            "status_code": response.status_code,
-            "response_time_ms": int(response.elapsed.total_seconds() * 1000)
-        }
+        response, timing, sink = _session_request("GET", FRONTEND_URL,
+                                                  FRONTEND_VALIDATORS.conditional_headers(FRONTEND_URL),
+                                                  target="frontend")
+        headers = {k.lower(): v for k, v in response.headers.items()}
+        fingerprint, _ = FRONTEND_VALIDATORS.update(FRONTEND_URL, response.status_code, headers, sink.head,
+                                                    digest=sink.digest, size=sink.size)
+        return frontend_result(response.status_code, timing, fingerprint)
     except Exception as e:
         return {"status": "ERROR", "error": str(e)}
 
 def check_backend():
     """Check if backend health endpoint responds"""
     try:
-        response = requests.get(BACKEND_HEALTH, timeout=10)
-        data = response.json() if response.status_code == 200 else {}
-        return {
-            "status": "OK" if response.status_code == 200 else "ERROR",
-            "status_code": response.status_code,
-            "response_time_ms": int(response.elapsed.total_seconds() * 1000),
-            "version": data.get("version", "unknown"),
-            "service": data.get("service", "unknown")
-        }
+        response, timing, sink = _session_request("GET", BACKEND_HEALTH)
+        data = json.loads(sink.head) if response.status_code == 200 else {}
+        return backend_result(response.status_code, timing, data)
     except Exception as e:
         return {"status": "ERROR", "error": str(e)}
 
@@ -62,15 +265,83 @@ def check_api_endpoint(endpoint, method="GET"):
     """Check specific API endpoints"""
     try:
         url = f"{BACKEND_URL}{endpoint}"
-        response = requests.request(method, url, timeout=10)
-        return {
-            "endpoint": endpoint,
-            "status": response.status_code,
-            "ok": response.status_code < 400
-        }
+        response, timing, _ = _session_request(method, url)
+        return api_endpoint_result(endpoint, response.status_code, timing)
     except Exception as e:
         return {"endpoint": endpoint, "status": "ERROR", "error": str(e)}
 
+async def _fetch(target, url, method="GET", headers=None):
+    """async_probe.fetch on the shared pool, recorded when --record is on"""
+    try:
+        response = await async_probe.fetch(url, method=method, timeout=PROBE_TIMEOUT, pool=ASYNC_POOL,
+                                           headers=headers, digest=True, max_body=MAX_BODY_BYTES)
+    except Exception as e:
+        if CAPTURE is not None:
+            CAPTURE.record(target, method, url, headers, error=_error_message(e))
+        raise
+    if CAPTURE is not None:
+        CAPTURE.record(target, method, url, headers, response["status_code"], response["headers"],
+                       elapsed_ms=response["elapsed_ms"], phases=response["phases"],
+                       body_sha=response["body_sha"], body_bytes=response["body_bytes"])
+    return response
+
+def _async_timing(response):
+    return {
+        "response_time_ms": response["elapsed_ms"],
+        "connection": "warm" if response["reused"] else "cold",
+        "phases": response["phases"],
+        "body_sha": response["body_sha"],
+        "body_bytes": response["body_bytes"],
+        "truncated": response["truncated"]
+    }
+
+def _error_message(e):
+    if isinstance(e, asyncio.TimeoutError):
+        return f"Timeout after {PROBE_TIMEOUT}s"
+    return str(e) or e.__class__.__name__
+
+async def check_frontend_async():
+    """Async variant of check_frontend()"""
+    try:
+        response = await _fetch("frontend", FRONTEND_URL,
+                                headers=FRONTEND_VALIDATORS.conditional_headers(FRONTEND_URL))
+        fingerprint, _ = FRONTEND_VALIDATORS.update(FRONTEND_URL, response["status_code"],
+                                                    response["headers"], response["body"],
+                                                    digest=response["body_sha"], size=response["body_bytes"])
+        return frontend_result(response["status_code"], _async_timing(response), fingerprint)
+    except Exception as e:
+        return {"status": "ERROR", "error": _error_message(e)}
+
+async def check_backend_async():
+    """Async variant of check_backend()"""
+    try:
+        response = await _fetch("backend", BACKEND_HEALTH)
+        data = json.loads(response["body"]) if response["status_code"] == 200 else {}
+        return backend_result(response["status_code"], _async_timing(response), data)
+    except Exception as e:
+        return {"status": "ERROR", "error": _error_message(e)}
+
+async def check_api_endpoint_async(endpoint, method="GET"):
+    """Async variant of check_api_endpoint()"""
+    try:
+        response = await _fetch("backend", f"{BACKEND_URL}{endpoint}", method=method)
+        return api_endpoint_result(endpoint, response["status_code"], _async_timing(response))
+    except Exception as e:
+        return {"endpoint": endpoint, "status": "ERROR", "error": _error_message(e)}
+
+async def probe_all_async(concurrency=PROBE_CONCURRENCY):
+    """
+    Fire frontend, backend and CRM endpoint probes concurrently.
+    Returns (frontend_result, backend_result, api_results).
+    """
+    factories = [check_frontend_async, check_backend_async]
+    factories += [
+        (lambda e=endpoint, m=method: check_api_endpoint_async(e, m))
+        for endpoint, method in CRM_ENDPOINTS
+    ]
+    results = await async_probe.gather_limited(factories, concurrency)
+    return results[0], results[1], results[2:]
+
 def print_banner():
     print("=" * 60)
     print("   IGV Deployment Monitor")
@@ -78,6 +349,80 @@ def print_banner():
     print("=" * 60)
     print()
 
+def format_phases(result):
+    """One-line phase breakdown, e.g. "dns 12.0ms | connect 30.1ms | ..." (unmeasured phases skipped)"""
+    phases = result.get("phases") or {}
+    parts = []
+    for key in async_probe.PHASES + ("redirect_ms",):
+        value = phases.get(key)
+        if value is None or (key == "redirect_ms" and not value):
+            continue
+        parts.append(f"{key[:-3]} {value}ms")
+    return " | ".join(parts)
+
+def format_body(result):
+    """Size and digest of a probed body, e.g. "2048 bytes, sha256 1a2b3c4d5e6f7a8b" """
+    text = f"{result['body_bytes']} bytes, sha256 {result['body_sha']}"
+    return text + " (truncated)" if result.get("truncated") else text
+
+def print_slo_event(event):
+    """One-line console rendering of an SLO burn alert"""
+    icon = "🔥" if event["state"] == "firing" else "✅"
+    rates = ", ".join(f"{window} x{rate}" for window, rate in event["burn_rates"].items())
+    print(f"   {icon} SLO {event['state']}: {event['sli']} of {event['endpoint']} "
+          f"({event['rule']}, {event['severity']}, burn {rates})")
+
+def watch_deployment(duration, engine="async", concurrency=PROBE_CONCURRENCY, interval=CHECK_INTERVAL):
+    """
+    Keep probing for `duration` seconds after a successful deployment so the
+    SLO engine can catch slow regressions. Returns False if any alert fired.
+    """
+    EVENTS.emit("watch_start", duration_s=duration, interval_s=interval)
+    deadline = time.time() + duration
+    rounds = 0
+    while time.time() < deadline:
+        time.sleep(min(interval, max(0, deadline - time.time())))
+        rounds += 1
+        if engine == "async":
+            frontend_result, backend_result, api_results = run_async(probe_all_async(concurrency))
+        else:
+            frontend_result = check_frontend()
+            backend_result = check_backend()
+            api_results = [check_api_endpoint(endpoint, method) for endpoint, method in CRM_ENDPOINTS]
+        record_iteration(frontend_result, backend_result, api_results)
+        EVENTS.flush()
+    
+    EVENTS.emit("watch_verdict", ok=not SLO.fired, rounds=rounds, alerts_fired=SLO.fired,
+                burn_rates=SLO.summary())
+    return not SLO.fired
+
+def render_watch_start(event):
+    print(f"\n👀 Watching SLOs for {event['duration_s']}s (probe every {event['interval_s']}s)...")
+
+def render_watch_verdict(event):
+    print(f"\n📐 SLO burn rates after {event['rounds']} watch rounds:")
+    for target, rates in event["burn_rates"].items():
+        availability = ", ".join(f"{w} x{r}" for w, r in rates["availability"].items() if r is not None)
+        latency = ", ".join(f"{w} x{r}" for w, r in rates["latency"].items() if r is not None)
+        print(f"   {target}: availability [{availability}] latency [{latency}]")
+    if event["alerts_fired"]:
+        print(f"❌ {event['alerts_fired']} SLO alert(s) fired while watching")
+    else:
+        print("✅ No SLO burn detected")
+
+def write_json_report(path, iteration, iteration_ms, frontend_result, backend_result, api_results):
+    """Write the latest iteration's probe results as JSON (machine-readable output)"""
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "iteration": iteration,
+        "iteration_ms": iteration_ms,
+        "frontend": dict(frontend_result, url=FRONTEND_URL),
+        "backend": dict(backend_result, url=BACKEND_HEALTH),
+        "endpoints": api_results or []
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
 def print_status(frontend_result, backend_result, expected_sha=None):
     """Print formatted status"""
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -89,7 +434,10 @@ def print_status(frontend_result, backend_result, expected_sha=None):
     print(f"\n🌐 Frontend: {FRONTEND_URL}")
     print(f"   Status: {fe_status} {frontend_result.get('status')}")
     if "response_time_ms" in frontend_result:
-        print(f"   Response Time: {frontend_result['response_time_ms']}ms")
+        print(f"   Response Time: {frontend_result['response_time_ms']}ms ({frontend_result.get('connection')} connection)")
+        print(f"   Phases: {format_phases(frontend_result)}")
+        if frontend_result.get("body_sha"):
+            print(f"   Body: {format_body(frontend_result)}")
     if "error" in frontend_result:
         print(f"   Error: {frontend_result['error']}")
     
@@ -98,9 +446,14 @@ def print_status(frontend_result, backend_result, expected_sha=None):
     print(f"\n⚙️  Backend: {BACKEND_URL}")
     print(f"   Status: {be_status} {backend_result.get('status')}")
     if "response_time_ms" in backend_result:
-        print(f"   Response Time: {backend_result['response_time_ms']}ms")
+        print(f"   Response Time: {backend_result['response_time_ms']}ms ({backend_result.get('connection')} connection)")
+        print(f"   Phases: {format_phases(backend_result)}")
+        if backend_result.get("body_sha"):
+            print(f"   Body: {format_body(backend_result)}")
     if "version" in backend_result:
         print(f"   Version: {backend_result['version']}")
+    if frontend_result.get("main_bundle"):
+        print(f"\n📦 Frontend bundle: {frontend_result['main_bundle']}")
     if "error" in backend_result:
         print(f"   Error: {backend_result['error']}")
     
@@ -111,99 +464,398 @@ def print_status(frontend_result, backend_result, expected_sha=None):
     
     return frontend_result.get("status") == "OK" and backend_result.get("status") == "OK"
 
-def check_crm_endpoints():
-    """Check CRM-specific endpoints"""
-    print("\n🔍 Checking CRM API Endpoints...")
-    endpoints = [
-        ("/health", "GET"),
-        ("/api/health", "GET"),
-    ]
-    
+def build_checks(frontend_result, backend_result, frontend_sha=None, backend_sha=None):
+    """
+    Compare the live builds with the expected SHAs (when given).
+    Returns [{"name", "expected", "live", "match", "state"}], empty when no SHA
+    is expected. state is "match", "mismatch", or "unverifiable" when the
+    service answers but exposes no commit SHA (no <meta name="igv-build"> in
+    index.html, no commit in /health).
+    """
+    checks = []
+    if frontend_sha:
+        unverifiable = (frontend_result.get("status") == "OK"
+                        and not build_fingerprint.is_sha(frontend_result.get("build_sha")))
+        checks.append(("Frontend", frontend_sha, frontend_result.get("build_sha"), unverifiable))
+    if backend_sha:
+        unverifiable = (backend_result.get("status") == "OK"
+                        and not build_fingerprint.is_sha(backend_result.get("build")))
+        checks.append(("Backend", backend_sha, backend_result.get("build"), unverifiable))
     results = []
-    for endpoint, method in endpoints:
-        result = check_api_endpoint(endpoint, method)
+    for name, expected, live, unverifiable in checks:
+        match = build_fingerprint.sha_matches(expected, live)
+        state = "match" if match else "unverifiable" if unverifiable else "mismatch"
+        results.append({"name": name, "expected": expected, "live": live, "match": match, "state": state})
+    return results
+
+def print_build_checks(checks, frontend_result):
+    if not checks:
+        return
+    print("\n🔖 Build verification:")
+    for check in checks:
+        if check["state"] == "unverifiable":
+            source = "index.html has no igv-build meta" if check["name"] == "Frontend" else "/health exposes no commit"
+            print(f"   ❔ {check['name']}: unverifiable ({source}) / expected {check['expected']}")
+            continue
+        icon = "✅" if check["match"] else "⏳"
+        print(f"   {icon} {check['name']}: live {check['live'] or 'unknown'} / expected {check['expected']}")
+    if frontend_result.get("not_modified"):
+        print("   (index.html unchanged since last check: 304, body not re-downloaded)")
+
+def print_crm_endpoints(api_results):
+    print("\n🔍 Checking CRM API Endpoints...")
+    for (endpoint, method), result in zip(CRM_ENDPOINTS, api_results):
         status_icon = "✅" if result.get("ok") else "❌"
         print(f"   {status_icon} {method} {endpoint} -> {result.get('status')}")
-        results.append(result)
-    
-    return all(r.get("ok") for r in results)
+        if "phases" in result:
+            print(f"      {format_phases(result)}")
 
-def monitor_deployment(frontend_sha=None, backend_sha=None, wait=False):
-    """Main monitoring function"""
+def render_start(event):
     print_banner()
+    print(f"🎯 Frontend URL: {event['frontend_url']}")
+    print(f"🎯 Backend URL: {event['backend_url']}")
+    print(f"🧪 Probe engine: {event['engine']}")
+    print(f"⏲️  Polling: {event['poll']}")
+    if event.get("frontend_sha"):
+        print(f"📦 Expected Frontend SHA: {event['frontend_sha']}")
+    if event.get("backend_sha"):
+        print(f"📦 Expected Backend SHA: {event['backend_sha']}")
+
+def render_iteration(event):
+    print(f"\n{'='*60}")
+    print(f"🔄 Check #{event['iteration']}")
+    print_status(event["frontend"], event["backend"])
+    print(f"⏱️  Iteration time: {event['iteration_ms']}ms")
+    print_build_checks(event["builds"], event["frontend"])
+    if event["all_ok"]:
+        print_crm_endpoints(event["endpoints"])
+
+def render_wait(event):
+    print(f"\n⏳ Waiting {event['delay_s']:.1f}s before next check [{event['mode']}]... "
+          f"({int(event['remaining_s'])}s remaining)")
+
+def render_verdict(event):
+    outcome = event["outcome"]
+    if outcome == "services_down":
+        print("\n❌ Some services are not responding correctly.")
+    elif outcome == "sha_mismatch":
+        print("\n❌ Live build does not match the expected SHA.")
+    elif outcome == "sha_unverifiable":
+        print(f"\n❌ Cannot verify --frontend-sha {event['frontend_sha']}: {event['frontend_url']} serves an "
+              "index.html without a <meta name=\"igv-build\"> build SHA.")
+        print("   Rebuild with craco.config.js (REACT_APP_GIT_SHA from RENDER_GIT_COMMIT), or drop --frontend-sha.")
+    elif outcome == "timeout":
+        print(f"\n⏰ Timeout after {int(event['elapsed_s'])} seconds")
+        print("❌ Deployment may still be in progress.")
+    elif outcome == "success":
+        print("\n" + "=" * 60)
+        print("✅ DEPLOYMENT SUCCESSFUL!")
+        print("   All services are running and responding correctly.")
+        print("=" * 60)
+        
+        # Generate summary for MISSION_MASTER.md
+        print("\n📋 Summary for MISSION_MASTER.md:")
+        print("```")
+        print(f"Deployment Check: {datetime.fromtimestamp(event['ts']).strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Frontend: ✅ OK - {event['frontend_url']}")
+        print(f"Backend:  ✅ OK - {event['backend_url']}")
+        if event.get("frontend_sha"):
+            print(f"Frontend SHA: {event['frontend_sha']}")
+        if event.get("backend_sha"):
+            unverified = any(c["state"] == "unverifiable" for c in event.get("builds", []))
+            print(f"Backend SHA: {event['backend_sha']}" + (" (unverifiable: /health exposes no commit)"
+                                                             if unverified else ""))
+        print("CRM Endpoints: ✅ All responding")
+        print(f"Checks: {event['iterations']} in {int(event['elapsed_s'])}s ({event['poll']} polling)")
+        for target, latency in event["connection_latency"].items():
+            cold = f"{latency['cold_avg_ms']}ms" if latency["cold_avg_ms"] is not None else "n/a"
+            warm = f"{latency['warm_avg_ms']}ms" if latency["warm_avg_ms"] is not None else "n/a"
+            print(f"Latency {target}: cold {cold} / warm {warm}")
+        for target, summary in event["stats"].items():
+            print(f"Stats {target}: {probe_stats.format_summary(summary)}")
+            ratio = event["baseline_ratios"].get(target)
+            if ratio is not None:
+                flag = "⚠️ SLOWER" if ratio >= SLOWDOWN_RATIO else "✅"
+                print(f"   p50 vs previous release: x{ratio} {flag}")
+        print("```")
+
+def create_event_stream(ndjson=None, human=True):
+    """EventStream with the monitor's human renderers registered"""
+    stream = events.EventStream(ndjson=ndjson, human=human)
+    stream.on("start", render_start)
+    stream.on("iteration", render_iteration)
+    stream.on("wait", render_wait)
+    stream.on("verdict", render_verdict)
+    stream.on("slo_burn", print_slo_event)
+    stream.on("watch_start", render_watch_start)
+    stream.on("watch_verdict", render_watch_verdict)
+    return stream
+
+def monitor_deployment(frontend_sha=None, backend_sha=None, wait=False, engine="async",
+                       concurrency=PROBE_CONCURRENCY, json_report=None, stats_baseline=None,
+                       poll="adaptive", max_wait=MAX_WAIT_SECONDS, watch=0,
+                       watch_interval=CHECK_INTERVAL):
+    """Main monitoring function"""
+    EVENTS.emit("start", frontend_url=FRONTEND_URL, backend_url=BACKEND_URL, engine=engine, poll=poll,
+                frontend_sha=frontend_sha, backend_sha=backend_sha)
     
-    print(f"🎯 Frontend URL: {FRONTEND_URL}")
-    print(f"🎯 Backend URL: {BACKEND_URL}")
-    
-    if frontend_sha:
-        print(f"📦 Expected Frontend SHA: {frontend_sha}")
-    if backend_sha:
-        print(f"📦 Expected Backend SHA: {backend_sha}")
+    if poll == "adaptive":
+        poller = poll_schedule.AdaptivePoller()
+    else:
+        poller = poll_schedule.FixedPoller(CHECK_INTERVAL)
     
     start_time = time.time()
     iteration = 0
     
     while True:
         iteration += 1
-        print(f"\n{'='*60}")
-        print(f"🔄 Check #{iteration}")
         
-        frontend_result = check_frontend()
-        backend_result = check_backend()
+        iteration_start = time.perf_counter()
+        if engine == "async":
+            frontend_result, backend_result, api_results = run_async(probe_all_async(concurrency))
+        else:
+            frontend_result = check_frontend()
+            backend_result = check_backend()
+            api_results = None
+        iteration_ms = int((time.perf_counter() - iteration_start) * 1000)
         
-        all_ok = print_status(frontend_result, backend_result)
+        services_up = frontend_result.get("status") == "OK" and backend_result.get("status") == "OK"
+        builds = build_checks(frontend_result, backend_result, frontend_sha, backend_sha)
+        # A backend without commit cannot be checked (warned about); a frontend without the
+        # igv-build meta never will be: fail fast instead of polling until the timeout
+        frontend_unverifiable = any(c["name"] == "Frontend" and c["state"] == "unverifiable" for c in builds)
+        all_ok = (services_up and not frontend_unverifiable
+                  and all(check["state"] != "mismatch" for check in builds))
         
-        if all_ok:
-            crm_ok = check_crm_endpoints()
-            if crm_ok:
-                print("\n" + "=" * 60)
-                print("✅ DEPLOYMENT SUCCESSFUL!")
-                print("   All services are running and responding correctly.")
-                print("=" * 60)
-                
-                # Generate summary for MISSION_MASTER.md
-                print("\n📋 Summary for MISSION_MASTER.md:")
-                print("```")
-                print(f"Deployment Check: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                print(f"Frontend: ✅ OK - {FRONTEND_URL}")
-                print(f"Backend:  ✅ OK - {BACKEND_URL}")
-                if frontend_sha:
-                    print(f"Frontend SHA: {frontend_sha}")
-                if backend_sha:
-                    print(f"Backend SHA: {backend_sha}")
-                print("CRM Endpoints: ✅ All responding")
-                print("```")
-                
-                return True
+        if services_up and api_results is None:
+            api_results = [check_api_endpoint(endpoint, method) for endpoint, method in CRM_ENDPOINTS]
+        record_iteration(frontend_result, backend_result, api_results)
+        crm_ok = all_ok and all(r.get("ok") for r in api_results)
+        EVENTS.emit("iteration", iteration=iteration, iteration_ms=iteration_ms, services_up=services_up,
+                    all_ok=all_ok, crm_ok=crm_ok, builds=builds,
+                    frontend=dict(frontend_result, url=FRONTEND_URL),
+                    backend=dict(backend_result, url=BACKEND_HEALTH), endpoints=api_results or [])
+        if json_report:
+            write_json_report(json_report, iteration, iteration_ms, frontend_result, backend_result, api_results)
+        
+        elapsed = time.time() - start_time
+        if frontend_unverifiable:
+            EVENTS.emit("verdict", outcome="sha_unverifiable", ok=False, iterations=iteration,
+                        frontend_url=FRONTEND_URL, frontend_sha=frontend_sha)
+            return False
+        if crm_ok:
+            baseline = probe_stats.load_baseline(stats_baseline)
+            current = latency_stats_summary()
+            ratios = {target: probe_stats.compare_to_baseline(summary, baseline.get(target))
+                      for target, summary in current.items()}
+            EVENTS.emit("verdict", outcome="success", ok=True, iterations=iteration, elapsed_s=round(elapsed, 1),
+                        poll=poll, frontend_url=FRONTEND_URL, backend_url=BACKEND_URL,
+                        frontend_sha=frontend_sha, backend_sha=backend_sha, builds=builds,
+                        connection_latency=connection_latency_summary(), stats=current, baseline_ratios=ratios)
+            if stats_baseline:
+                probe_stats.save_baseline(stats_baseline, current)
+            
+            if watch:
+                return watch_deployment(watch, engine, concurrency, watch_interval)
+            return True
         
         if not wait:
+            if not services_up:
+                EVENTS.emit("verdict", outcome="services_down", ok=False, iterations=iteration)
+                return False
             if not all_ok:
-                print("\n❌ Some services are not responding correctly.")
+                EVENTS.emit("verdict", outcome="sha_mismatch", ok=False, iterations=iteration)
                 return False
+            EVENTS.emit("verdict", outcome="crm_unavailable", ok=True, iterations=iteration)
             break
         
-        elapsed = time.time() - start_time
-        if elapsed > MAX_WAIT_SECONDS:
-            print(f"\n⏰ Timeout after {int(elapsed)} seconds")
-            print("❌ Deployment may still be in progress.")
+        if elapsed > max_wait:
+            EVENTS.emit("verdict", outcome="timeout", ok=False, iterations=iteration, elapsed_s=round(elapsed, 1))
             return False
         
-        remaining = MAX_WAIT_SECONDS - elapsed
-        print(f"\n⏳ Waiting {CHECK_INTERVAL}s before next check... ({int(remaining)}s remaining)")
-        time.sleep(CHECK_INTERVAL)
+        any_ok = frontend_result.get("status") == "OK" or backend_result.get("status") == "OK"
+        remaining = max_wait - elapsed
+        delay = min(poller.next_delay(elapsed, any_ok, builds, services_up), remaining)
+        EVENTS.emit("wait", delay_s=round(delay, 1), mode=poller.mode, remaining_s=round(remaining, 1))
+        EVENTS.flush()
+        time.sleep(delay)
+    
+    return True
+
+def crawl_routes(seeds_path=None, rate=route_crawler.DEFAULT_RATE, concurrency=PROBE_CONCURRENCY,
+                 json_report=None):
+    """Crawler mode: probe every route declared in src/App.js, in every language"""
+    print_banner()
+    routes = route_crawler.extract_routes()
+    print(f"🎯 Frontend URL: {FRONTEND_URL}")
+    print(f"🧭 {len(routes)} routes found in src/App.js, {rate} req/s max")
+    
+    results, skipped = run_async(route_crawler.crawl(
+        FRONTEND_URL, routes, route_crawler.load_seeds(seeds_path),
+        rate=rate, concurrency=concurrency, timeout=PROBE_TIMEOUT
+    ))
+    ok = route_crawler.print_report(results, skipped)
+    
+    if json_report:
+        with open(json_report, "w", encoding="utf-8") as f:
+            json.dump({"routes": results, "skipped": skipped}, f, ensure_ascii=False, indent=2)
+    return ok
+
+def probe_target_sets(config_path=target_sets.DEFAULT_CONFIG, rate=None, concurrency=None, json_report=None):
+    """Multi-target mode: sweep every target group of a config file behind one rate limit"""
+    print_banner()
+    groups, settings = target_sets.load_targets(config_path)
+    rate = rate or settings["rate"]
+    if concurrency is None:
+        concurrency = settings["concurrency"]
+    print(f"🗂️  {config_path}: {sum(len(g['probes']) for g in groups)} probes in {len(groups)} groups, "
+          f"{rate} req/s max, {concurrency} workers")
+    
+    results = run_async(target_sets.probe_targets(
+        groups, rate=rate, burst=settings["burst"], concurrency=concurrency, timeout=PROBE_TIMEOUT
+    ))
+    if HISTORY is not None:
+        now = time.time()
+        HISTORY.append((now, r["url"], r.get("response_time_ms"), r["ok"]) for r in results)
+    report = target_sets.aggregate(results)
+    ok = target_sets.print_report(results, report)
+    
+    if json_report:
+        with open(json_report, "w", encoding="utf-8") as f:
+            json.dump({"groups": report, "probes": results}, f, ensure_ascii=False, indent=2)
+    return ok
+
+def warm_backend(log_path=None, initial_interval=backend_warmer.INITIAL_INTERVAL):
+    """Warmer mode: keep the Render backend awake with the fewest pings possible"""
+    global PROBE_TIMEOUT
+    # A cold start outlasts the usual probe deadline: give the backend time to wake up
+    PROBE_TIMEOUT = max(PROBE_TIMEOUT, backend_warmer.PROBE_TIMEOUT)
+    print_banner()
+    print(f"🎯 Backend health: {BACKEND_HEALTH} (probe timeout {PROBE_TIMEOUT}s)")
+    print(f"♨️  Warmer started, first interval {initial_interval}s (Ctrl+C to stop)")
+    summary = backend_warmer.run_warmer(check_backend, log_path=log_path, initial_interval=initial_interval)
+    
+    print("\n📋 Warmer summary:")
+    print(f"   Pings: {summary['pings']}")
+    print(f"   Cold starts: {summary['cold_starts']} ({summary['wake_up_ms_total']}ms total wake-up time, "
+          f"{summary['timeouts']} still down after {backend_warmer.WAKE_UP_DEADLINE}s)")
+    if summary["spindown_estimate_s"]:
+        print(f"   Learned spin-down window: ~{int(summary['spindown_estimate_s'])}s")
+    return True
+
+def export_metrics(port, interval=CHECK_INTERVAL, concurrency=PROBE_CONCURRENCY):
+    """Exporter mode: probe in the background and serve OpenMetrics snapshots on /metrics"""
+    registry = metrics_exporter.MetricsRegistry()
+    server = metrics_exporter.serve(registry, port=port)
+    print_banner()
+    print(f"📈 OpenMetrics exporter on http://0.0.0.0:{port}/metrics (probing every {interval}s)")
     
+    try:
+        while True:
+            frontend_result, backend_result, api_results = run_async(probe_all_async(concurrency))
+            record_iteration(frontend_result, backend_result, api_results)
+            registry.observe("frontend", "/", frontend_result)
+            registry.observe("backend", "/health", backend_result)
+            for (endpoint, _), result in zip(CRM_ENDPOINTS, api_results):
+                registry.observe("api", endpoint, result)
+            registry.publish()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
     return True
 
 def main():
+    global PROBE_TIMEOUT, MAX_BODY_BYTES, HISTORY, CAPTURE, SLO, EVENTS, FRONTEND_URL, BACKEND_URL, BACKEND_HEALTH
     import argparse
     parser = argparse.ArgumentParser(description="Monitor IGV deployment")
     parser.add_argument("--wait", action="store_true", help="Wait for deployment to complete")
+    parser.add_argument("--frontend-url", type=str, default=FRONTEND_URL,
+                        help="Frontend base URL (default: production, or $IGV_FRONTEND_URL)")
+    parser.add_argument("--backend-url", type=str, default=BACKEND_URL,
+                        help="Backend base URL (default: production, or $IGV_BACKEND_URL)")
     parser.add_argument("--frontend-sha", type=str, help="Expected frontend SHA")
     parser.add_argument("--backend-sha", type=str, help="Expected backend SHA")
     parser.add_argument("--frontend-repo", type=str, help="Path to frontend repo to get SHA")
     parser.add_argument("--backend-repo", type=str, help="Path to backend repo to get SHA")
+    parser.add_argument("--engine", choices=["async", "sync"], default="async",
+                        help="Probe engine: concurrent asyncio probes, or blocking requests fallback")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help=f"Max probes in flight with the async engine (default {PROBE_CONCURRENCY}, "
+                             f"or the config's value with --targets)")
+    parser.add_argument("--probe-timeout", type=float, default=PROBE_TIMEOUT,
+                        help="Per-probe deadline in seconds")
+    parser.add_argument("--max-body", type=int, default=MAX_BODY_BYTES,
+                        help="Stop reading (and hashing) a response body after this many bytes")
+    parser.add_argument("--json-report", type=str,
+                        help="Write the latest iteration's results (with phase timings) to this JSON file")
+    parser.add_argument("--poll", choices=["adaptive", "fixed"], default="adaptive",
+                        help=f"Adaptive backoff polling, or a fixed {CHECK_INTERVAL}s interval")
+    parser.add_argument("--max-wait", type=int, default=MAX_WAIT_SECONDS,
+                        help="Give up after this many seconds in --wait mode")
+    parser.add_argument("--stats-baseline", type=str,
+                        help="JSON file holding the previous release's latency stats (compared, then updated)")
+    parser.add_argument("--history", nargs="?", const=probe_history.DEFAULT_DB,
+                        help="Append every probe to a SQLite history (query it with probe_history.py)")
+    parser.add_argument("--watch", type=int, default=0, metavar="SECONDS",
+                        help="After a successful deployment, keep probing this long and fail on SLO burn")
+    parser.add_argument("--watch-interval", type=float, default=CHECK_INTERVAL,
+                        help="Seconds between probe rounds while watching")
+    parser.add_argument("--slo-alerts", type=str, metavar="FILE",
+                        help="Append SLO burn-rate alerts as NDJSON to this file ('-' for stdout)")
+    parser.add_argument("--slo-availability", type=float, default=slo.DEFAULT_AVAILABILITY,
+                        help="Availability objective per endpoint")
+    parser.add_argument("--slo-latency-ms", type=float, default=slo.DEFAULT_LATENCY_MS,
+                        help="Latency objective: probes slower than this count against the latency SLO")
+    parser.add_argument("--output", choices=["human", "ndjson", "both"], default="human",
+                        help="Human-readable status, NDJSON events (one line per probe/iteration/verdict), or both")
+    parser.add_argument("--events", type=str, metavar="FILE",
+                        help="NDJSON event destination (default stdout with --output ndjson; required with both)")
+    parser.add_argument("--record", type=str, metavar="FILE",
+                        help="Record every probe exchange to a capture file (replay it with session_capture.py)")
+    parser.add_argument("--export", type=int, metavar="PORT",
+                        help="Run as an OpenMetrics exporter on this port instead of printing status")
+    parser.add_argument("--export-interval", type=float, default=CHECK_INTERVAL,
+                        help="Seconds between background probe rounds (--export)")
+    parser.add_argument("--warm", action="store_true",
+                        help="Run as a keep-alive daemon for the backend (learns the spin-down window)")
+    parser.add_argument("--warm-log", type=str,
+                        help="Append detected cold starts to this NDJSON file (--warm)")
+    parser.add_argument("--warm-interval", type=int, default=backend_warmer.INITIAL_INTERVAL,
+                        help="First keep-alive interval in seconds before anything is learned (--warm)")
+    parser.add_argument("--targets", nargs="?", const=target_sets.DEFAULT_CONFIG, metavar="FILE",
+                        help="Probe every target group of a config file (default ops/monitor_targets.json)")
+    parser.add_argument("--rate", type=float,
+                        help="Global request rate cap for --targets (overrides the config file)")
+    parser.add_argument("--crawl", action="store_true",
+                        help="Probe every route declared in src/App.js in fr/en/he instead of monitoring")
+    parser.add_argument("--seeds", type=str,
+                        help="JSON seed values for parameterised routes (--crawl)")
+    parser.add_argument("--crawl-rate", type=float, default=route_crawler.DEFAULT_RATE,
+                        help="Max requests per second while crawling")
     
     args = parser.parse_args()
+    if args.output == "both" and args.events in (None, "-"):
+        parser.error("--output both needs --events FILE (stdout carries the human output)")
+    
+    if args.output != "human":
+        EVENTS = create_event_stream(ndjson=args.events or "-", human=args.output == "both")
+    PROBE_TIMEOUT = args.probe_timeout
+    MAX_BODY_BYTES = args.max_body
+    FRONTEND_URL = args.frontend_url.rstrip("/")
+    BACKEND_URL = args.backend_url.rstrip("/")
+    BACKEND_HEALTH = f"{BACKEND_URL}/health"
+    if args.history:
+        HISTORY = probe_history.ProbeHistory(args.history)
+        HISTORY.prune()
+    if args.watch or args.slo_alerts:
+        # Alerts go through EVENTS only (record_iteration), --slo-alerts is a filtered copy of it
+        SLO = slo.SLOEngine(availability=args.slo_availability, latency_ms=args.slo_latency_ms)
+        if args.slo_alerts:
+            EVENTS.add_sink(args.slo_alerts, ("slo_burn",))
+    if args.record:
+        CAPTURE = session_capture.CaptureWriter(args.record, FRONTEND_URL, BACKEND_URL, follow_redirects=True)
     
     frontend_sha = args.frontend_sha
     backend_sha = args.backend_sha
@@ -213,21 +865,75 @@ def main():
         sha = get_local_sha(args.frontend_repo)
         if sha:
             frontend_sha = sha
-            print(f"📦 Got frontend SHA from repo: {sha}")
+            if EVENTS.human:
+                print(f"📦 Got frontend SHA from repo: {sha}")
     
     if args.backend_repo:
         sha = get_local_sha(args.backend_repo)
         if sha:
             backend_sha = sha
-            print(f"📦 Got backend SHA from repo: {sha}")
+            if EVENTS.human:
+                print(f"📦 Got backend SHA from repo: {sha}")
     
-    success = monitor_deployment(
-        frontend_sha=frontend_sha,
-        backend_sha=backend_sha,
-        wait=args.wait
-    )
+    # --output ndjson: stdout is the event stream, human text (crawl, targets, warm,
+    # export reports) goes to stderr
+    human_out = sys.stderr if args.output == "ndjson" else sys.stdout
+    concurrency = PROBE_CONCURRENCY if args.concurrency is None else args.concurrency
+    with contextlib.redirect_stdout(human_out):
+        try:
+            if args.export:
+                success = export_metrics(args.export, interval=args.export_interval,
+                                         concurrency=concurrency)
+                sys.exit(0 if success else 1)
+            
+            if args.warm:
+                success = warm_backend(log_path=args.warm_log, initial_interval=args.warm_interval)
+                sys.exit(0 if success else 1)
+            
+            if args.targets:
+                success = probe_target_sets(
+                    config_path=args.targets,
+                    rate=args.rate,
+                    concurrency=args.concurrency,
+                    json_report=args.json_report
+                )
+                sys.exit(0 if success else 1)
+            
+            if args.crawl:
+                success = crawl_routes(
+                    seeds_path=args.seeds,
+                    rate=args.crawl_rate,
+                    concurrency=concurrency,
+                    json_report=args.json_report
+                )
+                sys.exit(0 if success else 1)
+            
+            success = monitor_deployment(
+                frontend_sha=frontend_sha,
+                backend_sha=backend_sha,
+                wait=args.wait,
+                engine=args.engine,
+                concurrency=concurrency,
+                json_report=args.json_report,
+                stats_baseline=args.stats_baseline,
+                poll=args.poll,
+                max_wait=args.max_wait,
+                watch=args.watch,
+                watch_interval=args.watch_interval
+            )
+        finally:
+            close_connections()
+            if HISTORY is not None:
+                HISTORY.close()
+            EVENTS.close()
+            if CAPTURE is not None:
+                CAPTURE.close()
+                if EVENTS.human:
+                    print(f"📼 {CAPTURE.count} exchanges recorded to {CAPTURE.path}")
     
     sys.exit(0 if success else 1)
 
+EVENTS = create_event_stream()
+
 if __name__ == "__main__":
     main()
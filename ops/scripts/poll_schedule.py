@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Planification adaptative des vérifications pour monitor_deploy.py
+Mission: Détecter le déploiement au plus tôt sans marteler un backend
+encore en cours de build.
+
+- warmup : polling rapide juste après le déclenchement du déploiement
+- backoff : backoff exponentiel avec jitter tant que le service renvoie des
+  erreurs ou sert encore l'ancien build
+- tight : polling serré dès que le nouveau build répond (ou, sans SHA
+  attendu, dès le premier 200), jusqu'au tout-vert
+
+Pendant un déploiement Render l'ancienne release continue de répondre 200 :
+tant que c'est elle qui est servie, on reste en backoff. Un changement
+(sonde qui se met à échouer, build en ligne différent) repasse en tight.
+"""
+import random
+
+WARMUP_INTERVAL = 3  # seconds between checks right after the trigger
+WARMUP_SECONDS = 30  # how long the warmup phase lasts
+BACKOFF_BASE = 5  # first backoff delay once the warmup is over
+BACKOFF_MAX = 60  # backoff cap
+TIGHT_INTERVAL = 2  # once a 200 has been seen
+
+
+class AdaptivePoller:
+    """Compute the delay before the next check from what the last one saw"""
+
+    def __init__(self, warmup_interval=WARMUP_INTERVAL, warmup_seconds=WARMUP_SECONDS,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX,
+                 tight_interval=TIGHT_INTERVAL, rng=None):
+        self.warmup_interval = warmup_interval
+        self.warmup_seconds = warmup_seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.tight_interval = tight_interval
+        self.rng = rng or random.Random()
+        self.mode = "warmup"
+        self.failures = 0
+        self._last_state = None
+
+    def next_delay(self, elapsed, any_ok, builds=None, services_up=None):
+        """
+        Return the number of seconds to wait before the next check.
+
+        `elapsed` is the time since monitoring started, `any_ok` tells
+        whether at least one probe returned 200 during the last check.
+        `builds` is the expected-vs-live SHA comparison of that check
+        (monitor_deploy.build_checks()); when it is given, a 200 from the old
+        release is not enough: polling only tightens once an expected build
+        is live, or when something changed since the previous check.
+        """
+        state = (any_ok, services_up, tuple(check["live"] for check in builds or ()))
+        changed = self._last_state is not None and state != self._last_state
+        self._last_state = state
+        if builds:
+            tight = any(check["match"] for check in builds) or changed
+        else:
+            tight = any_ok
+        if tight:
+            # Once the new release answers, poll tightly until everything is green
+            self.mode = "tight"
+            self.failures = 0
+            return self.tight_interval
+
+        if elapsed < self.warmup_seconds:
+            self.mode = "warmup"
+            return self.warmup_interval
+
+        self.mode = "backoff"
+        delay = min(self.backoff_max, self.backoff_base * (2 ** self.failures))
+        self.failures += 1
+        # Equal jitter: keep half the delay, randomise the other half
+        return delay / 2 + self.rng.uniform(0, delay / 2)
+
+
+class FixedPoller:
+    """Legacy fixed-interval schedule"""
+
+    mode = "fixed"
+
+    def __init__(self, interval):
+        self.interval = interval
+
+    def next_delay(self, elapsed, any_ok, builds=None, services_up=None):
+        return self.interval
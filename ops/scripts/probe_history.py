@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Historique compact des sondes (SQLite) avec agrégats 1 minute / 1 heure
+Mission: Conserver chaque sonde de monitor_deploy.py, sous-échantillonner
+automatiquement et répondre en quelques millisecondes à des requêtes comme
+"p95 de /api/health sur les 7 derniers jours" sans relire tout l'historique.
+
+Chaque agrégat stocke un histogramme logarithmique des latences (erreur
+relative ~2%), fusionnable: un p95 sur 7 jours ne lit que ~168 lignes.
+
+Usage:
+    python probe_history.py query --target /api/health --days 7 --percentile 95
+    python probe_history.py prune
+"""
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_DB = os.path.join(os.path.dirname(__file__), '..', 'monitor_history.db')
+HISTOGRAM_ALPHA = 0.02  # relative error of the latency histogram buckets
+
+# Retention per resolution, in seconds
+RETENTION = {
+    "samples": 2 * 86400,
+    "rollup_1m": 14 * 86400,
+    "rollup_1h": 400 * 86400,
+}
+ROLLUPS = (("rollup_1m", 60), ("rollup_1h", 3600))
+
+_GAMMA_LOG = math.log1p(HISTOGRAM_ALPHA)
+
+
+def like_escape(text):
+    """Escape LIKE wildcards (% and _) for a query using ESCAPE '\\'"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def target_matches(stored, target):
+    """Exact URL, or a path ("/health") equal to the stored URL's path (not "/api/health")"""
+    if stored == target:
+        return True
+    if not target.startswith("/"):
+        return False
+    parts = urlsplit(stored)
+    return (parts.path + (f"?{parts.query}" if parts.query else "")) == target
+
+
+def histogram_bucket(latency_ms):
+    """Index of the log-scale bucket holding `latency_ms` (0 for sub-millisecond values)"""
+    if latency_ms <= 1:
+        return 0
+    return int(math.ceil(math.log(latency_ms) / _GAMMA_LOG))
+
+
+def bucket_value(index):
+    """Representative latency of a histogram bucket"""
+    if index <= 0:
+        return 1.0
+    return round(math.exp(index * _GAMMA_LOG), 1)
+
+
+def histogram_percentile(histogram, p):
+    """Percentile (0-100) of a {bucket: count} histogram, None when empty"""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    rank = max(1, math.ceil(total * p / 100))
+    seen = 0
+    for index in sorted(histogram):
+        seen += histogram[index]
+        if seen >= rank:
+            return bucket_value(index)
+    return None
+
+
+class ProbeHistory:
+    """Append-only probe store with automatic 1m / 1h downsampling and retention"""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS samples ("
+            " ts INTEGER NOT NULL, target TEXT NOT NULL, latency_ms REAL, ok INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS samples_target_ts ON samples (target, ts)")
+        for table, _ in ROLLUPS:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                " target TEXT NOT NULL, bucket INTEGER NOT NULL,"
+                " count INTEGER NOT NULL, errors INTEGER NOT NULL,"
+                " sum_ms REAL NOT NULL, min_ms REAL, max_ms REAL, histogram TEXT NOT NULL,"
+                " PRIMARY KEY (target, bucket)) WITHOUT ROWID"
+            )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def append(self, samples):
+        """
+        Store an iterable of (ts, target, latency_ms, ok) in one transaction
+        and fold them into the rollups.
+        """
+        samples = list(samples)
+        if not samples:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO samples (ts, target, latency_ms, ok) VALUES (?, ?, ?, ?)",
+                [(int(ts), target, latency, 1 if ok else 0) for ts, target, latency, ok in samples],
+            )
+            for table, width in ROLLUPS:
+                self._fold(table, width, samples)
+
+    def _fold(self, table, width, samples):
+        groups = {}
+        for ts, target, latency, ok in samples:
+            groups.setdefault((target, int(ts) // width * width), []).append((latency, ok))
+
+        for (target, bucket), items in groups.items():
+            row = self.conn.execute(
+                f"SELECT count, errors, sum_ms, min_ms, max_ms, histogram FROM {table}"
+                " WHERE target = ? AND bucket = ?", (target, bucket)
+            ).fetchone()
+            count, errors, sum_ms, min_ms, max_ms, histogram = row or (0, 0, 0.0, None, None, "{}")
+            histogram = {int(k): v for k, v in json.loads(histogram).items()}
+            for latency, ok in items:
+                count += 1
+                if not ok or latency is None:
+                    errors += 1
+                    continue
+                sum_ms += latency
+                min_ms = latency if min_ms is None else min(min_ms, latency)
+                max_ms = latency if max_ms is None else max(max_ms, latency)
+                index = histogram_bucket(latency)
+                histogram[index] = histogram.get(index, 0) + 1
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {table}"
+                " (target, bucket, count, errors, sum_ms, min_ms, max_ms, histogram)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (target, bucket, count, errors, sum_ms, min_ms, max_ms,
+                 json.dumps(histogram, separators=(",", ":"))),
+            )
+
+    def prune(self, now=None):
+        """Drop rows older than each table's retention; returns rows deleted"""
+        now = now or time.time()
+        deleted = 0
+        with self.conn:
+            deleted += self.conn.execute(
+                "DELETE FROM samples WHERE ts < ?", (int(now - RETENTION["samples"]),)
+            ).rowcount
+            for table, _ in ROLLUPS:
+                deleted += self.conn.execute(
+                    f"DELETE FROM {table} WHERE bucket < ?", (int(now - RETENTION[table]),)
+                ).rowcount
+        return deleted
+
+    def targets(self):
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT target FROM rollup_1h ORDER BY target")]
+
+    def matching_targets(self, target):
+        """Recorded URLs equal to `target`, or whose path is `target` (see target_matches)"""
+        candidates = self.conn.execute(
+            "SELECT DISTINCT target FROM rollup_1h WHERE target = ? OR target LIKE ? ESCAPE '\\'"
+            " ORDER BY target",
+            (target, f"%{like_escape(target)}"),
+        )
+        return [row[0] for row in candidates if target_matches(row[0], target)]
+
+    def query(self, target, since, until=None, percentiles=(50, 95, 99)):
+        """
+        Aggregate statistics for `target` (a full URL, or a path matching the
+        recorded URLs' path exactly) between `since` and `until` (unix seconds).
+        Uses hourly rollups for ranges over 6 hours, minute rollups otherwise.
+        """
+        until = until or time.time()
+        table, width = ROLLUPS[1] if until - since > 6 * 3600 else ROLLUPS[0]
+        targets = self.matching_targets(target)
+        rows = self.conn.execute(
+            f"SELECT count, errors, sum_ms, min_ms, max_ms, histogram FROM {table}"
+            f" WHERE target IN ({', '.join('?' * len(targets))}) AND bucket >= ? AND bucket < ?",
+            (*targets, int(since) // width * width, int(until)),
+        ).fetchall()
+
+        count = errors = 0
+        sum_ms = 0.0
+        min_ms = max_ms = None
+        histogram = {}
+        for r_count, r_errors, r_sum, r_min, r_max, r_hist in rows:
+            count += r_count
+            errors += r_errors
+            sum_ms += r_sum
+            if r_min is not None:
+                min_ms = r_min if min_ms is None else min(min_ms, r_min)
+                max_ms = r_max if max_ms is None else max(max_ms, r_max)
+            for k, v in json.loads(r_hist).items():
+                histogram[int(k)] = histogram.get(int(k), 0) + v
+
+        successes = count - errors
+        result = {
+            "target": target,
+            "matched": targets,
+            "resolution": table,
+            "rows": len(rows),
+            "count": count,
+            "error_rate": round(errors / count, 4) if count else None,
+            "mean_ms": round(sum_ms / successes, 1) if successes else None,
+            "min_ms": min_ms,
+            "max_ms": max_ms,
+        }
+        for p in percentiles:
+            result[f"p{p:g}_ms"] = histogram_percentile(histogram, p)
+        return result
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Query the IGV probe history")
+    parser.add_argument("--db", type=str, default=DEFAULT_DB, help="SQLite history file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    query = sub.add_parser("query", help="Latency statistics for one target over a time range")
+    query.add_argument("--target", type=str, required=True,
+                       help="Full URL, or a URL path matched exactly, e.g. /api/health")
+    query.add_argument("--days", type=float, default=0, help="Look back this many days")
+    query.add_argument("--hours", type=float, default=0, help="Look back this many hours")
+    query.add_argument("--percentile", type=float, action="append",
+                       help="Percentile(s) to compute (default 50, 95, 99)")
+
+    sub.add_parser("prune", help="Apply retention limits")
+    sub.add_parser("targets", help="List recorded targets")
+
+    args = parser.parse_args()
+    history = ProbeHistory(args.db)
+    try:
+        if args.command == "query":
+            window = args.days * 86400 + args.hours * 3600 or 86400
+            start = time.perf_counter()
+            result = history.query(args.target, time.time() - window,
+                                   percentiles=tuple(args.percentile or (50, 95, 99)))
+            result["query_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            if len(result["matched"]) > 1:
+                print(f"⚠️  '{args.target}' matches {len(result['matched'])} targets, aggregated together:",
+                      file=sys.stderr)
+                for target in result["matched"]:
+                    print(f"   {target}", file=sys.stderr)
+            print(json.dumps(result, indent=2))
+        elif args.command == "prune":
+            print(f"🧹 {history.prune()} rows deleted")
+        else:
+            for target in history.targets():
+                print(target)
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Statistiques glissantes de latence pour monitor_deploy.py
+Mission: Garder une fenêtre bornée d'échantillons par endpoint et calculer
+p50/p90/p99, min/max, taux d'erreur et jitter au fil des itérations --wait.
+"""
+import bisect
+import json
+import os
+from collections import deque
+
+DEFAULT_WINDOW = 240  # samples kept per endpoint (1h at 15s polling)
+PERCENTILES = (50, 90, 99)
+
+
+class RollingStats:
+    """
+    Bounded window of probe samples for one endpoint.
+
+    Each add() is O(log n) for the search plus a list shift, with n capped
+    by the window. A sorted mirror of the window serves the percentiles,
+    and running sums serve the error rate and jitter.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.total = 0
+        self._samples = deque()  # latency_ms, or None for a failed probe
+        self._sorted = []  # latencies of successful samples in the window
+        self._errors = 0
+        self._diffs = deque()  # |delta| between consecutive successful latencies
+        self._diff_sum = 0.0
+        self._last_latency = None
+
+    def add(self, latency_ms, ok=True):
+        """Record one probe; failed probes only count toward the error rate"""
+        self.total += 1
+        sample = latency_ms if ok and latency_ms is not None else None
+        self._samples.append(sample)
+        if sample is None:
+            self._errors += 1
+        else:
+            bisect.insort(self._sorted, sample)
+            if self._last_latency is not None:
+                diff = abs(sample - self._last_latency)
+                self._diffs.append(diff)
+                self._diff_sum += diff
+            self._last_latency = sample
+
+        if len(self._samples) > self.window:
+            evicted = self._samples.popleft()
+            if evicted is None:
+                self._errors -= 1
+            else:
+                del self._sorted[bisect.bisect_left(self._sorted, evicted)]
+                if self._diffs:
+                    self._diff_sum -= self._diffs.popleft()
+                if not self._sorted:
+                    # The last successful latency left the window: never pair the next one with it
+                    self._last_latency = None
+
+    def percentile(self, p):
+        """Nearest-rank percentile of successful latencies, None when empty"""
+        if not self._sorted:
+            return None
+        rank = max(1, -(-len(self._sorted) * p // 100))
+        return self._sorted[int(rank) - 1]
+
+    def summary(self):
+        """Return a JSON-serialisable dict of the window's statistics"""
+        count = len(self._samples)
+        result = {
+            "samples": count,
+            "error_rate": round(self._errors / count, 4) if count else None,
+            "min_ms": self._sorted[0] if self._sorted else None,
+            "max_ms": self._sorted[-1] if self._sorted else None,
+            "jitter_ms": round(self._diff_sum / len(self._diffs), 1) if self._diffs else None,
+        }
+        for p in PERCENTILES:
+            result[f"p{p}_ms"] = self.percentile(p)
+        return result
+
+
+def format_summary(summary):
+    """One-line rendering used by the monitor output"""
+    def _ms(value):
+        return "n/a" if value is None else f"{value}ms"
+
+    error_rate = summary["error_rate"]
+    errors = "n/a" if error_rate is None else f"{error_rate * 100:.1f}%"
+    return (
+        f"p50 {_ms(summary['p50_ms'])} / p90 {_ms(summary['p90_ms'])} / p99 {_ms(summary['p99_ms'])}"
+        f" | min {_ms(summary['min_ms'])} max {_ms(summary['max_ms'])}"
+        f" | jitter {_ms(summary['jitter_ms'])} | errors {errors} ({summary['samples']} samples)"
+    )
+
+
+def load_baseline(path):
+    """Load stats saved by a previous run, {} when missing or unreadable"""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(path, summaries):
+    """Persist {target: summary} so the next release can be compared to this one"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summaries, f, ensure_ascii=False, indent=2)
+
+
+def compare_to_baseline(current, baseline, metric="p50_ms"):
+    """Return the current/baseline ratio for one metric, None if not comparable"""
+    before = (baseline or {}).get(metric)
+    after = (current or {}).get(metric)
+    if not before or after is None:
+        return None
+    return round(after / before, 2)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Lecture des règles de render.yaml (en-têtes, réécritures) sans dépendance YAML
+Mission: Donner aux outils ops (stand-in, audit des en-têtes de cache) les
+mêmes règles que celles déclarées pour Render, sans les recopier à la main.
+
+Seules les listes `headers:` et `routes:` des services sont lues : un
+sous-ensemble de YAML (listes de mappings clé: valeur) suffit.
+"""
+import os
+import re
+
+RENDER_YAML = os.path.join(os.path.dirname(__file__), '..', '..', 'render.yaml')
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _scalar(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def _list_block(lines, key):
+    """Return the list of mappings under every `key:` entry of the file"""
+    items = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if stripped != f"{key}:" and not stripped.startswith(f"- {key}:"):
+            i += 1
+            continue
+        indent = len(line) - len(line.lstrip())
+        i += 1
+        current = None
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                i += 1
+                continue
+            line_indent = len(line) - len(line.lstrip())
+            # The block ends at the next key of the same level (items may sit at the key's indent)
+            if line_indent < indent or (line_indent == indent and not stripped.startswith("- ")):
+                break
+            if stripped.startswith("- "):
+                current = {}
+                items.append(current)
+                stripped = stripped[2:]
+            name, sep, value = stripped.partition(":")
+            if sep and current is not None:
+                current[name.strip()] = _scalar(value)
+            i += 1
+    return items
+
+
+def load_rules(path=RENDER_YAML):
+    """Return {"headers": [{"path", "name", "value"}], "routes": [{"type", "source", "destination"}]}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    return {"headers": _list_block(lines, "headers"), "routes": _list_block(lines, "routes")}
+
+
+def _pattern(glob):
+    return re.compile("^" + re.escape(glob).replace(r"\*", ".*") + "$")
+
+
+def header_for(url_path, headers, name="Cache-Control"):
+    """
+    Value of header `name` declared for `url_path`: among the matching
+    rules, the most specific (longest) path pattern wins. None if no rule.
+    """
+    best = None
+    for rule in headers:
+        if rule.get("name", "").lower() != name.lower():
+            continue
+        if _pattern(rule["path"]).match(url_path):
+            if best is None or len(rule["path"].rstrip("*")) > len(best["path"].rstrip("*")):
+                best = rule
+    return best["value"] if best else None
+
+
+def max_age(cache_control):
+    """max-age in seconds from a Cache-Control value (0 for no-store/no-cache, None if absent)"""
+    if not cache_control:
+        return None
+    match = MAX_AGE_RE.search(cache_control)
+    if match:
+        return int(match.group(1))
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    return None
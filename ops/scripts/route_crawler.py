@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Crawler synthétique des routes React déclarées dans src/App.js
+Mission: Sonder chaque route du SPA dans les 3 langues (?lang=fr|en|he),
+en parallèle et à débit limité, et rapporter statut, taille et latence.
+
+Les routes paramétrées (/blog/:slug, /admin/crm/leads/:id, ...) sont
+développées à partir d'un fichier de seeds JSON, par exemple :
+    {"/blog/:slug": ["mon-article"], ":id": ["123"]}
+Une clé de route complète est prioritaire sur une clé de paramètre seul.
+"""
+import json
+import os
+import re
+from urllib.parse import urlencode
+
+import async_probe
+from rate_limit import TokenBucket
+
+APP_JS = os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'App.js')
+LANGUAGES = ("fr", "en", "he")
+DEFAULT_RATE = 5  # requests per second
+DEFAULT_CONCURRENCY = 8
+
+ROUTE_OPEN_RE = re.compile(r"<Route\b")
+ROUTE_CLOSE_RE = re.compile(r"</Route\s*>")
+PATH_ATTR_RE = re.compile(r'\bpath="([^"]*)"')
+INDEX_ATTR_RE = re.compile(r"\bindex\b")
+PARAM_RE = re.compile(r":([A-Za-z_][A-Za-z0-9_]*)")
+
+
+def _opening_tag(source, start):
+    """Return (tag text, end index, self_closing) for the <Route ...> at `start`"""
+    depth = 0
+    i = start
+    while i < len(source):
+        c = source[i]
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+        elif c == ">" and depth == 0:
+            return source[start:i + 1], i + 1, source[i - 1] == "/"
+        i += 1
+    raise ValueError(f"Unterminated <Route> at offset {start}")
+
+
+def _join(parent, path):
+    if path.startswith("/"):
+        return path
+    return f"{parent.rstrip('/')}/{path}" if path else parent
+
+
+def extract_routes(app_js=APP_JS):
+    """
+    Extract the route table from App.js, nested routes resolved against
+    their parent. Catch-all routes ("*") are skipped.
+    """
+    with open(app_js, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    routes = []
+    stack = [""]
+    pos = 0
+    while True:
+        open_match = ROUTE_OPEN_RE.search(source, pos)
+        close_match = ROUTE_CLOSE_RE.search(source, pos)
+        if close_match and (not open_match or close_match.start() < open_match.start()):
+            stack.pop()
+            pos = close_match.end()
+            continue
+        if not open_match:
+            break
+
+        tag, pos, self_closing = _opening_tag(source, open_match.start())
+        # Attributes are read outside of element={...} so nested JSX cannot leak in
+        attrs = re.sub(r"\{.*\}", "", tag, flags=re.S)
+        path_match = PATH_ATTR_RE.search(attrs)
+        if path_match:
+            full_path = _join(stack[-1], path_match.group(1))
+        elif INDEX_ATTR_RE.search(attrs):
+            full_path = stack[-1] or "/"
+        else:
+            full_path = stack[-1]
+
+        if full_path and "*" not in full_path and full_path not in routes:
+            routes.append(full_path)
+        if not self_closing:
+            stack.append(full_path)
+    return routes
+
+
+def load_seeds(path):
+    """Load the parameter seed file, {} when no file is given"""
+    if not path:
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def expand_route(route, seeds):
+    """Return the concrete paths for a route pattern ([] if a parameter has no seed)"""
+    params = PARAM_RE.findall(route)
+    if not params:
+        return [route]
+    if route in seeds:
+        values = seeds[route]
+        if len(params) == 1:
+            return [PARAM_RE.sub(str(v), route) for v in values]
+        # Multi-parameter routes must be seeded with full paths
+        return [str(v) for v in values]
+
+    paths = [route]
+    for param in params:
+        values = seeds.get(f":{param}", [])
+        paths = [p.replace(f":{param}", str(v), 1) for p in paths for v in values]
+    return paths
+
+
+async def _probe(base_url, pattern, path, lang, bucket, pool, timeout):
+    url = f"{base_url.rstrip('/')}{path}?{urlencode({'lang': lang})}"
+    await bucket.acquire()
+    result = {"route": pattern, "path": path, "lang": lang, "url": url}
+    try:
+        response = await async_probe.fetch(url, timeout=timeout, pool=pool)
+        result.update({
+            "status": response["status_code"],
+            "ok": response["status_code"] < 400,
+            "bytes": len(response["body"]),
+            "latency_ms": response["elapsed_ms"],
+        })
+    except Exception as e:
+        result.update({"status": "ERROR", "ok": False, "error": str(e) or e.__class__.__name__})
+    return result
+
+
+async def crawl(base_url, routes, seeds=None, languages=LANGUAGES, rate=DEFAULT_RATE,
+                concurrency=DEFAULT_CONCURRENCY, timeout=async_probe.DEFAULT_TIMEOUT):
+    """
+    Probe every expanded route in every language.
+    Returns (results, skipped) where skipped lists patterns without seeds.
+    """
+    seeds = seeds or {}
+    bucket = TokenBucket(rate)
+    pool = async_probe.ConnectionPool(max_idle_per_host=concurrency)
+    factories = []
+    skipped = []
+    for pattern in routes:
+        paths = expand_route(pattern, seeds)
+        if not paths:
+            skipped.append(pattern)
+        for path in paths:
+            for lang in languages:
+                factories.append(
+                    lambda p=pattern, q=path, l=lang: _probe(base_url, p, q, l, bucket, pool, timeout)
+                )
+    try:
+        results = await async_probe.gather_limited(factories, concurrency)
+    finally:
+        pool.close()
+    return results, skipped
+
+
+def print_report(results, skipped):
+    """Print one line per route and language, then a short summary"""
+    print(f"\n🕸️  Route crawl: {len(results)} probes")
+    print("-" * 60)
+    for r in results:
+        icon = "✅" if r.get("ok") else "❌"
+        if "error" in r:
+            print(f"   {icon} [{r['lang']}] {r['path']} -> ERROR {r['error']}")
+        else:
+            print(f"   {icon} [{r['lang']}] {r['path']} -> {r['status']} "
+                  f"{r['bytes']}B {r['latency_ms']}ms")
+    for pattern in skipped:
+        print(f"   ⏭️  {pattern} (no seed for its parameters)")
+    failed = [r for r in results if not r.get("ok")]
+    print("-" * 60)
+    print(f"   {len(results) - len(failed)}/{len(results)} OK, {len(skipped)} routes skipped")
+    return not failed
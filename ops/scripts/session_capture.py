@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Enregistrement et rejeu des sessions de monitor_deploy.py
+Mission: Capturer chaque échange des sondes (requête, en-têtes de réponse,
+empreinte du corps, timings) dans un fichier compact, puis rejouer ce même
+trafic contre le stand-in local ou un nouveau déploiement, au rythme
+d'origine ou accéléré, pour comparer deux releases à trafic identique.
+
+Format: NDJSON gzippé. Première ligne = en-tête de session (dont la
+politique de redirection des sondes, réappliquée au rejeu), puis un échange
+par ligne. Les URLs sont stockées relativement à la cible (frontend/backend)
+pour pouvoir rejouer contre d'autres bases.
+
+Usage:
+    python monitor_deploy.py --wait --record before.ndjson.gz
+    python session_capture.py replay before.ndjson.gz --backend-url http://127.0.0.1:8000 \\
+        --frontend-url http://127.0.0.1:8000 --speed 10 --record-to after.ndjson.gz
+    python session_capture.py diff before.ndjson.gz after.ndjson.gz
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+from datetime import datetime
+
+import async_probe
+import probe_stats
+
+FORMAT = "igv-capture"
+VERSION = 1
+KEPT_RESPONSE_HEADERS = ("content-type", "content-length", "cache-control", "etag", "last-modified",
+                         "content-encoding", "location")
+DROPPED_REQUEST_HEADERS = ("authorization", "cookie")
+SLOWER_RATIO = 1.2  # flag endpoints whose replayed p50 is 20% slower...
+SLOWER_MIN_MS = 20  # ...and at least 20 ms slower (4 -> 5 ms is only noise)
+
+
+def body_digest(body):
+    """Short SHA-256 of a response body (None when there is no body)"""
+    if body is None:
+        return None
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+def _relative(url, base):
+    return url[len(base):] or "/" if url.startswith(base) else url
+
+
+class CaptureWriter:
+    """Append probe exchanges to a gzipped NDJSON capture file"""
+
+    def __init__(self, path, frontend_url, backend_url, follow_redirects=True):
+        self.path = path
+        self.bases = {"frontend": frontend_url.rstrip("/"), "backend": backend_url.rstrip("/")}
+        self.started = time.perf_counter()
+        self.count = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._write({
+            "format": FORMAT,
+            "version": VERSION,
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "frontend_url": self.bases["frontend"],
+            "backend_url": self.bases["backend"],
+            "follow_redirects": follow_redirects,
+        })
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+    def record(self, target, method, url, request_headers=None, status_code=None, response_headers=None,
+               body=None, elapsed_ms=None, phases=None, error=None, body_sha=None, body_bytes=None):
+        """
+        Record one exchange; `target` is "frontend" or "backend". Streamed
+        responses pass their `body_sha` / `body_bytes` instead of a body.
+        A 304 has no body of its own: its digest and size are left empty.
+        """
+        response_headers = response_headers or {}
+        if status_code == 304:
+            body_sha = body_bytes = None
+        elif body is not None and body_sha is None:
+            body_sha, body_bytes = body_digest(body), len(body)
+        self._write({
+            "t": round(time.perf_counter() - self.started, 3),
+            "target": target,
+            "method": method,
+            "path": _relative(url, self.bases[target]),
+            "request_headers": {k: v for k, v in (request_headers or {}).items()
+                                if k.lower() not in DROPPED_REQUEST_HEADERS},
+            "status": status_code,
+            "response_headers": {k: response_headers[k] for k in KEPT_RESPONSE_HEADERS if k in response_headers},
+            "body_bytes": body_bytes,
+            "body_sha": body_sha,
+            "elapsed_ms": elapsed_ms,
+            "phases": phases,
+            "error": error,
+        })
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+def load_capture(path):
+    """Return (session header, [exchange dicts]) from a capture file"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{path} is not an {FORMAT} file")
+        return header, [json.loads(line) for line in f if line.strip()]
+
+
+async def _replay_one(entry, base_url, pool, timeout, writer, follow_redirects):
+    url = f"{base_url}{entry['path']}"
+    try:
+        response = await async_probe.fetch(url, method=entry["method"], headers=entry["request_headers"],
+                                           timeout=timeout, pool=pool, follow_redirects=follow_redirects,
+                                           digest=True)
+    except Exception as e:
+        error = "Timeout" if isinstance(e, asyncio.TimeoutError) else (str(e) or e.__class__.__name__)
+        if writer:
+            writer.record(entry["target"], entry["method"], url, entry["request_headers"], error=error)
+        return dict(entry, status=None, body_sha=None, elapsed_ms=None, phases=None, error=error)
+    if writer:
+        writer.record(entry["target"], entry["method"], url, entry["request_headers"], response["status_code"],
+                      response["headers"], elapsed_ms=response["elapsed_ms"], phases=response["phases"],
+                      body_sha=response["body_sha"], body_bytes=response["body_bytes"])
+    return dict(entry, status=response["status_code"], body_sha=response["body_sha"],
+                body_bytes=response["body_bytes"], elapsed_ms=response["elapsed_ms"],
+                phases=response["phases"], error=None)
+
+
+async def replay(entries, frontend_url, backend_url, speed=1.0, concurrency=async_probe.DEFAULT_CONCURRENCY,
+                 timeout=async_probe.DEFAULT_TIMEOUT, writer=None, follow_redirects=True):
+    """
+    Re-send captured exchanges against new bases. Each exchange starts at
+    its original offset divided by `speed` (speed 0 = as fast as possible,
+    still at most `concurrency` in flight). `follow_redirects` must match the
+    capture's policy (header "follow_redirects") so a redirecting URL
+    replays with the same final status. Returns replayed exchanges in
+    capture order.
+    """
+    bases = {"frontend": frontend_url.rstrip("/"), "backend": backend_url.rstrip("/")}
+    pool = async_probe.ConnectionPool(max_idle_per_host=concurrency)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    start = time.perf_counter()
+
+    async def _scheduled(entry):
+        if speed:
+            delay = entry["t"] / speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        async with semaphore:
+            return await _replay_one(entry, bases[entry["target"]], pool, timeout, writer, follow_redirects)
+
+    try:
+        return await asyncio.gather(*(_scheduled(e) for e in entries))
+    finally:
+        pool.close()
+
+
+def compare(baseline, candidate):
+    """
+    Compare two exchange lists (same traffic) per (target, method, path).
+    Returns {key: {"baseline": stats, "candidate": stats, "p50_delta_pct",
+    "status_changes", "body_changes"}}.
+    """
+    groups = {}
+    for side, entries in (("baseline", baseline), ("candidate", candidate)):
+        for entry in entries:
+            key = f"{entry['target']} {entry['method']} {entry['path']}"
+            group = groups.setdefault(key, {
+                "baseline": probe_stats.RollingStats(len(baseline) + 1),
+                "candidate": probe_stats.RollingStats(len(candidate) + 1),
+                "statuses": {"baseline": set(), "candidate": set()},
+                "bodies": {"baseline": set(), "candidate": set()},
+            })
+            ok = entry.get("error") is None and entry.get("status") is not None and entry["status"] < 400
+            group[side].add(entry.get("elapsed_ms"), ok)
+            group["statuses"][side].add(entry.get("status"))
+            if entry.get("status") != 304:  # no body to compare (older captures hold the empty-body hash)
+                group["bodies"][side].add(entry.get("body_sha"))
+
+    report = {}
+    for key, group in sorted(groups.items()):
+        before, after = group["baseline"].summary(), group["candidate"].summary()
+        delta = None
+        if before["p50_ms"] and after["p50_ms"] is not None:
+            delta = round((after["p50_ms"] - before["p50_ms"]) * 100 / before["p50_ms"], 1)
+        report[key] = {
+            "baseline": before,
+            "candidate": after,
+            "p50_delta_pct": delta,
+            "status_changes": sorted(map(str, group["statuses"]["baseline"] ^ group["statuses"]["candidate"])),
+            "body_changed": group["bodies"]["baseline"] != group["bodies"]["candidate"],
+        }
+    return report
+
+
+def print_comparison(report):
+    """Print one line per endpoint; returns False if anything regressed"""
+    print("\n🔁 Replay comparison (baseline -> candidate)")
+    print("-" * 72)
+    regressed = False
+    for key, row in report.items():
+        before, after = row["baseline"], row["candidate"]
+        slower = (row["p50_delta_pct"] is not None and row["p50_delta_pct"] > (SLOWER_RATIO - 1) * 100
+                  and after["p50_ms"] - before["p50_ms"] >= SLOWER_MIN_MS)
+        failing = (after["error_rate"] or 0) > (before["error_rate"] or 0)
+        icon = "❌" if failing else ("🐢" if slower else "✅")
+        regressed = regressed or failing or slower
+        delta = "n/a" if row["p50_delta_pct"] is None else f"{row['p50_delta_pct']:+.1f}%"
+        print(f"   {icon} {key}: p50 {before['p50_ms']}ms -> {after['p50_ms']}ms ({delta}), "
+              f"p90 {before['p90_ms']}ms -> {after['p90_ms']}ms, "
+              f"errors {before['error_rate']} -> {after['error_rate']}")
+        if row["status_changes"]:
+            print(f"      status codes differ: {', '.join(row['status_changes'])}")
+        if row["body_changed"]:
+            print("      body digest changed")
+    return not regressed
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay and compare monitor capture files")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    info = sub.add_parser("info", help="Summarise a capture file")
+    info.add_argument("capture")
+
+    play = sub.add_parser("replay", help="Replay a capture and compare against it")
+    play.add_argument("capture")
+    play.add_argument("--frontend-url", type=str, help="Frontend base (default: the captured one)")
+    play.add_argument("--backend-url", type=str, help="Backend base (default: the captured one)")
+    play.add_argument("--speed", type=float, default=1.0, help="Pace multiplier, 0 = as fast as possible")
+    play.add_argument("--concurrency", type=int, default=async_probe.DEFAULT_CONCURRENCY)
+    play.add_argument("--timeout", type=float, default=async_probe.DEFAULT_TIMEOUT)
+    play.add_argument("--record-to", type=str, help="Write the replayed exchanges as a new capture")
+    play.add_argument("--json-report", type=str, help="Write the comparison to this JSON file")
+
+    diff = sub.add_parser("diff", help="Compare two captures of the same traffic")
+    diff.add_argument("baseline")
+    diff.add_argument("candidate")
+    diff.add_argument("--json-report", type=str, help="Write the comparison to this JSON file")
+
+    args = parser.parse_args()
+
+    if args.command == "info":
+        header, entries = load_capture(args.capture)
+        duration = entries[-1]["t"] if entries else 0
+        print(f"📼 {args.capture}: {len(entries)} exchanges over {duration}s, started {header['started']}")
+        print(f"   frontend {header['frontend_url']} | backend {header['backend_url']}")
+        return
+
+    if args.command == "replay":
+        header, baseline = load_capture(args.capture)
+        frontend_url = args.frontend_url or header["frontend_url"]
+        backend_url = args.backend_url or header["backend_url"]
+        follow_redirects = header.get("follow_redirects", True)  # monitor_deploy probes always follow them
+        writer = (CaptureWriter(args.record_to, frontend_url, backend_url, follow_redirects)
+                  if args.record_to else None)
+        print(f"▶️  Replaying {len(baseline)} exchanges at {'max' if not args.speed else f'{args.speed}x'} pace")
+        try:
+            candidate = asyncio.run(replay(baseline, frontend_url, backend_url, args.speed,
+                                           args.concurrency, args.timeout, writer, follow_redirects))
+        finally:
+            if writer:
+                writer.close()
+    else:
+        _, baseline = load_capture(args.baseline)
+        _, candidate = load_capture(args.candidate)
+
+    report = compare(baseline, candidate)
+    ok = print_comparison(report)
+    if args.json_report:
+        with open(args.json_report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
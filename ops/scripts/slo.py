@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Évaluation des SLO par fenêtres glissantes pour monitor_deploy.py
+Mission: Suivre, par endpoint, un objectif de disponibilité et un objectif
+de latence sur 5 min / 1 h / 24 h, et lever des alertes de burn rate
+(NDJSON) pour détecter une régression lente après un déploiement, pas
+seulement une panne franche.
+
+Chaque fenêtre est un anneau de N tranches de temps avec des totaux
+courants: ajouter un échantillon coûte O(1) (amorti, les tranches expirées
+sont soustraites au passage), quelle que soit la taille de la fenêtre.
+
+Burn rate = taux de mauvais événements / budget d'erreur (1 - objectif).
+Une règle se déclenche quand la fenêtre longue ET la fenêtre courte
+dépassent son seuil (la courte permet de retomber vite une fois réparé).
+"""
+import time
+
+WINDOWS = (("5m", 300), ("1h", 3600), ("24h", 86400))
+SLOTS_PER_WINDOW = 60
+DEFAULT_AVAILABILITY = 0.995  # share of successful probes
+DEFAULT_LATENCY_MS = 1500  # a probe slower than this is a bad latency event
+DEFAULT_LATENCY_TARGET = 0.99  # share of probes under DEFAULT_LATENCY_MS
+MIN_SAMPLES = 5  # in the short window, before a rule may fire
+
+# (rule name, severity, long window, short window, burn rate threshold)
+ALERT_RULES = (
+    ("fast_burn", "page", "1h", "5m", 14.4),
+    ("slow_burn", "ticket", "24h", "1h", 3.0),
+)
+
+
+class SlidingCounter:
+    """Totals of (samples, bad availability, bad latency) over the last `window` seconds"""
+
+    def __init__(self, window, slots=SLOTS_PER_WINDOW):
+        self.window = window
+        self.slots = slots
+        self.width = window / slots
+        self._ring = [[None, 0, 0, 0] for _ in range(slots)]  # [slot id, total, bad_avail, bad_latency]
+        self._totals = [0, 0, 0]
+        self._head = None  # newest slot id seen
+
+    def _advance(self, slot_id):
+        """Expire every slot older than the window ending at `slot_id`"""
+        if self._head is not None and slot_id <= self._head:
+            return
+        start = slot_id - self.slots + 1
+        if self._head is not None:
+            start = max(start, self._head + 1)
+        for sid in range(start, slot_id + 1):
+            cell = self._ring[sid % self.slots]
+            if cell[0] is not None:
+                for i in range(3):
+                    self._totals[i] -= cell[i + 1]
+            cell[:] = [sid, 0, 0, 0]
+        self._head = slot_id
+
+    def add(self, ts, bad_availability, bad_latency):
+        slot_id = int(ts // self.width)
+        self._advance(slot_id)
+        if slot_id <= self._head - self.slots:
+            return  # older than the window
+        cell = self._ring[slot_id % self.slots]
+        if cell[0] != slot_id:
+            return
+        for i, value in enumerate((1, int(bad_availability), int(bad_latency))):
+            cell[i + 1] += value
+            self._totals[i] += value
+
+    def totals(self, now):
+        """Return (samples, bad_availability, bad_latency) for the window ending at `now`"""
+        self._advance(int(now // self.width))
+        return tuple(self._totals)
+
+
+class SLOEngine:
+    """Per-endpoint SLIs over several sliding windows, with burn-rate alerting"""
+
+    def __init__(self, availability=DEFAULT_AVAILABILITY, latency_ms=DEFAULT_LATENCY_MS,
+                 latency_target=DEFAULT_LATENCY_TARGET):
+        self.objectives = {"availability": availability, "latency": latency_target}
+        self.latency_ms = latency_ms
+        self._counters = {}  # endpoint -> {window name: SlidingCounter}
+        self._firing = {}  # (endpoint, sli, rule) -> event that opened the alert
+        self.fired = 0
+
+    def _windows(self, endpoint):
+        if endpoint not in self._counters:
+            self._counters[endpoint] = {name: SlidingCounter(seconds) for name, seconds in WINDOWS}
+        return self._counters[endpoint]
+
+    def observe(self, endpoint, latency_ms, ok, ts=None):
+        """Record one probe and evaluate the alert rules; returns the events emitted"""
+        ts = time.time() if ts is None else ts
+        bad_latency = ok and latency_ms is not None and latency_ms > self.latency_ms
+        for counter in self._windows(endpoint).values():
+            counter.add(ts, not ok, bad_latency)
+        return self.evaluate(endpoint, ts)
+
+    def burn_rates(self, endpoint, now=None):
+        """Return {sli: {window: burn rate or None}} plus sample counts per window"""
+        now = time.time() if now is None else now
+        rates = {"availability": {}, "latency": {}, "samples": {}}
+        for name, counter in self._windows(endpoint).items():
+            total, bad_availability, bad_latency = counter.totals(now)
+            rates["samples"][name] = total
+            for sli, bad in (("availability", bad_availability), ("latency", bad_latency)):
+                budget = 1 - self.objectives[sli]
+                rates[sli][name] = round((bad / total) / budget, 2) if total and budget > 0 else None
+        return rates
+
+    def evaluate(self, endpoint, now=None):
+        now = time.time() if now is None else now
+        rates = self.burn_rates(endpoint, now)
+        events = []
+        for sli in ("availability", "latency"):
+            for rule, severity, long_window, short_window, threshold in ALERT_RULES:
+                long_rate, short_rate = rates[sli][long_window], rates[sli][short_window]
+                burning = (
+                    rates["samples"][short_window] >= MIN_SAMPLES
+                    and long_rate is not None and short_rate is not None
+                    and long_rate >= threshold and short_rate >= threshold
+                )
+                key = (endpoint, sli, rule)
+                if burning == (key in self._firing):
+                    continue
+                event = {
+                    "ts": round(now, 3),
+                    "event": "slo_burn",
+                    "state": "firing" if burning else "resolved",
+                    "endpoint": endpoint,
+                    "sli": sli,
+                    "objective": self.objectives[sli],
+                    "rule": rule,
+                    "severity": severity,
+                    "threshold": threshold,
+                    "burn_rates": {long_window: long_rate, short_window: short_rate},
+                }
+                if sli == "latency":
+                    event["latency_ms"] = self.latency_ms
+                if burning:
+                    self._firing[key] = event
+                    self.fired += 1
+                else:
+                    del self._firing[key]
+                events.append(event)
+        return events
+
+    def firing(self):
+        """Alerts currently firing"""
+        return list(self._firing.values())
+
+    def summary(self, now=None):
+        """Return {endpoint: burn rates and sample counts per window}"""
+        return {endpoint: self.burn_rates(endpoint, now) for endpoint in self._counters}
+
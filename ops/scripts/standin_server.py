@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Serveur local de substitution pour igv-cms-backend (+ build/ statique)
+Mission: Pouvoir mesurer et tester les outils ops (monitor_deploy.py,
+générateur de charge, ...) hors production, de façon reproductible, en CI.
+
+Implémente les routes utilisées par le frontend et le monitor:
+/health, /api/health, /api/admin/login, /api/crm/* (leads, notes, conversion,
+export), /api/mini-analysis, /api/pages/*, /api/admin/media*, /api/track/visit,
+et sert build/ comme Render (réécriture SPA vers index.html, Cache-Control
+de render.yaml). Latence, jitter, taux d'erreur et cold start configurables.
+
+Usage:
+    python standin_server.py --port 8000 --latency-ms 80 --error-rate 0.01 \\
+        --cold-start-ms 20000 --spindown-s 900 --build-dir ../../build
+    python monitor_deploy.py --frontend-url http://127.0.0.1:8000 --backend-url http://127.0.0.1:8000
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import random
+import re
+import time
+from urllib.parse import urlsplit, parse_qs, unquote
+
+import render_config
+
+DEFAULT_PORT = 8000
+DEFAULT_LEADS = 200
+SERVICE_NAME = "igv-cms-backend (stand-in)"
+STANDIN_TOKEN = "standin-token"
+BUILD_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'build')
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml",
+                      "application/xml", "application/manifest+json")
+COMPRESS_MIN_BYTES = 1024
+
+REASONS = {
+    200: "OK", 201: "Created", 204: "No Content", 304: "Not Modified", 400: "Bad Request",
+    401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class StandinConfig:
+    """Behaviour knobs of the stand-in server"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, cold_start_ms=0, spindown_s=0,
+                 build_dir=None, leads=DEFAULT_LEADS, version="standin", commit=None, seed=None,
+                 render_yaml=render_config.RENDER_YAML):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.cold_start_ms = cold_start_ms
+        self.spindown_s = spindown_s  # idle time before the next request pays cold_start_ms
+        self.build_dir = build_dir
+        self.leads = leads
+        self.version = version
+        self.commit = commit
+        self.seed = seed
+        self.header_rules = render_config.load_rules(render_yaml)["headers"] if render_yaml else []
+
+
+def _json(status, payload):
+    return status, {"Content-Type": "application/json"}, json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+class StandinBackend:
+    """In-memory implementation of the backend routes"""
+
+    def __init__(self, config):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.last_request = None
+        self.requests = 0
+        self.leads = {}
+        self.contacts = {}
+        self.media = []
+        self.pages = {}
+        self.visits = 0
+        self._next_id = 1
+        for i in range(config.leads):
+            self._create_lead({
+                "email": f"lead{i}@example.com",
+                "brand_name": f"Brand {i}",
+                "sector": self.rng.choice(["retail", "food", "tech", "fashion"]),
+                "status": self.rng.choice(["NEW", "CONTACTED", "QUALIFIED"]),
+                "priority": self.rng.choice(["A", "B", "C"]),
+            })
+        self.routes = [
+            ("GET", r"/health", self.health),
+            ("GET", r"/api/health", self.health),
+            ("POST", r"/api/admin/login", self.admin_login),
+            ("GET", r"/api/admin/verify", self.admin_verify),
+            ("GET", r"/api/crm/dashboard/stats", self.dashboard_stats),
+            ("GET", r"/api/crm/leads", self.list_leads),
+            ("POST", r"/api/crm/leads", self.create_lead),
+            ("GET", r"/api/crm/leads/(?P<id>[^/]+)", self.get_lead),
+            ("PUT", r"/api/crm/leads/(?P<id>[^/]+)", self.update_lead),
+            ("DELETE", r"/api/crm/leads/(?P<id>[^/]+)", self.delete_lead),
+            ("POST", r"/api/crm/leads/(?P<id>[^/]+)/notes", self.add_note),
+            ("POST", r"/api/crm/leads/(?P<id>[^/]+)/convert-to-contact", self.convert_lead),
+            ("GET", r"/api/crm/export/leads", self.export_leads),
+            ("POST", r"/api/mini-analysis", self.mini_analysis),
+            ("GET", r"/api/pages/list", self.list_pages),
+            ("POST", r"/api/pages/update", self.update_page),
+            ("GET", r"/api/pages/(?P<page>[^/]+)/history", self.page_history),
+            ("GET", r"/api/pages/(?P<page>[^/]+)", self.get_page),
+            ("GET", r"/api/admin/media", self.list_media),
+            ("POST", r"/api/admin/media/upload", self.upload_media),
+            ("DELETE", r"/api/admin/media/(?P<filename>[^/]+)", self.delete_media),
+            ("POST", r"/api/track/visit", self.track_visit),
+        ]
+        self.routes = [(m, re.compile(p + r"/?$"), h) for m, p, h in self.routes]
+
+    # --- helpers -------------------------------------------------------------
+
+    def _create_lead(self, data):
+        lead_id = str(self._next_id)
+        self._next_id += 1
+        lead = {"_id": lead_id, "notes": [], "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), **data}
+        self.leads[lead_id] = lead
+        return lead
+
+    @staticmethod
+    def _authorized(request):
+        return request["headers"].get("authorization", "").startswith("Bearer ")
+
+    async def _simulate_latency(self):
+        now = time.monotonic()
+        cfg = self.config
+        cold = cfg.cold_start_ms and (
+            self.last_request is None or (cfg.spindown_s and now - self.last_request > cfg.spindown_s)
+        )
+        self.last_request = now
+        delay = cfg.cold_start_ms if cold else 0
+        if cfg.latency_ms or cfg.jitter_ms:
+            delay += max(0.0, cfg.latency_ms + self.rng.uniform(-cfg.jitter_ms, cfg.jitter_ms))
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+    # --- dispatch ------------------------------------------------------------
+
+    async def handle(self, request):
+        """Return (status, headers dict, body bytes) for a parsed request"""
+        self.requests += 1
+        path = request["path"]
+        is_api = path.startswith("/api/") or path == "/health"
+        if is_api:
+            await self._simulate_latency()
+            if self.config.error_rate and self.rng.random() < self.config.error_rate:
+                return _json(503, {"detail": "Simulated failure"})
+
+        allowed = False
+        for method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            allowed = True
+            if method == request["method"] or (method == "GET" and request["method"] == "HEAD"):
+                needs_auth = path.startswith("/api/crm/") or (
+                    path.startswith("/api/admin/") and not path.startswith("/api/admin/login")
+                )
+                if needs_auth and not self._authorized(request):
+                    return _json(401, {"detail": "Not authenticated"})
+                return handler(request, **match.groupdict())
+        if allowed:
+            return _json(405, {"detail": "Method Not Allowed"})
+        if is_api:
+            return _json(404, {"detail": "Not Found"})
+        return self.static(request)
+
+    # --- routes --------------------------------------------------------------
+
+    def health(self, request):
+        return _json(200, {"status": "ok", "service": SERVICE_NAME,
+                           "version": self.config.version, "commit": self.config.commit})
+
+    def admin_login(self, request):
+        body = request["json"] or {}
+        if not body.get("email") or not body.get("password"):
+            return _json(401, {"detail": "Invalid credentials"})
+        return _json(200, {"access_token": STANDIN_TOKEN, "token_type": "bearer",
+                           "email": body["email"], "name": body["email"].split("@")[0], "role": "admin"})
+
+    def admin_verify(self, request):
+        return _json(200, {"valid": True, "role": "admin"})
+
+    def dashboard_stats(self, request):
+        by_status = {}
+        for lead in self.leads.values():
+            by_status[lead.get("status", "NEW")] = by_status.get(lead.get("status", "NEW"), 0) + 1
+        return _json(200, {"total_leads": len(self.leads), "total_contacts": len(self.contacts),
+                           "leads_by_status": by_status})
+
+    def list_leads(self, request):
+        query = request["query"]
+        page = max(1, int(query.get("page", ["1"])[0]))
+        limit = max(1, min(200, int(query.get("limit", ["20"])[0])))
+        search = query.get("search", [""])[0].lower()
+        leads = [
+            {k: v for k, v in lead.items() if k != "notes"}
+            for lead in self.leads.values()
+            if not search or search in lead.get("email", "").lower() or search in lead.get("brand_name", "").lower()
+        ]
+        start = (page - 1) * limit
+        return _json(200, {"leads": leads[start:start + limit], "total": len(leads), "page": page, "limit": limit})
+
+    def create_lead(self, request):
+        body = request["json"] or {}
+        if not body.get("email"):
+            return _json(400, {"detail": "email is required"})
+        return _json(201, self._create_lead(body))
+
+    def get_lead(self, request, id):
+        lead = self.leads.get(id)
+        return _json(200, lead) if lead else _json(404, {"detail": "Lead not found"})
+
+    def update_lead(self, request, id):
+        lead = self.leads.get(id)
+        if not lead:
+            return _json(404, {"detail": "Lead not found"})
+        lead.update(request["json"] or {})
+        return _json(200, lead)
+
+    def delete_lead(self, request, id):
+        if self.leads.pop(id, None) is None:
+            return _json(404, {"detail": "Lead not found"})
+        return _json(200, {"deleted": True})
+
+    def add_note(self, request, id):
+        lead = self.leads.get(id)
+        if not lead:
+            return _json(404, {"detail": "Lead not found"})
+        note = {"note_text": (request["json"] or {}).get("note_text", ""),
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        lead["notes"].append(note)
+        return _json(201, note)
+
+    def convert_lead(self, request, id):
+        lead = self.leads.get(id)
+        if not lead:
+            return _json(404, {"detail": "Lead not found"})
+        contact_id = f"c{id}"
+        self.contacts[contact_id] = {"_id": contact_id, "email": lead.get("email"), "lead_id": id}
+        lead["status"] = "CONVERTED"
+        return _json(200, {"contact_id": contact_id})
+
+    def export_leads(self, request):
+        columns = ["_id", "email", "brand_name", "sector", "status", "priority", "created_at"]
+        lines = [",".join(columns)]
+        for lead in self.leads.values():
+            lines.append(",".join(str(lead.get(c, "")).replace(",", " ") for c in columns))
+        body = ("\n".join(lines) + "\n").encode("utf-8")
+        return 200, {"Content-Type": "text/csv",
+                     "Content-Disposition": 'attachment; filename="leads.csv"'}, body
+
+    def mini_analysis(self, request):
+        body = request["json"] or {}
+        brand = body.get("nom_de_marque") or body.get("brand_name") or "brand"
+        return _json(200, {"success": True, "analysis": f"Mini-analysis for {brand} (stand-in)",
+                           "language": body.get("language", "fr")})
+
+    def list_pages(self, request):
+        return _json(200, {"pages": sorted({page for page, _ in self.pages} | {"home", "about", "packs"})})
+
+    def get_page(self, request, page):
+        language = request["query"].get("language", ["fr"])[0]
+        entry = self.pages.get((page, language), {"content": {}, "version": 0, "history": []})
+        return _json(200, {"page": page, "language": language,
+                           "content": entry["content"], "version": entry["version"]})
+
+    def update_page(self, request):
+        body = request["json"] or {}
+        key = (body.get("page"), body.get("language", "fr"))
+        entry = self.pages.setdefault(key, {"content": {}, "version": 0, "history": []})
+        entry["history"].append({"version": entry["version"], "content": dict(entry["content"])})
+        entry["content"][body.get("section", "main")] = body.get("content")
+        entry["version"] += 1
+        return _json(200, {"success": True, "version": entry["version"]})
+
+    def page_history(self, request, page):
+        language = request["query"].get("language", ["fr"])[0]
+        limit = int(request["query"].get("limit", ["10"])[0])
+        entry = self.pages.get((page, language), {"history": []})
+        return _json(200, {"history": entry["history"][-limit:]})
+
+    def list_media(self, request):
+        page = max(1, int(request["query"].get("page", ["1"])[0]))
+        limit = max(1, int(request["query"].get("limit", ["20"])[0]))
+        start = (page - 1) * limit
+        return _json(200, {"media": self.media[start:start + limit], "total": len(self.media)})
+
+    def upload_media(self, request):
+        filename = f"upload-{len(self.media) + 1}"
+        self.media.append({"filename": filename, "size": len(request["body"])})
+        return _json(201, {"filename": filename, "url": f"/media/{filename}"})
+
+    def delete_media(self, request, filename):
+        before = len(self.media)
+        self.media = [m for m in self.media if m["filename"] != filename]
+        if len(self.media) == before:
+            return _json(404, {"detail": "Media not found"})
+        return _json(200, {"deleted": True})
+
+    def track_visit(self, request):
+        self.visits += 1
+        return _json(200, {"status": "tracked"})
+
+    # --- static build/ -------------------------------------------------------
+
+    def static(self, request):
+        """
+        Serve build/ like Render: real files first, then the SPA rewrite to
+        index.html, with the render.yaml headers and gzip when accepted.
+        """
+        build_dir = self.config.build_dir
+        if not build_dir or not os.path.isdir(build_dir):
+            return 404, {"Content-Type": "text/plain"}, b"No build directory configured"
+
+        root = os.path.realpath(build_dir)
+        candidate = os.path.realpath(os.path.join(root, unquote(request["path"]).lstrip("/")))
+        if not candidate.startswith(root) or not os.path.isfile(candidate):
+            candidate = os.path.join(root, "index.html")
+            if not os.path.isfile(candidate):
+                return 404, {"Content-Type": "text/plain"}, b"index.html not found"
+
+        with open(candidate, "rb") as f:
+            body = f.read()
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        content_type = mimetypes.guess_type(candidate)[0] or "application/octet-stream"
+        headers = {"Content-Type": content_type, "ETag": etag}
+        for name in {rule["name"] for rule in self.config.header_rules if rule.get("name")}:
+            value = render_config.header_for(request["path"], self.config.header_rules, name)
+            if value is not None:
+                headers[name] = value
+        if request["headers"].get("if-none-match") == etag:
+            return 304, headers, b""
+        if (len(body) >= COMPRESS_MIN_BYTES and content_type.startswith(COMPRESSIBLE_TYPES)
+                and "gzip" in request["headers"].get("accept-encoding", "")):
+            body = gzip.compress(body, 6)
+            headers.update({"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+        return 200, headers, body
+
+
+async def _read_request(reader):
+    """Parse one HTTP/1.1 request, None on a cleanly closed connection"""
+    try:
+        raw = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    lines = raw.decode("iso-8859-1").split("\r\n")
+    method, target, version = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    body = b""
+    if headers.get("content-length"):
+        body = await reader.readexactly(int(headers["content-length"]))
+    parts = urlsplit(target)
+    payload = None
+    if body and "json" in headers.get("content-type", ""):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+    return {
+        "method": method.upper(), "path": parts.path or "/", "query": parse_qs(parts.query),
+        "version": version, "headers": headers, "body": body, "json": payload,
+    }
+
+
+def _encode_response(status, headers, body, keep_alive, head_only=False):
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}"]
+    headers = dict(headers)
+    headers["Content-Length"] = str(len(body))
+    headers["Connection"] = "keep-alive" if keep_alive else "close"
+    headers.setdefault("Server", "igv-standin")
+    lines += [f"{k}: {v}" for k, v in headers.items()]
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("iso-8859-1")
+    return head if head_only or status == 304 else head + body
+
+
+async def start_server(config, host="127.0.0.1", port=DEFAULT_PORT):
+    """Start the stand-in; returns (asyncio server, StandinBackend). port=0 picks a free port."""
+    backend = StandinBackend(config)
+
+    async def _connection(reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                try:
+                    status, headers, body = await backend.handle(request)
+                except Exception as e:
+                    status, headers, body = _json(500, {"detail": str(e)})
+                keep_alive = (request["headers"].get("connection", "").lower() != "close"
+                              and request["version"] == "HTTP/1.1")
+                writer.write(_encode_response(status, headers, body, keep_alive,
+                                              head_only=request["method"] == "HEAD"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass  # idle keep-alive connection when an in-process stand-in shuts down
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(_connection, host, port)
+    return server, backend
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Local stand-in for igv-cms-backend and build/")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Mean added latency on API routes")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Uniform +/- jitter around the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of API requests answered 503")
+    parser.add_argument("--cold-start-ms", type=float, default=0, help="Delay of the first request after a spin-down")
+    parser.add_argument("--spindown-s", type=float, default=0, help="Idle seconds before the service spins down")
+    parser.add_argument("--build-dir", type=str, default=BUILD_DIR, help="CRA build/ directory to serve")
+    parser.add_argument("--leads", type=int, default=DEFAULT_LEADS, help="Number of seeded leads")
+    parser.add_argument("--version", type=str, default="standin", help="Version reported by /health")
+    parser.add_argument("--commit", type=str, help="Commit SHA reported by /health")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible latency/errors")
+    args = parser.parse_args()
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        cold_start_ms=args.cold_start_ms, spindown_s=args.spindown_s, build_dir=args.build_dir,
+        leads=args.leads, version=args.version, commit=args.commit, seed=args.seed,
+    )
+
+    async def _serve():
+        server, _ = await start_server(config, args.host, args.port)
+        print(f"🧪 Stand-in backend on http://{args.host}:{args.port} "
+              f"(latency {args.latency_ms}±{args.jitter_ms}ms, errors {args.error_rate:.0%}, "
+              f"cold start {args.cold_start_ms}ms)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Sondes multi-domaines / multi-cibles pour monitor_deploy.py
+Mission: Sonder en parallèle des groupes de cibles décrits dans un fichier
+de config (domaines du frontend, instances du backend, listes d'endpoints),
+derrière un limiteur de débit global, et agréger les résultats par groupe.
+
+Format du fichier (JSON, voir ops/monitor_targets.json):
+    {
+      "rate": 5, "burst": 5, "concurrency": 8,
+      "groups": [
+        {"name": "frontend",
+         "urls": ["https://israelgrowthventure.com", "https://www.israelgrowthventure.com"],
+         "endpoints": ["/"]},
+        {"name": "backend", "urls": ["https://igv-cms-backend.onrender.com"],
+         "endpoints": ["/health", {"path": "/api/health", "method": "GET"}]}
+      ]
+    }
+"""
+import json
+import os
+
+import async_probe
+import probe_stats
+from rate_limit import TokenBucket
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), '..', 'monitor_targets.json')
+DEFAULT_RATE = 5  # requests per second across every group
+DEFAULT_CONCURRENCY = 8
+
+
+def _endpoint(spec):
+    """Normalise an endpoint spec ("/path" or {"path", "method"}) to (method, path)"""
+    if isinstance(spec, str):
+        return "GET", spec
+    return spec.get("method", "GET").upper(), spec["path"]
+
+
+def load_targets(path=DEFAULT_CONFIG):
+    """
+    Load a target set file. Returns (groups, settings) where each group is
+    {"name", "probes": [(url, method, path), ...]}.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    groups = []
+    for group in config.get("groups", []):
+        if not group.get("name") or not group.get("urls"):
+            raise ValueError(f"Target group needs a name and urls: {group}")
+        endpoints = [_endpoint(e) for e in group.get("endpoints", ["/"])]
+        groups.append({
+            "name": group["name"],
+            "probes": [
+                (f"{base.rstrip('/')}{path}", method, path)
+                for base in group["urls"] for method, path in endpoints
+            ],
+        })
+    settings = {
+        "rate": config.get("rate", DEFAULT_RATE),
+        "burst": config.get("burst"),
+        "concurrency": config.get("concurrency", DEFAULT_CONCURRENCY),
+    }
+    return groups, settings
+
+
+async def _probe(group, url, method, path, bucket, pool, timeout):
+    await bucket.acquire()
+    result = {"group": group, "url": url, "method": method, "endpoint": path}
+    try:
+        response = await async_probe.fetch(url, method=method, timeout=timeout, pool=pool, digest=True)
+        result.update({
+            "status_code": response["status_code"],
+            "ok": response["status_code"] < 400,
+            "response_time_ms": response["elapsed_ms"],
+            "phases": response["phases"],
+            "body_sha": response["body_sha"],
+            "body_bytes": response["body_bytes"],
+        })
+    except Exception as e:
+        result.update({"ok": False, "error": str(e) or e.__class__.__name__})
+    return result
+
+
+async def probe_targets(groups, rate=DEFAULT_RATE, burst=None, concurrency=DEFAULT_CONCURRENCY,
+                        timeout=async_probe.DEFAULT_TIMEOUT):
+    """
+    Probe every (url, method) of every group with a shared worker pool.
+    A single token bucket caps the request rate of the whole sweep.
+    Returns one result dict per probe, in config order.
+    """
+    bucket = TokenBucket(rate, burst)
+    pool = async_probe.ConnectionPool(max_idle_per_host=concurrency)
+    factories = [
+        (lambda g=group["name"], u=url, m=method, p=path: _probe(g, u, m, p, bucket, pool, timeout))
+        for group in groups for url, method, path in group["probes"]
+    ]
+    try:
+        return await async_probe.gather_limited(factories, concurrency)
+    finally:
+        pool.close()
+
+
+def aggregate(results):
+    """
+    Per-group summary: availability, latency percentiles, failing URLs, and
+    endpoints whose body differs between instances (e.g. apex vs www serving
+    different builds).
+    """
+    summary = {}
+    for result in results:
+        group = summary.setdefault(result["group"], {
+            "stats": probe_stats.RollingStats(len(results)),
+            "failing": [],
+            "digests": {},
+        })
+        group["stats"].add(result.get("response_time_ms"), result["ok"])
+        if not result["ok"]:
+            group["failing"].append(result["url"])
+        if result.get("body_sha"):
+            group["digests"].setdefault(result["endpoint"], set()).add(result["body_sha"])
+
+    report = {}
+    for name, group in summary.items():
+        stats = group["stats"].summary()
+        report[name] = {
+            "probes": stats["samples"],
+            "availability": round(1 - stats["error_rate"], 4) if stats["samples"] else None,
+            "p50_ms": stats["p50_ms"],
+            "p90_ms": stats["p90_ms"],
+            "max_ms": stats["max_ms"],
+            "failing": group["failing"],
+            "inconsistent_endpoints": sorted(e for e, shas in group["digests"].items() if len(shas) > 1),
+        }
+    return report
+
+
+def print_report(results, report):
+    """Print each probe grouped by target group, then the group summaries"""
+    print(f"\n🎯 Target sweep: {len(results)} probes in {len(report)} groups")
+    print("-" * 60)
+    for name, group in report.items():
+        icon = "✅" if not group["failing"] else "❌"
+        print(f"\n{icon} {name}: {group['availability']:.1%} up, "
+              f"p50 {group['p50_ms']}ms / p90 {group['p90_ms']}ms / max {group['max_ms']}ms")
+        for r in results:
+            if r["group"] != name:
+                continue
+            if "error" in r:
+                print(f"   ❌ {r['method']} {r['url']} -> ERROR {r['error']}")
+            else:
+                mark = "✅" if r["ok"] else "❌"
+                print(f"   {mark} {r['method']} {r['url']} -> {r['status_code']} {r['response_time_ms']}ms")
+        for endpoint in group["inconsistent_endpoints"]:
+            print(f"   ⚠️  {endpoint} differs between instances")
+    print("-" * 60)
+    return all(not g["failing"] for g in report.values())
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Add login translations to all locale files"""
 
-import json
+from locale_store import LocaleStore
 
 # Login translations for each language
 login_translations = {
@@ -251,44 +251,26 @@ priorities = {
     "he": {"A": "גבוהה (A)", "B": "בינונית (B)", "C": "נמוכה (C)"}
 }
 
-def update_locale(lang):
-    filepath = rf'C:\Users\PC\Desktop\IGV\igv-frontend\src\i18n\locales\{lang}.json'
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Ensure admin section exists
-    if 'admin' not in data:
-        data['admin'] = {}
-    
-    # Add login translations
-    data['admin']['login'] = login_translations[lang]
-    
-    # Ensure crm section exists
-    if 'crm' not in data['admin']:
-        data['admin']['crm'] = {}
-    
-    # Add/update common translations
-    if 'common' not in data['admin']['crm']:
-        data['admin']['crm']['common'] = {}
-    data['admin']['crm']['common'].update(crm_common_translations[lang])
-    
-    # Add/update leads translations
-    data['admin']['crm']['leads'] = leads_translations[lang]
-    
-    # Add/update statuses
-    data['admin']['crm']['statuses'] = statuses[lang]
-    
-    # Add/update priorities
-    data['admin']['crm']['priorities'] = priorities[lang]
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ Updated {lang}.json")
+def mutations():
+    """Locale mutations of this script (see locale_store.py)"""
+    result = []
+    for lang in ['en', 'fr', 'he']:
+        result += [
+            ("set", lang, "admin.login", login_translations[lang]),
+            ("update", lang, "admin.crm.common", crm_common_translations[lang]),
+            ("set", lang, "admin.crm.leads", leads_translations[lang]),
+            ("set", lang, "admin.crm.statuses", statuses[lang]),
+            ("set", lang, "admin.crm.priorities", priorities[lang]),
+        ]
+    return result
 
-# Update all locales
-for lang in ['en', 'fr', 'he']:
-    update_locale(lang)
+def main():
+    store = LocaleStore()
+    store.apply(mutations())
+    for lang in store.save():
+        print(f"✅ Updated {lang}.json")
 
-print("\n✅ All translations updated!")
+    print("\n✅ All translations updated!")
+
+if __name__ == '__main__':
+    main()
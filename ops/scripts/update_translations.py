@@ -3,10 +3,7 @@
 Script pour mettre à jour les traductions CRM dans les 3 langues (EN, FR, HE)
 Mission: Reconstruction totale CRM - zéro texte hardcodé
 """
-import json
-import os
-
-LOCALES_DIR = os.path.join(os.path.dirname(__file__), '..', 'src', 'i18n', 'locales')
+from locale_store import LocaleStore
 
 # Traductions complètes pour admin.crm.users
 USERS_EN = {
@@ -387,65 +384,32 @@ PRIORITIES_HE = {
     "C": "עדיפות נמוכה"
 }
 
-def deep_merge(base, override):
-    """Merge override into base recursively"""
-    result = base.copy()
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = deep_merge(result[key], value)
-        else:
-            result[key] = value
-    return result
+LOCALE_DATA = {
+    'en': (USERS_EN, LEADS_EN, COMMON_EN, STATUSES_EN, PRIORITIES_EN),
+    'fr': (USERS_FR, LEADS_FR, COMMON_FR, STATUSES_FR, PRIORITIES_FR),
+    'he': (USERS_HE, LEADS_HE, COMMON_HE, STATUSES_HE, PRIORITIES_HE),
+}
 
-def update_locale(filename, users_data, leads_data, common_data, statuses_data, priorities_data):
-    filepath = os.path.join(LOCALES_DIR, filename)
-    
-    # Read existing file
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Ensure admin.crm structure exists
-    if 'admin' not in data:
-        data['admin'] = {}
-    if 'crm' not in data['admin']:
-        data['admin']['crm'] = {}
-    
-    # Update users section
-    data['admin']['crm']['users'] = users_data
-    
-    # Merge leads data
-    if 'leads' not in data['admin']['crm']:
-        data['admin']['crm']['leads'] = {}
-    data['admin']['crm']['leads'] = deep_merge(data['admin']['crm']['leads'], leads_data)
-    
-    # Merge common data
-    if 'common' not in data['admin']['crm']:
-        data['admin']['crm']['common'] = {}
-    data['admin']['crm']['common'] = deep_merge(data['admin']['crm']['common'], common_data)
-    
-    # Update statuses
-    data['admin']['crm']['statuses'] = statuses_data
-    
-    # Update priorities
-    data['admin']['crm']['priorities'] = priorities_data
-    
-    # Write back
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    print(f"Updated {filename}")
+def mutations():
+    """Locale mutations of this script (see locale_store.py)"""
+    result = []
+    for lang, (users_data, leads_data, common_data, statuses_data, priorities_data) in LOCALE_DATA.items():
+        result += [
+            ("set", lang, "admin.crm.users", users_data),
+            ("merge", lang, "admin.crm.leads", leads_data),
+            ("merge", lang, "admin.crm.common", common_data),
+            ("set", lang, "admin.crm.statuses", statuses_data),
+            ("set", lang, "admin.crm.priorities", priorities_data),
+        ]
+    return result
 
 def main():
     print("Updating translations for CRM reconstruction...")
     
-    # Update English
-    update_locale('en.json', USERS_EN, LEADS_EN, COMMON_EN, STATUSES_EN, PRIORITIES_EN)
-    
-    # Update French  
-    update_locale('fr.json', USERS_FR, LEADS_FR, COMMON_FR, STATUSES_FR, PRIORITIES_FR)
-    
-    # Update Hebrew
-    update_locale('he.json', USERS_HE, LEADS_HE, COMMON_HE, STATUSES_HE, PRIORITIES_HE)
+    store = LocaleStore()
+    store.apply(mutations())
+    for lang in store.save():
+        print(f"Updated {lang}.json")
     
     print("All translations updated successfully!")
 
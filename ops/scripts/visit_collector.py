@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Collecteur local des visites (src/utils/visitTracker.js) avec agrégation en mémoire
+Mission: Qu'une page vue ne coûte qu'un incrément en mémoire : les événements
+(un par requête ou par lots) sont agrégés par page / langue / heure, puis
+écrits dans SQLite en différé (write-behind), par paquets, hors de la boucle
+de requêtes.
+
+Routes (compatibles avec trackPageView / trackEvent) :
+    POST /api/track/visit   un événement {page, referrer, language, utm_*, consent_analytics, event?}
+    POST /api/track/batch   {"events": [...]} ou une liste d'événements
+    GET  /api/track/stats   compteurs du collecteur (acceptés, en attente, flushs)
+
+Les événements sans consent_analytics=true sont refusés (comptés "skipped").
+Tables : visits_hourly (page, langue), campaigns_hourly (utm_*), events_hourly
+(trackEvent). Un arrêt propre (Ctrl+C, SIGTERM) écrit les agrégats en attente.
+
+Usage:
+    python visit_collector.py serve --port 8001 --flush-interval 5
+    python visit_collector.py report --hours 24
+    python visit_collector.py bench --events 200000 --seconds 5
+"""
+import asyncio
+import json
+import os
+import random
+import signal
+import sqlite3
+import time
+
+import async_probe
+import standin_server
+
+DEFAULT_DB = os.path.join(os.path.dirname(__file__), '..', 'visits.db')
+DEFAULT_PORT = 8001
+DEFAULT_FLUSH_INTERVAL = 5.0  # seconds between two write-behind flushes
+MAX_PENDING_KEYS = 50_000  # flush early when this many aggregate rows are waiting
+MAX_BATCH = 1000  # events accepted per batch request
+MAX_FIELD = 200  # characters kept from page / utm / event values
+DEFAULT_LANGUAGE = "fr"
+HOUR = 3600
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+TABLES = {
+    "visits_hourly": ("hour", "page", "language"),
+    "campaigns_hourly": ("hour", "source", "medium", "campaign"),
+    "events_hourly": ("hour", "event", "page"),
+}
+
+
+def _field(value, default=""):
+    if value is None or value == "":
+        return default
+    return str(value)[:MAX_FIELD]
+
+
+class VisitCollector:
+    """
+    In-memory hourly aggregates of visit events with write-behind to SQLite.
+    add() only touches dicts; flush() / flush_async() move the pending counts
+    to the database in one transaction (upserts that add to existing rows).
+    """
+
+    def __init__(self, path=DEFAULT_DB, max_pending=MAX_PENDING_KEYS):
+        self.path = path
+        self.max_pending = max_pending
+        self.conn = sqlite3.connect(path, check_same_thread=False)  # flushes run in a worker thread
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        for table, keys in TABLES.items():
+            columns = ", ".join(f"{k} {'INTEGER' if k == 'hour' else 'TEXT'} NOT NULL" for k in keys)
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ({columns}, count INTEGER NOT NULL,"
+                f" PRIMARY KEY ({', '.join(keys)})) WITHOUT ROWID"
+            )
+        self.conn.commit()
+        self._pending = {table: {} for table in TABLES}
+        self._flush_lock = asyncio.Lock()
+        self.accepted = 0
+        self.skipped = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.last_flush_ms = None
+
+    @property
+    def pending(self):
+        """Aggregate rows waiting for the next flush"""
+        return sum(len(rows) for rows in self._pending.values())
+
+    def add(self, event, ts=None):
+        """Fold one tracking event into the hourly aggregates; False when refused (no consent)"""
+        if not isinstance(event, dict) or event.get("consent_analytics") is not True:
+            self.skipped += 1
+            return False
+        hour = int((time.time() if ts is None else ts) // HOUR * HOUR)
+        page = _field(event.get("page"), "/").split("?", 1)[0]
+        pending = self._pending
+        name = event.get("event")
+        if name:
+            key = (hour, _field(name), page)
+            pending["events_hourly"][key] = pending["events_hourly"].get(key, 0) + 1
+        else:
+            key = (hour, page, _field(event.get("language"), DEFAULT_LANGUAGE).lower()[:8])
+            pending["visits_hourly"][key] = pending["visits_hourly"].get(key, 0) + 1
+            if event.get("utm_source"):
+                key = (hour, _field(event["utm_source"]), _field(event.get("utm_medium")),
+                       _field(event.get("utm_campaign")))
+                pending["campaigns_hourly"][key] = pending["campaigns_hourly"].get(key, 0) + 1
+        self.accepted += 1
+        return True
+
+    def add_batch(self, events, ts=None):
+        """Fold a list of events; returns (accepted, skipped)"""
+        ts = time.time() if ts is None else ts
+        accepted = sum(1 for event in events if self.add(event, ts))
+        return accepted, len(events) - accepted
+
+    def _swap(self):
+        snapshot, self._pending = self._pending, {table: {} for table in TABLES}
+        return snapshot
+
+    def _write(self, snapshot):
+        start = time.perf_counter()
+        rows = 0
+        try:
+            with self.conn:
+                for table, counts in snapshot.items():
+                    if not counts:
+                        continue
+                    keys = TABLES[table]
+                    self.conn.executemany(
+                        f"INSERT INTO {table} ({', '.join(keys)}, count)"
+                        f" VALUES ({', '.join('?' * (len(keys) + 1))})"
+                        f" ON CONFLICT ({', '.join(keys)}) DO UPDATE SET count = count + excluded.count",
+                        [key + (count,) for key, count in counts.items()],
+                    )
+                    rows += len(counts)
+        except sqlite3.Error:
+            # Keep the counts for the next flush rather than losing them
+            for table, counts in snapshot.items():
+                pending = self._pending[table]
+                for key, count in counts.items():
+                    pending[key] = pending.get(key, 0) + count
+            raise
+        self.flushes += 1
+        self.rows_written += rows
+        self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+        return rows
+
+    def flush(self):
+        """Write the pending aggregates now (blocking); returns rows written"""
+        snapshot = self._swap()
+        return self._write(snapshot) if any(snapshot.values()) else 0
+
+    async def flush_async(self):
+        """Write the pending aggregates from a worker thread, one flush at a time"""
+        async with self._flush_lock:
+            snapshot = self._swap()
+            if not any(snapshot.values()):
+                return 0
+            return await asyncio.to_thread(self._write, snapshot)
+
+    async def run_flusher(self, interval=DEFAULT_FLUSH_INTERVAL):
+        """Write-behind loop: flush every `interval` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush_async()
+            except sqlite3.Error as e:
+                print(f"⚠️  Flush failed, counts kept for the next one: {e}")
+
+    def stats(self):
+        return {
+            "accepted": self.accepted,
+            "skipped": self.skipped,
+            "pending_rows": self.pending,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+    def report(self, hours=24, top=20, now=None):
+        """Stored totals over the last `hours`: top pages, languages, campaigns and events"""
+        since = int(((now or time.time()) - hours * HOUR) // HOUR * HOUR)
+        query = self.conn.execute
+        return {
+            "hours": hours,
+            "views": query("SELECT COALESCE(SUM(count), 0) FROM visits_hourly WHERE hour >= ?",
+                           (since,)).fetchone()[0],
+            "pages": query("SELECT page, SUM(count) AS n FROM visits_hourly WHERE hour >= ?"
+                           " GROUP BY page ORDER BY n DESC LIMIT ?", (since, top)).fetchall(),
+            "languages": query("SELECT language, SUM(count) AS n FROM visits_hourly WHERE hour >= ?"
+                               " GROUP BY language ORDER BY n DESC", (since,)).fetchall(),
+            "campaigns": query("SELECT source, medium, campaign, SUM(count) AS n FROM campaigns_hourly"
+                               " WHERE hour >= ? GROUP BY source, medium, campaign ORDER BY n DESC LIMIT ?",
+                               (since, top)).fetchall(),
+            "events": query("SELECT event, SUM(count) AS n FROM events_hourly WHERE hour >= ?"
+                            " GROUP BY event ORDER BY n DESC LIMIT ?", (since, top)).fetchall(),
+        }
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+def _response(status, payload):
+    status, headers, body = standin_server._json(status, payload)
+    headers.update(CORS_HEADERS)
+    return status, headers, body
+
+
+async def handle(collector, request):
+    """Route one parsed request; returns (status, headers, body)"""
+    method, path = request["method"], request["path"].rstrip("/")
+    if method == "OPTIONS":
+        return 204, dict(CORS_HEADERS), b""
+    if method == "GET" and path == "/api/track/stats":
+        return _response(200, collector.stats())
+    if method != "POST" or path not in ("/api/track/visit", "/api/track/batch"):
+        return _response(404, {"detail": "Not Found"})
+
+    payload = request["json"]
+    if path == "/api/track/visit":
+        if not collector.add(payload):
+            return _response(200, {"status": "skipped", "reason": "no_consent"})
+        result = {"status": "tracked"}
+    else:
+        events = payload.get("events") if isinstance(payload, dict) else payload
+        if not isinstance(events, list) or len(events) > MAX_BATCH:
+            return _response(400, {"detail": f"Expected a list of at most {MAX_BATCH} events"})
+        accepted, skipped = collector.add_batch(events)
+        result = {"status": "tracked", "accepted": accepted, "skipped": skipped}
+    if collector.pending >= collector.max_pending:
+        await collector.flush_async()
+    return _response(200, result)
+
+
+async def start_collector(collector, host="127.0.0.1", port=DEFAULT_PORT, flush_interval=DEFAULT_FLUSH_INTERVAL):
+    """Start the HTTP collector and its write-behind loop; returns (server, flusher task)"""
+
+    async def _connection(reader, writer):
+        try:
+            while True:
+                request = await standin_server._read_request(reader)
+                if request is None:
+                    break
+                status, headers, body = await handle(collector, request)
+                keep_alive = (request["headers"].get("connection", "").lower() != "close"
+                              and request["version"] == "HTTP/1.1")
+                writer.write(standin_server._encode_response(status, headers, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass  # idle keep-alive connection at shutdown
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(_connection, host, port)
+    flusher = asyncio.ensure_future(collector.run_flusher(flush_interval))
+    return server, flusher
+
+
+async def stop_collector(collector, server, flusher):
+    flusher.cancel()
+    server.close()
+    await server.wait_closed()
+    await collector.flush_async()
+
+
+# --- benchmark ---------------------------------------------------------------
+
+def sample_events(count, seed=0, pages=40):
+    """Synthetic visitTracker.js payloads (fr/en/he, some UTM campaigns and custom events)"""
+    rng = random.Random(seed)
+    paths = ["/", "/about", "/packs", "/contact", "/mini-analyse", "/future-commerce"]
+    paths += [f"/blog/article-{i}" for i in range(pages - len(paths))]
+    events = []
+    for _ in range(count):
+        event = {
+            "page": rng.choice(paths),
+            "referrer": rng.choice([None, "https://www.google.com/", "https://www.linkedin.com/"]),
+            "language": rng.choice(["fr", "fr", "en", "he"]),
+            "utm_source": None, "utm_medium": None, "utm_campaign": None,
+            "consent_analytics": True,
+        }
+        if rng.random() < 0.2:
+            event.update(utm_source="linkedin", utm_medium="social", utm_campaign=f"c{rng.randint(1, 5)}")
+        if rng.random() < 0.05:
+            event.update(event="form_submit", event_data={"form": "contact"})
+        events.append(event)
+    return events
+
+
+def bench_in_process(path, events):
+    """events/sec of add() alone, then the cost of one flush"""
+    collector = VisitCollector(path)
+    start = time.perf_counter()
+    base = time.time()
+    for i, event in enumerate(events):
+        collector.add(event, base + i * 0.01)  # spread over hours like real traffic
+    add_s = time.perf_counter() - start
+    rows = collector.flush()
+    collector.conn.close()
+    return {
+        "events": len(events),
+        "events_per_s": round(len(events) / add_s),
+        "ns_per_event": round(add_s / len(events) * 1e9),
+        "flush_rows": rows,
+        "flush_ms": collector.last_flush_ms,
+    }
+
+
+async def bench_http(path, events, batch, seconds, clients, flush_interval):
+    """Sustained events/sec through the HTTP collector with `batch` events per request"""
+    collector = VisitCollector(path)
+    server, flusher = await start_collector(collector, port=0, flush_interval=flush_interval)
+    url = "http://127.0.0.1:%d" % server.sockets[0].getsockname()[1]
+    url += "/api/track/visit" if batch == 1 else "/api/track/batch"
+    pool = async_probe.ConnectionPool(max_idle_per_host=clients)
+    headers = {"Content-Type": "application/json"}
+    bodies = [json.dumps(events[i] if batch == 1 else {"events": events[i:i + batch]}).encode("utf-8")
+              for i in range(0, len(events) - batch + 1, batch)]
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async def _client(offset):
+        i = offset
+        while time.perf_counter() < deadline:
+            response = await async_probe.fetch(url, "POST", headers=headers, pool=pool,
+                                               data=bodies[i % len(bodies)])
+            if response["status_code"] == 200:
+                latencies.append(response["elapsed_ms"])
+            i += clients
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(_client(c) for c in range(clients)))
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+        await stop_collector(collector, server, flusher)
+        collector.conn.close()
+    latencies.sort()
+    return {
+        "batch": batch,
+        "requests": len(latencies),
+        "events_per_s": round(collector.accepted / elapsed),
+        "p50_ms": latencies[len(latencies) // 2] if latencies else None,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] if latencies else None,
+        "flushes": collector.flushes,
+        "rows_written": collector.rows_written,
+        "last_flush_ms": collector.last_flush_ms,
+    }
+
+
+def print_report(report):
+    print(f"\n📈 Visits over the last {report['hours']}h: {report['views']} page views")
+    print("-" * 60)
+    for page, count in report["pages"]:
+        print(f"   {page:<40} {count:>8}")
+    print("   " + " | ".join(f"{language}: {count}" for language, count in report["languages"]))
+    if report["campaigns"]:
+        print("\n🎯 Campaigns")
+        for source, medium, campaign, count in report["campaigns"]:
+            print(f"   {source}/{medium or '-'}/{campaign or '-'}: {count}")
+    if report["events"]:
+        print("\n🖱️  Events")
+        for event, count in report["events"]:
+            print(f"   {event}: {count}")
+
+
+def main():
+    import argparse
+    import tempfile
+    parser = argparse.ArgumentParser(description="Batched visit collector with write-behind SQLite aggregates")
+    parser.add_argument("--db", type=str, default=DEFAULT_DB)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Run the collector")
+    serve.add_argument("--host", type=str, default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--flush-interval", type=float, default=DEFAULT_FLUSH_INTERVAL)
+
+    report = sub.add_parser("report", help="Print the stored aggregates")
+    report.add_argument("--hours", type=float, default=24)
+    report.add_argument("--top", type=int, default=20)
+
+    bench = sub.add_parser("bench", help="Measure sustained events/sec (temporary database)")
+    bench.add_argument("--events", type=int, default=200_000, help="Events for the in-process run")
+    bench.add_argument("--seconds", type=float, default=5, help="Duration of each HTTP run")
+    bench.add_argument("--clients", type=int, default=16)
+    bench.add_argument("--batch", type=int, default=50, help="Events per batch request")
+    bench.add_argument("--flush-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    if args.command == "report":
+        collector = VisitCollector(args.db)
+        try:
+            print_report(collector.report(args.hours, args.top))
+        finally:
+            collector.conn.close()
+        return
+
+    if args.command == "bench":
+        events = sample_events(args.events)
+        with tempfile.TemporaryDirectory() as tmp:
+            result = bench_in_process(os.path.join(tmp, "inproc.db"), events)
+            print(f"⚡ add(): {result['events_per_s']} events/s ({result['ns_per_event']} ns/event), "
+                  f"flush of {result['flush_rows']} rows in {result['flush_ms']} ms")
+            for batch in (1, args.batch):
+                result = asyncio.run(bench_http(os.path.join(tmp, f"http{batch}.db"), events, batch,
+                                                args.seconds, args.clients, args.flush_interval))
+                print(f"🌐 HTTP, {batch} event(s)/request: {result['events_per_s']} events/s sustained "
+                      f"({result['requests']} requests, p50 {result['p50_ms']}ms, p99 {result['p99_ms']}ms, "
+                      f"{result['flushes']} flushes, last {result['last_flush_ms']} ms)")
+        return
+
+    async def _serve():
+        server, flusher = await start_collector(collector, args.host, args.port, args.flush_interval)
+        print(f"📥 Visit collector on http://{args.host}:{args.port} -> {args.db} "
+              f"(flush every {args.flush_interval}s)")
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+            except NotImplementedError:
+                pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+        try:
+            await stop.wait()
+        finally:
+            await stop_collector(collector, server, flusher)
+
+    collector = VisitCollector(args.db)
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.close()
+        print(f"💾 {collector.accepted} events collected, {collector.rows_written} rows written")
+
+
+if __name__ == "__main__":
+    main()